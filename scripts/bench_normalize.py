@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Benchmark normalize_tickets.py on real-size synthetic Jira bodies.
+
+Bodies mimic what lands in descriptions and comments: pasted dmesg dumps,
+tqdm progress output, wiki-markup heavy runbook text and short comments.
+``clean_jira_text`` is timed per body, and ``normalize_issue`` on an
+issue carrying those bodies as comments.  Results are written as JSON so
+runs on different commits can be compared with ``--baseline``.
+
+Usage:
+    python3 scripts/bench_normalize.py
+    python3 scripts/bench_normalize.py --repeat 20
+    python3 scripts/bench_normalize.py --output new.json --baseline scripts/analysis/bench-normalize.json
+"""
+import argparse
+import json
+import platform
+import random
+import statistics
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import normalize_tickets as nt
+from bench_rule_engine import REPO_ROOT, WORDS, git_commit
+
+DEFAULT_OUTPUT = REPO_ROOT / "scripts" / "analysis" / "bench-normalize.json"
+DEFAULT_REPEAT = 10
+
+# Approximate body sizes (characters)
+BODY_SIZES = {
+    "dmesg": 1_000_000,
+    "tqdm": 1_000_000,
+    "markup": 100_000,
+    "comment": 400,
+}
+COMMENTS_PER_ISSUE = 20
+
+
+def _dmesg_line(rng):
+    return (f"[{rng.uniform(0, 99999):12.6f}] {rng.choice(('nvme0', 'mlx5_core', 'pcieport'))}: "
+            f"{' '.join(rng.choices(WORDS, k=rng.randint(4, 12)))}  \r\n")
+
+
+def _tqdm_line(rng):
+    done = rng.randint(0, 40)
+    return (f"{done * 100 // 40:3d}%|" + "█" * done + "▏" + " " * (40 - done)
+            + f"| {done}/40 [00:{done:02d}<00:{40 - done:02d}, 1.2it/s]\n")
+
+
+def _markup_block(rng):
+    words = " ".join(rng.choices(WORDS, k=20))
+    return (f"h3. {rng.choice(WORDS).title()}\n"
+            f"|*Serial*|{rng.randint(10**9, 10**10)}|\n"
+            f"{{color:#ff0000}}{words}{{color}}\n"
+            f"{{code:bash}}\n{_dmesg_line(rng)}{{code}}\n"
+            f"See [host page|https://example.invalid/{rng.randint(1, 999)}] !shot.png!\n"
+            f"----\n {words}…\n\n\n")
+
+
+def generate_bodies(seed=0):
+    """Return ``{name: text}`` bodies of roughly ``BODY_SIZES`` characters."""
+    rng = random.Random(seed)
+    makers = {
+        "dmesg": _dmesg_line,
+        "tqdm": lambda r: _dmesg_line(r) if r.random() < 0.2 else _tqdm_line(r),
+        "markup": _markup_block,
+        "comment": _markup_block,
+    }
+    bodies = {}
+    for name, size in BODY_SIZES.items():
+        parts, length = [], 0
+        while length < size:
+            parts.append(makers[name](rng))
+            length += len(parts[-1])
+        bodies[name] = "".join(parts)[:size]
+    return bodies
+
+
+def time_call(func, arg, repeat):
+    """Median wall time of ``func(arg)`` over *repeat* calls, in seconds."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(arg)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def bench_bodies(bodies, repeat=DEFAULT_REPEAT):
+    results = {}
+    for name, text in bodies.items():
+        # Short bodies are timed in batches so the clock resolution does
+        # not dominate
+        batch = max(1, 100_000 // len(text))
+        seconds = time_call(lambda t: [nt.clean_jira_text(t) for _ in range(batch)],
+                            text, repeat) / batch
+        results[name] = {
+            "chars": len(text),
+            "median_ms": round(seconds * 1000, 4),
+            "mb_per_sec": round(len(text) / seconds / 1e6, 2) if seconds else None,
+        }
+    return results
+
+
+def bench_issue(bodies, repeat=DEFAULT_REPEAT):
+    names = list(bodies)
+    issue = {
+        "key": "BENCH-1",
+        "fields": {
+            "summary": "benchmark",
+            "description": bodies["markup"],
+            "comment": {"comments": [
+                {"id": str(i), "body": bodies[names[i % len(names)]],
+                 "author": {"displayName": "bench"}}
+                for i in range(COMMENTS_PER_ISSUE)
+            ]},
+        },
+    }
+    seconds = time_call(nt.normalize_issue, issue, repeat)
+    return {"comments": COMMENTS_PER_ISSUE, "median_ms": round(seconds * 1000, 3)}
+
+
+def compare_results(baseline, current):
+    """Return report lines comparing per-body throughput."""
+    lines = []
+    for name, result in current["clean_jira_text"].items():
+        before = baseline.get("clean_jira_text", {}).get(name, {}).get("mb_per_sec")
+        after = result["mb_per_sec"]
+        if not before or not after:
+            continue
+        lines.append(f"  clean_jira_text {name:<8} {after:>8.2f} MB/s "
+                     f"(baseline {before:.2f}, x{after / before:.2f})")
+    before = baseline.get("normalize_issue", {}).get("median_ms")
+    if before:
+        after = current["normalize_issue"]["median_ms"]
+        lines.append(f"  normalize_issue          {after:>8.3f} ms "
+                     f"(baseline {before:.3f}, x{before / after:.2f} faster)")
+    return lines
+
+
+def parse_args(argv=None):
+    p = argparse.ArgumentParser(description="Benchmark the ticket normalizer")
+    p.add_argument("--repeat", type=int, default=DEFAULT_REPEAT,
+                   help="Timed runs per measurement; the median is reported")
+    p.add_argument("--seed", type=int, default=0,
+                   help="Random seed for body generation")
+    p.add_argument("--output", type=Path, default=DEFAULT_OUTPUT,
+                   help="Where to write the JSON results")
+    p.add_argument("--baseline", type=Path, default=None,
+                   help="Previous results JSON to compare throughput against")
+    return p.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    bodies = generate_bodies(args.seed)
+    report = {
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "git_commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": args.seed,
+        "clean_jira_text": bench_bodies(bodies, args.repeat),
+        "normalize_issue": bench_issue(bodies, args.repeat),
+    }
+    for name, result in report["clean_jira_text"].items():
+        print(f"  clean_jira_text {name:<8} {result['chars']:>9,} chars  "
+              f"{result['median_ms']:>9.3f} ms  {result['mb_per_sec']} MB/s")
+    print(f"  normalize_issue ({COMMENTS_PER_ISSUE} comments) "
+          f"{report['normalize_issue']['median_ms']} ms")
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+    print(f"Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        print(f"Compared with {args.baseline} ({baseline.get('git_commit') or 'unknown commit'}):")
+        for line in compare_results(baseline, report) or ["  no comparable results"]:
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+"""
+Benchmark rule_engine_categorize.py on synthetic normalized-ticket corpora.
+
+Generates corpora shaped like normalize_tickets.py output (long
+descriptions, 0-200 comments, labels) and times ``load_rules``,
+``evaluate_ticket``, ``categorize_ticket`` and the full ``main()`` path.
+Results are written as JSON so runs on different commits can be compared
+with ``--baseline``.
+
+Usage:
+    python3 scripts/bench_rule_engine.py
+    python3 scripts/bench_rule_engine.py --sizes 1000 10000
+    python3 scripts/bench_rule_engine.py --corpus-dir /tmp/bench-corpora --workers 4
+    python3 scripts/bench_rule_engine.py --output new.json --baseline scripts/analysis/bench-rule-engine.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import platform
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from re import _parser as sre_parse
+from unittest.mock import patch
+
+import rule_engine_categorize as rec
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_OUTPUT = REPO_ROOT / "scripts" / "analysis" / "bench-rule-engine.json"
+DEFAULT_SIZES = (1000, 10000, 100000)
+
+# Times load_rules is repeated; it runs once per categorization so a
+# handful of samples is enough for a stable median.
+LOAD_RULES_REPEAT = 5
+
+MAX_COMMENTS = 200
+# Mean comment count; counts are exponentially distributed so most tickets
+# have a short thread and a few have very long ones.
+MEAN_COMMENTS = 8
+# Chance that a text field embeds a phrase taken from a rule pattern
+PHRASE_RATE = 0.15
+
+WORDS = (
+    "node rack host gpu cpu dimm psu fan bmc bios firmware cable port link "
+    "switch nic ib hca error fault failed failure timeout reboot reset "
+    "replace reseat check verify alert critical warning degraded healthy "
+    "customer tenant instance shape bare metal capacity maintenance ticket "
+    "update status pending resolved closed investigating escalated the a to "
+    "of and on in with after before during from by was is has been not"
+).split()
+LABELS = ("hpc", "gpu", "auto-generated", "sev3", "sev4", "cdfp", "trs",
+          "dimm", "network", "power", "fleet", "prescriptive")
+STATUSES = ("Open", "In Progress", "Pending", "Resolved", "Closed")
+
+
+def parse_args(argv=None):
+    p = argparse.ArgumentParser(description="Benchmark the rule-engine categorizer")
+    p.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES),
+                   help="Corpus sizes (ticket counts) to benchmark")
+    p.add_argument("--rule-engine", type=Path, default=rec.DEFAULT_RULE_ENGINE,
+                   help="Path to rule-engine.csv")
+    p.add_argument("--output", type=Path, default=DEFAULT_OUTPUT,
+                   help="Where to write the JSON results")
+    p.add_argument("--corpus-dir", type=Path, default=None,
+                   help="Keep generated corpora here and reuse them on later "
+                        "runs (default: a temporary directory)")
+    p.add_argument("--seed", type=int, default=0,
+                   help="Random seed for corpus generation")
+    p.add_argument("--workers", type=int, default=1,
+                   help="--workers passed to the main() run")
+    p.add_argument("--baseline", type=Path, default=None,
+                   help="Previous results JSON to compare throughput against")
+    return p.parse_args(argv)
+
+
+# ---------------------------------------------------------------------------
+# Corpus generation
+# ---------------------------------------------------------------------------
+
+def rule_phrases(rules):
+    """Return snippets that tend to trigger *rules*.
+
+    For each pattern, the literal runs of its first alternative are joined
+    with spaces, so ``CDFP.*faults`` yields ``"CDFP faults"``.
+    """
+    phrases = []
+    for rule in rules:
+        if rule["_re"] is None:
+            continue
+        items = list(sre_parse.parse(rule["_re"].pattern))
+        if len(items) == 1 and items[0][0] == sre_parse.BRANCH:
+            items = list(items[0][1][1][0])
+        runs, run = [], []
+        for op, av in items:
+            if op == sre_parse.LITERAL:
+                run.append(chr(av))
+            elif run:
+                runs.append("".join(run))
+                run = []
+        if run:
+            runs.append("".join(run))
+        if runs:
+            phrases.append(" ".join(runs))
+    return phrases
+
+
+def _text(rng, min_words, max_words, phrases):
+    words = rng.choices(WORDS, k=rng.randint(min_words, max_words))
+    if phrases and rng.random() < PHRASE_RATE:
+        words.insert(rng.randrange(len(words) + 1), rng.choice(phrases))
+    return " ".join(words)
+
+
+def generate_ticket(rng, index, phrases=()):
+    """Return one synthetic normalized ticket dict."""
+    project = rng.choice(("DO", "HPC"))
+    created = datetime(2025, 1, 1, tzinfo=timezone.utc).timestamp() + rng.randrange(400 * 86400)
+    created = datetime.fromtimestamp(created, timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    n_comments = min(MAX_COMMENTS, int(rng.expovariate(1 / MEAN_COMMENTS)))
+    return {
+        "ticket": {
+            "key": f"{project}-{1000000 + index}",
+            "summary": _text(rng, 5, 14, phrases),
+            "project": {"key": project},
+        },
+        "status": {"current": rng.choice(STATUSES), "created": created},
+        "labels": rng.sample(LABELS, rng.randint(0, 5)),
+        "description": _text(rng, 40, 600, phrases),
+        "comments": [
+            {"id": str(i), "author": "bench", "created": created,
+             "body": _text(rng, 3, 120, phrases)}
+            for i in range(n_comments)
+        ],
+    }
+
+
+def generate_corpus(corpus_dir, count, phrases, seed=0):
+    """Write *count* synthetic tickets to *corpus_dir*, return their paths.
+
+    An existing corpus with exactly *count* tickets is reused as is.
+    """
+    corpus_dir.mkdir(parents=True, exist_ok=True)
+    paths = sorted(corpus_dir.glob("*.json"))
+    if len(paths) == count:
+        return paths
+    for path in paths:
+        path.unlink()
+    rng = random.Random(f"{seed}:{count}")
+    for i in range(count):
+        ticket = generate_ticket(rng, i, phrases)
+        path = corpus_dir / f"{ticket['ticket']['key']}.json"
+        path.write_text(json.dumps(ticket), encoding="utf-8")
+    return sorted(corpus_dir.glob("*.json"))
+
+
+# ---------------------------------------------------------------------------
+# Measurements
+# ---------------------------------------------------------------------------
+
+def percentile(values, q):
+    """Nearest-rank percentile of *values* (0 < q <= 100)."""
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * q // 100))
+    return ordered[int(rank) - 1]
+
+
+def summarize(latencies, total_seconds=None):
+    """Throughput and p50/p99 latency (ms) for per-item *latencies* (s)."""
+    total = sum(latencies) if total_seconds is None else total_seconds
+    return {
+        "count": len(latencies),
+        "total_s": round(total, 6),
+        "tickets_per_sec": round(len(latencies) / total, 1) if total else None,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 4),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 4),
+    }
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process and its children, in MiB."""
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    scale = 1 if sys.platform == "darwin" else 1024
+    return {"self": round(own * scale / 2**20, 1),
+            "children": round(children * scale / 2**20, 1)}
+
+
+def bench_load_rules(rule_engine, repeat=LOAD_RULES_REPEAT):
+    latencies = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        with contextlib.redirect_stderr(io.StringIO()):
+            rec.load_rules(rule_engine)
+        latencies.append(time.perf_counter() - start)
+    stats = summarize(latencies)
+    del stats["tickets_per_sec"]
+    return stats
+
+
+def bench_per_ticket(paths, rules, func):
+    """Time ``func(ticket_data, rules, project_key=...)`` for every ticket.
+
+    JSON loading is excluded; only the call itself is timed.
+    """
+    latencies = []
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            ticket_data = json.load(f)
+        project_key = rec.get_ticket_project(ticket_data)
+        start = time.perf_counter()
+        func(ticket_data, rules, project_key=project_key)
+        latencies.append(time.perf_counter() - start)
+    return summarize(latencies)
+
+
+def bench_main(corpus_dir, rule_engine, count, workers=1):
+    """Time a full ``rule_engine_categorize.main()`` run over *corpus_dir*.
+
+    The match cache is disabled so repeated runs measure the same work.
+    """
+    with tempfile.TemporaryDirectory() as output_dir:
+        argv = ["rule_engine_categorize.py", "--tickets-dir", str(corpus_dir),
+                "--rule-engine", str(rule_engine), "--output-dir", output_dir,
+                "--yes", "--no-match-cache", "--workers", str(workers)]
+        start = time.perf_counter()
+        with patch("sys.argv", argv), contextlib.redirect_stdout(io.StringIO()):
+            rec.main()
+        elapsed = time.perf_counter() - start
+    return {"count": count, "total_s": round(elapsed, 6),
+            "tickets_per_sec": round(count / elapsed, 1), "workers": workers}
+
+
+def bench_size(corpus_dir, count, rule_engine, rules, phrases, seed=0, workers=1):
+    """Run every measurement for one corpus size, return the result dict."""
+    paths = generate_corpus(corpus_dir, count, phrases, seed=seed)
+    return {
+        "tickets": count,
+        "corpus_mb": round(sum(p.stat().st_size for p in paths) / 2**20, 2),
+        "load_rules": bench_load_rules(rule_engine),
+        "evaluate_ticket": bench_per_ticket(paths, rules, rec.evaluate_ticket),
+        "categorize_ticket": bench_per_ticket(paths, rules, rec.categorize_ticket),
+        "main": bench_main(corpus_dir, rule_engine, count, workers=workers),
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def git_commit():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"],
+                             cwd=REPO_ROOT, capture_output=True, text=True,
+                             check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip()
+
+
+def compare_results(baseline, current):
+    """Return report lines comparing throughput per size and stage."""
+    old = {r["tickets"]: r for r in baseline.get("results", [])}
+    lines = []
+    for result in current["results"]:
+        previous = old.get(result["tickets"])
+        if previous is None:
+            continue
+        for stage in ("evaluate_ticket", "categorize_ticket", "main"):
+            before = previous.get(stage, {}).get("tickets_per_sec")
+            after = result[stage]["tickets_per_sec"]
+            if not before or not after:
+                continue
+            change = (after / before - 1) * 100
+            lines.append(f"  {result['tickets']:>7} {stage:<18} "
+                         f"{after:>10.1f} t/s (baseline {before:.1f}, {change:+.1f}%)")
+    return lines
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if not args.rule_engine.is_file():
+        sys.exit(f"Rule engine not found: {args.rule_engine}")
+    with contextlib.redirect_stderr(io.StringIO()):
+        rules = rec.load_rules(args.rule_engine)
+    phrases = rule_phrases(rules)
+
+    report = {
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "git_commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "rule_engine": str(args.rule_engine),
+        "rules": len(rules),
+        "seed": args.seed,
+        "results": [],
+    }
+    with contextlib.ExitStack() as stack:
+        corpus_root = args.corpus_dir or Path(
+            stack.enter_context(tempfile.TemporaryDirectory()))
+        for count in sorted(args.sizes):
+            print(f"Benchmarking {count} tickets ...")
+            result = bench_size(corpus_root / f"tickets-{count}", count,
+                                args.rule_engine, rules, phrases,
+                                seed=args.seed, workers=args.workers)
+            report["results"].append(result)
+            print(f"  evaluate_ticket   : {result['evaluate_ticket']['tickets_per_sec']} t/s "
+                  f"(p50 {result['evaluate_ticket']['p50_ms']} ms, "
+                  f"p99 {result['evaluate_ticket']['p99_ms']} ms)")
+            print(f"  categorize_ticket : {result['categorize_ticket']['tickets_per_sec']} t/s")
+            print(f"  main()            : {result['main']['tickets_per_sec']} t/s")
+            print(f"  peak RSS          : {result['peak_rss_mb']['self']} MiB")
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+    print(f"Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        print(f"Compared with {args.baseline} ({baseline.get('git_commit') or 'unknown commit'}):")
+        for line in compare_results(baseline, report) or ["  no matching sizes"]:
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -17,6 +17,8 @@ import sys
 from pathlib import Path
 from typing import Callable
 
+import ticket_corpus
+
 
 REPO_ROOT = Path(__file__).resolve().parent.parent
 DEFAULT_TICKETS_JSON_DIR = REPO_ROOT / "scripts" / "tickets-json"
@@ -144,8 +146,7 @@ def validate_ticket_key(ticket_key: str):
 def load_ticket_json(path: Path, label: str):
     """Load JSON payload from path with friendly errors."""
     try:
-        with open(path, encoding="utf-8") as handle:
-            return json.load(handle)
+        return json.loads(path.read_bytes())
     except FileNotFoundError as exc:
         raise SystemExit(f"{label} JSON not found: {path}") from exc
     except json.JSONDecodeError as exc:
@@ -153,13 +154,21 @@ def load_ticket_json(path: Path, label: str):
 
 
 def find_normalized_ticket(normalized_root: Path, ticket_key: str):
-    """Find ticket in normalized date folders, preferring latest date path."""
-    matches = sorted(normalized_root.glob(f"*/{ticket_key}.json"))
-    if not matches:
-        raise SystemExit(
-            f"Ticket {ticket_key} not found in normalized-tickets under {normalized_root}"
-        )
-    return matches[-1]
+    """Find ticket in normalized date folders, preferring latest date path.
+
+    Returns the ticket file, or its corpus ref when the folder is packed.
+    """
+    if not normalized_root.is_dir():
+        date_dirs = []
+    else:
+        date_dirs = sorted(d for d in normalized_root.iterdir() if d.is_dir())
+    for date_dir in reversed(date_dirs):
+        ref = ticket_corpus.ticket_ref(date_dir, ticket_key)
+        if ref is not None:
+            return ref
+    raise SystemExit(
+        f"Ticket {ticket_key} not found in normalized-tickets under {normalized_root}"
+    )
 
 
 def infer_project_key(ticket_key: str, normalized_data: dict):
@@ -7,17 +7,24 @@ tickets (written to `--output-file`, defaulting to
 """
 
 import argparse
+import gzip
 import json
 import re
 import shutil
 import sys
 import time
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from urllib.parse import quote
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
 import requests
 
+import normalize_tickets
+import ticket_corpus
+from normalize_tickets import source_fields
+
 DEFAULT_JIRA_TOKEN = "REDACTED_BITBUCKET_PAT"
 BASE_URL = "https://jira-sd.mc1.oracleiaas.com"
 
@@ -29,10 +36,35 @@ UNRESOLVED_FILTER = '\n     AND resolution = Unresolved'
 REQUEST_TIMEOUT_SECONDS = 45
 REQUEST_RETRY_COUNT = 3
 REQUEST_RETRY_DELAY_SECONDS = 2
+# HTTP 429 responses waited out (per Retry-After) before a request attempt
+# counts as failed
+RATE_LIMIT_MAX_WAITS = 10
+
+SEARCH_PAGE_SIZE = 100
+# Fields requested from Jira: only what normalize_tickets.py reads, unless
+# overridden with --fields (ALL_FIELDS restores full payloads)
+SOURCE_FIELDS = ",".join(source_fields())
+ALL_FIELDS = "*all,comment"
+DEFAULT_CONCURRENCY = 1
 
 SCRIPT_DIR = Path(__file__).resolve().parent
 OUTPUT_DIR = SCRIPT_DIR / "tickets-json"
 CONFIG_ENV_PATH = SCRIPT_DIR.parent / "env.json"
+# High-water marks for --sync, keyed by JQL file; kept outside OUTPUT_DIR so
+# normalize_tickets.py does not pick it up as a ticket file
+SYNC_STATE_PATH = SCRIPT_DIR / "tickets-sync-state.json"
+SYNC_DEFAULT_KEY = "default"
+# Minute precision accepted by JQL date comparisons
+JQL_MARK_FORMAT = "%Y-%m-%d %H:%M"
+# How far before the high-water mark a sync re-queries, to absorb clock
+# skew and search-index lag; refetched tickets are upserted idempotently
+SYNC_OVERLAP = timedelta(minutes=10)
+# Widest UTC offset, added to the overlap when the Jira user's timezone
+# (in which JQL reads dates) is unknown
+MAX_UTC_OFFSET = timedelta(hours=14)
+JIRA_TIME_FORMAT = "%Y-%m-%dT%H:%M:%S.%f%z"
+# A trailing ORDER BY clause (no quote after it, so not inside a string)
+ORDER_BY_RE = re.compile(r"\s*\bORDER\s+BY\b[^\"']*\Z", re.IGNORECASE)
 
 
 def load_jira_token():
@@ -76,21 +108,66 @@ def make_headers():
     }
 
 
-def _request_json(url, *, headers=None, params=None, context="Jira request"):
+class JiraRequestError(Exception):
+    """A Jira request failed after all retries or returned an error body."""
+
+
+def make_session(pool_size=DEFAULT_CONCURRENCY, headers=None):
+    """Return a ``requests.Session`` whose connection pool fits *pool_size* threads.
+
+    Reusing one session keeps TCP/TLS connections alive across requests.
+    """
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(
+        pool_connections=pool_size, pool_maxsize=pool_size,
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    if headers:
+        session.headers.update(headers)
+    return session
+
+
+def _retry_after_seconds(resp):
+    """Return the delay requested by a 429 response's ``Retry-After`` header."""
+    value = resp.headers.get("Retry-After", "")
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        return REQUEST_RETRY_DELAY_SECONDS
+
+
+def _get(url, *, session=None, headers=None, params=None, context="Jira request"):
+    """GET *url*, waiting out HTTP 429 responses as their Retry-After asks."""
+    get = session.get if session is not None else requests.get
+    resp = get(url, headers=headers, params=params, timeout=REQUEST_TIMEOUT_SECONDS)
+    waits = 0
+    while resp.status_code == 429 and waits < RATE_LIMIT_MAX_WAITS:
+        waits += 1
+        delay = _retry_after_seconds(resp)
+        print(f"Warning: {context} rate limited; retrying in {delay:g}s.", file=sys.stderr)
+        time.sleep(delay)
+        resp = get(url, headers=headers, params=params, timeout=REQUEST_TIMEOUT_SECONDS)
+    return resp
+
+
+def _request_json(url, *, headers=None, params=None, context="Jira request", session=None,
+                  exit_on_failure=True):
     """Run a GET request with timeout + retry and return the JSON body.
 
+    Uses *session* (see :func:`make_session`) when given so connections are
+    reused.  HTTP 429 responses are retried after their ``Retry-After``
+    delay without using up an attempt.
+
     Raises SystemExit on repeated request failures so callers get a clear
-    error instead of waiting indefinitely.
+    error instead of waiting indefinitely, or :class:`JiraRequestError`
+    when *exit_on_failure* is False.
     """
 
     for attempt in range(1, REQUEST_RETRY_COUNT + 1):
         try:
-            resp = requests.get(
-                url,
-                headers=headers,
-                params=params,
-                timeout=REQUEST_TIMEOUT_SECONDS,
-            )
+            resp = _get(url, session=session, headers=headers, params=params,
+                        context=context)
             resp.raise_for_status()
             return resp.json()
         except requests.Timeout:
@@ -106,10 +183,10 @@ def _request_json(url, *, headers=None, params=None, context="Jira request"):
         if attempt < REQUEST_RETRY_COUNT:
             time.sleep(REQUEST_RETRY_DELAY_SECONDS)
 
-    print(
-        f"Error: {context} failed after {REQUEST_RETRY_COUNT} attempt(s); aborting.",
-        file=sys.stderr,
-    )
+    message = f"{context} failed after {REQUEST_RETRY_COUNT} attempt(s)"
+    if not exit_on_failure:
+        raise JiraRequestError(message)
+    print(f"Error: {message}; aborting.", file=sys.stderr)
     sys.exit(1)
 
 
@@ -166,12 +243,37 @@ def load_tickets_file(path):
     return list(seen.keys())
 
 
-def fetch_tickets_from_file(file_path, force=False):
+def _fetch_ticket(ticket_key, session, fields=SOURCE_FIELDS):
+    """Fetch one ticket over *session* and save it to ``OUTPUT_DIR``.
+
+    Raises :class:`JiraRequestError` instead of exiting so a batch can
+    carry on past a bad key.
+    """
+    data = _request_json(
+        f"{BASE_URL}/rest/api/2/issue/{ticket_key}",
+        session=session,
+        params={"fields": fields},
+        context=f"fetch_single_ticket {ticket_key}",
+        exit_on_failure=False,
+    )
+    errors = data.get("errorMessages")
+    if errors:
+        raise JiraRequestError(errors[0])
+    if "key" not in data:
+        raise JiraRequestError(f"unexpected response: {json.dumps(data)[:200]}")
+    out_path = OUTPUT_DIR / f"{ticket_key}.json"
+    out_path.write_text(json.dumps(data, indent=2))
+    return out_path
+
+
+def fetch_tickets_from_file(file_path, force=False, concurrency=DEFAULT_CONCURRENCY,
+                            fields=SOURCE_FIELDS):
     """Fetch multiple tickets listed in a text file.
 
     Reads ticket keys via :func:`load_tickets_file`, archives existing
     output in ``OUTPUT_DIR`` (prompting unless *force* is True), then
-    fetches each ticket individually.
+    fetches the tickets on *concurrency* threads sharing one pooled
+    session.  Returns a ``{key: error}`` dict of tickets that failed.
     """
     keys = load_tickets_file(file_path)
     print(f"Loaded {len(keys)} unique ticket(s) from {file_path}")
@@ -179,10 +281,33 @@ def fetch_tickets_from_file(file_path, force=False):
     archive_existing(OUTPUT_DIR, force=force)
     OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 
-    for key in keys:
-        fetch_single_ticket(key)
-
-    print(f"Fetched {len(keys)} ticket(s) from file.")
+    session = make_session(concurrency, headers=make_headers())
+    failures = {}
+    start = time.monotonic()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = {executor.submit(_fetch_ticket, key, session, fields): key for key in keys}
+        for done, future in enumerate(as_completed(futures), 1):
+            key = futures[future]
+            try:
+                future.result()
+            except JiraRequestError as exc:
+                failures[key] = str(exc)
+                print(f"  [{done}/{len(keys)}] {key}: FAILED ({exc})", file=sys.stderr)
+            else:
+                print(f"  [{done}/{len(keys)}] {key}")
+    session.close()
+    elapsed = time.monotonic() - start
+
+    fetched = len(keys) - len(failures)
+    rate = fetched / elapsed if elapsed > 0 else 0.0
+    print(f"Fetched {fetched} ticket(s) from file in {elapsed:.1f}s "
+          f"({rate:.1f} tickets/s, concurrency {concurrency}).")
+    if failures:
+        print(f"Error: {len(failures)} ticket(s) failed:", file=sys.stderr)
+        for key in keys:
+            if key in failures:
+                print(f"  {key}: {failures[key]}", file=sys.stderr)
+    return failures
 
 
 def archive_existing(output_dir, force=False):
@@ -215,11 +340,12 @@ def archive_existing(output_dir, force=False):
     return archive_path
 
 
-def fetch_single_ticket(ticket_key):
+def fetch_single_ticket(ticket_key, fields=SOURCE_FIELDS):
     """Fetch a single ticket by its key."""
     print(f"Fetching ticket {ticket_key}...")
     url = f"{BASE_URL}/rest/api/2/issue/{ticket_key}"
-    data = _request_json(url, headers=make_headers(), context=f"fetch_single_ticket {ticket_key}")
+    data = _request_json(url, headers=make_headers(), params={"fields": fields},
+                         context=f"fetch_single_ticket {ticket_key}")
 
     errors = data.get("errorMessages")
     if errors:
@@ -257,25 +383,123 @@ def load_jql_from_file(path):
     return jql
 
 
-def fetch_search(date_filter="", force=False, include_unresolved=False,
-                 unresolved_only=False, include_resolved_only=False, jql=None, number_of_tickets=None,
-                 output_file=None):
-    """Fetch tickets via JQL search with optional date filter.
+def _write_page(start_at, data):
+    out_path = OUTPUT_DIR / f"page_{start_at}.json"
+    out_path.write_text(json.dumps(data, indent=2))
 
-    When ``number_of_tickets`` is provided, only the first N tickets are
-    collected and written to ``output_file`` instead of paging to
-    ``scripts/tickets-json/``.
+
+def _page_issues(data):
+    """Return a search page's issues, exiting if the response has none."""
+    issues = data.get("issues")
+    if issues is None:
+        print("Error: Failed to parse response:", file=sys.stderr)
+        print(json.dumps(data, indent=2)[:500], file=sys.stderr)
+        sys.exit(1)
+    return issues
+
+
+def _fetch_pages_concurrently(fetch_page, offsets, concurrency, write=_write_page):
+    """Fetch the search pages at *offsets* on *concurrency* threads.
+
+    Each page is handed to ``write(startAt, data)`` (by default written
+    to ``page_<startAt>.json``) as soon as it arrives.  Returns the
+    number of issues fetched.
+    """
+    fetched = 0
+    executor = ThreadPoolExecutor(max_workers=concurrency)
+    try:
+        futures = {executor.submit(fetch_page, start): start for start in offsets}
+        for done, future in enumerate(as_completed(futures), 1):
+            start = futures[future]
+            data = future.result()
+            count = len(_page_issues(data))
+            fetched += count
+            write(start, data)
+            print(f"  Got {count} tickets at startAt={start} (page {done}/{len(futures)})")
+    except BaseException:
+        executor.shutdown(wait=False, cancel_futures=True)
+        raise
+    executor.shutdown()
+    return fetched
+
+
+class NormalizedPageWriter:
+    """Search-page sink that normalizes pages in memory as they arrive.
+
+    Each issue goes straight to ``<output_dir>/<KEY>.json`` in the
+    normalize_tickets.py schema, skipping the ``page_<startAt>.json``
+    round trip.  With *raw_archive*, the raw issues are also appended to
+    that gzip-compressed JSON-lines file (one issue per line).
     """
 
-    base_jql = jql if jql else BASE_JQL
-    jql = base_jql
+    def __init__(self, output_dir, force=False, raw_archive=None):
+        self.output_dir = Path(output_dir)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        normalize_tickets.archive_existing(self.output_dir, force=force)
+        ticket_corpus.remove_corpus(self.output_dir)
+        self.raw_archive = raw_archive
+        self._raw = None
+        if raw_archive:
+            Path(raw_archive).parent.mkdir(parents=True, exist_ok=True)
+            self._raw = gzip.open(raw_archive, "wt", encoding="utf-8")
+        self.tickets = 0
+        self.normalized_chars = 0
+
+    def __call__(self, start_at, data):
+        for issue in data["issues"]:
+            if self._raw is not None:
+                self._raw.write(json.dumps(issue, separators=(",", ":")) + "\n")
+            _, size = normalize_tickets.write_normalized_issue(issue, self.output_dir)
+            self.tickets += 1
+            self.normalized_chars += size
+
+    def close(self):
+        if self._raw is not None:
+            self._raw.close()
+            self._raw = None
+        print(f"Normalized {self.tickets} ticket(s) ({self.normalized_chars:,} chars) "
+              f"into {self.output_dir}/")
+        if self.raw_archive:
+            print(f"Raw issues archived to {self.raw_archive}")
+
+
+def _compose_jql(jql, date_filter, include_unresolved, unresolved_only,
+                 include_resolved_only):
+    """Append the resolution and date filters to *jql* (or ``BASE_JQL``)."""
+    jql = jql if jql else BASE_JQL
     if unresolved_only:
         jql += UNRESOLVED_FILTER
     elif include_resolved_only:
         jql += RESOLVED_FILTER
     elif not include_unresolved:
         jql += RESOLVED_FILTER
-    jql += date_filter
+    return jql + date_filter
+
+
+def fetch_search(date_filter="", force=False, include_unresolved=False,
+                 unresolved_only=False, include_resolved_only=False, jql=None, number_of_tickets=None,
+                 output_file=None, concurrency=DEFAULT_CONCURRENCY, fields=SOURCE_FIELDS,
+                 write_page=None):
+    """Fetch tickets via JQL search with optional date filter.
+
+    When ``number_of_tickets`` is provided, only the first N tickets are
+    collected and written to ``output_file`` instead of paging to
+    ``scripts/tickets-json/``.
+
+    All requests share one pooled session.  With ``concurrency`` > 1 the
+    first page's ``total`` is used to fetch the remaining pages on that
+    many threads; paging then continues serially until Jira returns an
+    empty page, which picks up tickets created during the fetch.
+
+    Only *fields* are requested (by default the ones normalize_tickets.py
+    reads); pass ``ALL_FIELDS`` for the full payload.
+
+    *write_page* replaces writing ``page_<startAt>.json`` (for example a
+    :class:`NormalizedPageWriter`); ``tickets-json/`` is then left alone.
+    """
+
+    jql = _compose_jql(jql, date_filter, include_unresolved, unresolved_only,
+                       include_resolved_only)
 
     encoded_jql = quote(jql)
     print(f"JQL URL: {BASE_URL}/issues/?jql={encoded_jql}")
@@ -290,36 +514,35 @@ def fetch_search(date_filter="", force=False, include_unresolved=False,
             raise ValueError("output_file is required when limiting tickets")
         output_path = Path(output_file)
         output_path.parent.mkdir(parents=True, exist_ok=True)
-    else:
+    elif write_page is None:
         archive_existing(OUTPUT_DIR, force=force)
         OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+    write_page = write_page or _write_page
 
-    headers = make_headers()
+    session = make_session(concurrency, headers=make_headers())
     start_at = 0
-    max_results = min(remaining, 100) if limited_mode else 100
+    max_results = min(remaining, SEARCH_PAGE_SIZE) if limited_mode else SEARCH_PAGE_SIZE
     total_fetched = 0
     pages = 0
     reported_total = None
 
-    while True:
-        print(f"Fetching tickets starting at {start_at}...")
-        data = _request_json(
+    def fetch_page(start, page_size=SEARCH_PAGE_SIZE):
+        return _request_json(
             f"{BASE_URL}/rest/api/2/search",
-            headers=headers,
+            session=session,
             params={
                 "jql": jql,
-                "startAt": start_at,
-                "maxResults": max_results,
-                "fields": "*all,comment",
+                "startAt": start,
+                "maxResults": page_size,
+                "fields": fields,
             },
-            context=f"fetch_search startAt={start_at} maxResults={max_results}",
+            context=f"fetch_search startAt={start} maxResults={page_size}",
         )
-        issues = data.get("issues")
 
-        if issues is None:
-            print("Error: Failed to parse response:", file=sys.stderr)
-            print(json.dumps(data, indent=2)[:500], file=sys.stderr)
-            sys.exit(1)
+    while True:
+        print(f"Fetching tickets starting at {start_at}...")
+        data = fetch_page(start_at, max_results)
+        issues = _page_issues(data)
 
         count = len(issues)
         if count == 0:
@@ -342,7 +565,7 @@ def fetch_search(date_filter="", force=False, include_unresolved=False,
                 break
 
             start_at += count
-            max_results = min(remaining, 100) if remaining is not None else 100
+            max_results = min(remaining, SEARCH_PAGE_SIZE) if remaining is not None else SEARCH_PAGE_SIZE
             pages += 1
             # Continue fetching until Jira returns 0 issues.
             continue
@@ -350,12 +573,21 @@ def fetch_search(date_filter="", force=False, include_unresolved=False,
         total_fetched += count
         print(f"  Got {count} tickets ({total_fetched}/{total} total)")
 
-        out_path = OUTPUT_DIR / f"page_{start_at}.json"
-        out_path.write_text(json.dumps(data, indent=2))
+        write_page(start_at, data)
 
         start_at += max_results
         pages += 1
 
+        if concurrency > 1 and pages == 1 and isinstance(total, int) and total > start_at:
+            offsets = range(start_at, total, max_results)
+            print(f"Fetching {len(offsets)} more page(s) with {concurrency} concurrent requests...")
+            total_fetched += _fetch_pages_concurrently(fetch_page, offsets, concurrency,
+                                                       write=write_page)
+            pages += len(offsets)
+            start_at = offsets[-1] + max_results
+
+    session.close()
+
     if limited_mode:
         payload = {
             "issues": limited_issues,
@@ -370,6 +602,195 @@ def fetch_search(date_filter="", force=False, include_unresolved=False,
         print(f"Done. Fetched {total_fetched} tickets across {pages} pages.")
 
 
+def load_sync_state(path=None):
+    """Return the ``{sync_key: entry}`` high-water marks saved by :func:`sync_search`."""
+    path = path or SYNC_STATE_PATH
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return {}
+    except (OSError, json.JSONDecodeError) as exc:
+        print(f"Warning: failed reading {path} ({exc}); running a full sync.")
+        return {}
+
+
+def save_sync_state(state, path=None):
+    path = path or SYNC_STATE_PATH
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps(state, indent=2, sort_keys=True), encoding="utf-8")
+    tmp.replace(path)
+
+
+def _issue_updated(issue):
+    """Parse an issue's ``fields.updated`` timestamp, or None."""
+    value = (issue.get("fields") or {}).get("updated")
+    try:
+        return datetime.strptime(value, JIRA_TIME_FORMAT)
+    except (TypeError, ValueError):
+        return None
+
+
+def jql_timezone(session=None):
+    """Return the Jira user's profile timezone, in which JQL reads dates.
+
+    ``None`` when ``/myself`` cannot be read or names an unknown zone.
+    """
+    try:
+        data = _request_json(f"{BASE_URL}/rest/api/2/myself", session=session,
+                             context="Jira profile", exit_on_failure=False)
+        return ZoneInfo(data["timeZone"])
+    except (JiraRequestError, KeyError, TypeError, ValueError, ZoneInfoNotFoundError):
+        return None
+
+
+def parse_sync_mark(value, tz=None):
+    """Parse a stored high-water mark into an aware datetime.
+
+    Marks are stored as ISO timestamps with an offset; older
+    minute-precision marks without one are read in *tz* (UTC if unknown).
+    """
+    mark = datetime.fromisoformat(value)
+    if mark.tzinfo is None:
+        mark = mark.replace(tzinfo=tz or timezone.utc)
+    return mark
+
+
+def jql_mark(mark, tz):
+    """Format *mark* for ``updated >= "..."`` in the JQL timezone *tz*.
+
+    The value is ``SYNC_OVERLAP`` earlier than *mark*, and a further
+    ``MAX_UTC_OFFSET`` earlier when *tz* is unknown.
+    """
+    overlap = SYNC_OVERLAP if tz is not None else SYNC_OVERLAP + MAX_UTC_OFFSET
+    return (mark - overlap).astimezone(tz or timezone.utc).strftime(JQL_MARK_FORMAT)
+
+
+def strip_order_by(jql):
+    """Return *jql* without its trailing ``ORDER BY`` clause, if any."""
+    return ORDER_BY_RE.sub("", jql)
+
+
+def _upsert_ticket(issue):
+    """Write *issue* to ``OUTPUT_DIR/<key>.json``, replacing any older copy."""
+    out_path = OUTPUT_DIR / f"{issue['key']}.json"
+    tmp = out_path.with_name(out_path.name + ".tmp")
+    tmp.write_text(json.dumps(issue, indent=2))
+    tmp.replace(out_path)
+
+
+def sync_search(date_filter="", force=False, include_unresolved=False,
+                unresolved_only=False, include_resolved_only=False, jql=None,
+                sync_key=SYNC_DEFAULT_KEY, concurrency=DEFAULT_CONCURRENCY,
+                fields=SOURCE_FIELDS):
+    """Fetch only tickets updated since the last sync of *sync_key*.
+
+    Each matching issue is upserted as ``OUTPUT_DIR/<key>.json`` (the
+    single-ticket layout normalize_tickets.py already reads) instead of
+    archiving and refetching everything.  The newest ``updated`` seen,
+    capped at the time the sync started, becomes the high-water mark for
+    the next run.  The next query asks for ``updated >= mark`` converted
+    to the Jira user's timezone and ``SYNC_OVERLAP`` earlier, so boundary
+    tickets are refetched rather than missed.  Pages are ordered by key,
+    which updates during the sync do not change, so no ticket shifts
+    across a page boundary unseen.  A changed query (JQL file content or
+    filters) or leftover ``page_*.json`` files from a full fetch start a
+    full sync.  Tickets that drop out of the query are not removed.
+    An ``ORDER BY`` in *jql* is dropped in favour of the key order.
+    """
+    if jql and strip_order_by(jql) != jql:
+        print("Note: dropping the ORDER BY of the JQL; syncs page by key.")
+        jql = strip_order_by(jql)
+    jql = _compose_jql(jql, date_filter, include_unresolved, unresolved_only,
+                       include_resolved_only)
+    requested = fields.split(",")
+    if "updated" not in requested and "*all" not in requested:
+        fields += ",updated"  # the high-water mark is read from it
+    state = load_sync_state()
+    entry = state.get(sync_key) or {}
+    mark = entry.get("updated") if entry.get("jql") == jql else None
+
+    if any(OUTPUT_DIR.glob("page_*.json")):
+        print(f"{OUTPUT_DIR}/ holds page files from a full fetch; archiving before syncing.")
+        archive_existing(OUTPUT_DIR, force=force)
+        mark = None
+    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+
+    session = make_session(concurrency, headers=make_headers())
+    started = datetime.now(timezone.utc)
+    query = jql
+    if mark:
+        tz = jql_timezone(session)
+        if tz is None:
+            print(f"Warning: Jira profile timezone unknown; re-querying "
+                  f"{MAX_UTC_OFFSET} extra before the mark.")
+        mark = parse_sync_mark(mark, tz)
+        query += f'\n     AND updated >= "{jql_mark(mark, tz)}"'
+        print(f"Syncing {sync_key}: tickets updated since {mark.isoformat()}")
+    else:
+        print(f"Syncing {sync_key}: no high-water mark, fetching all tickets")
+    query += "\nORDER BY key ASC"
+    print(f"JQL URL: {BASE_URL}/issues/?jql={quote(query)}")
+    print()
+
+    newest = None
+    upserted = 0
+
+    def fetch_page(start):
+        return _request_json(
+            f"{BASE_URL}/rest/api/2/search",
+            session=session,
+            params={
+                "jql": query,
+                "startAt": start,
+                "maxResults": SEARCH_PAGE_SIZE,
+                "fields": fields,
+            },
+            context=f"sync_search startAt={start}",
+        )
+
+    def upsert_page(start, data):
+        nonlocal newest, upserted
+        issues = _page_issues(data)
+        for issue in issues:
+            _upsert_ticket(issue)
+            updated = _issue_updated(issue)
+            if updated is not None and (newest is None or updated > newest):
+                newest = updated
+        upserted += len(issues)
+        return len(issues)
+
+    start_at = 0
+    while True:
+        print(f"Fetching tickets starting at {start_at}...")
+        data = fetch_page(start_at)
+        if upsert_page(start_at, data) == 0:
+            break
+        total = data.get("total")
+        start_at += SEARCH_PAGE_SIZE
+        if concurrency > 1 and start_at == SEARCH_PAGE_SIZE and isinstance(total, int) \
+                and total > start_at:
+            offsets = range(start_at, total, SEARCH_PAGE_SIZE)
+            _fetch_pages_concurrently(fetch_page, offsets, concurrency, write=upsert_page)
+            start_at = offsets[-1] + SEARCH_PAGE_SIZE
+    session.close()
+
+    if newest is not None:
+        # Tickets in the overlap are older than the mark they were fetched for
+        newest = min(newest, started)
+        mark = newest if mark is None else max(mark, newest)
+    if mark:
+        mark = mark.astimezone(timezone.utc).isoformat(timespec="seconds")
+    state[sync_key] = {
+        "jql": jql,
+        "updated": mark,
+        "synced_at": datetime.now().isoformat(timespec="seconds"),
+        "tickets": upserted,
+    }
+    save_sync_state(state)
+    print(f"Done. Upserted {upserted} ticket(s) into {OUTPUT_DIR}/; high-water mark {mark}.")
+    return upserted
+
+
 def build_date_filter(args):
     """Build JQL date filter clause from parsed args."""
     if args.relative_days is not None:
@@ -404,6 +825,12 @@ def _extract_positional_tokens(argv_list):
         "--tickets-file": 1,
         "--number-of-tickets": 1,
         "--output-file": 1,
+        "--concurrency": 1,
+        "--sync": 0,
+        "--fields": 1,
+        "--normalize": 0,
+        "--normalized-dir": 1,
+        "--raw-archive": 1,
         "-h": 0,
         "--help": 0,
     }
@@ -463,6 +890,7 @@ examples:
   %(prog)s -t https://jira-sd.mc1.oracleiaas.com/browse/DO-2639750
   %(prog)s -f tickets.txt                Fetch tickets listed in file
   %(prog)s -f tickets.txt -y             Fetch from file, skip archive prompt
+  %(prog)s -a --sync --jql-file q.jql   Fetch only tickets updated since the last sync
 """,
     )
     parser.add_argument(
@@ -489,6 +917,11 @@ examples:
         "-y", "--yes", action="store_true",
         help="Skip confirmation prompt when overwriting existing tickets",
     )
+    parser.add_argument(
+        "--sync", action="store_true",
+        help="With -a/--all, fetch only tickets updated since the last sync of "
+             "this JQL file and upsert them as per-ticket files",
+    )
     parser.add_argument(
         "-t", "--ticket",
         help="Fetch a single ticket by key (e.g. DO-2639750) or browse URL",
@@ -506,6 +939,31 @@ examples:
         "--output-file",
         help="Path to save the limited ticket batch (requires --number-of-tickets)",
     )
+    parser.add_argument(
+        "--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+        help="Requests run in parallel over a shared connection pool: search "
+             "pages in -a/--all mode, tickets in -f/--tickets-file mode "
+             f"(default: {DEFAULT_CONCURRENCY})",
+    )
+    parser.add_argument(
+        "--fields", default=SOURCE_FIELDS,
+        help="Comma-separated Jira fields to request (default: the fields "
+             f"normalize_tickets.py reads; '{ALL_FIELDS}' for everything)",
+    )
+    parser.add_argument(
+        "--normalize", action="store_true",
+        help="With -a/--all, normalize each page as it arrives and write per-ticket "
+             "files to normalized-tickets/<today>/ instead of page files",
+    )
+    parser.add_argument(
+        "--normalized-dir",
+        help="Output directory for --normalize "
+             "(default: scripts/normalized-tickets/<YYYY-MM-DD>)",
+    )
+    parser.add_argument(
+        "--raw-archive",
+        help="With --normalize, also keep the raw issues in this gzip JSON-lines file",
+    )
     parser.add_argument(
         "positional", nargs="*", metavar="ARG",
         help="Relative days (-Nd), start date (YYYY-MM-DD), or start and end dates",
@@ -536,6 +994,26 @@ examples:
     if args.include_resolved_only and args.unresolved_only:
         parser.error("--include-resolved-only and --unresolved-only are mutually exclusive")
 
+    if args.sync and not args.fetch_all:
+        parser.error("--sync requires -a/--all")
+    if args.sync and args.number_of_tickets is not None:
+        parser.error("--sync and --number-of-tickets are mutually exclusive")
+
+    if args.normalize:
+        if not args.fetch_all:
+            parser.error("--normalize requires -a/--all")
+        if args.sync or args.number_of_tickets is not None:
+            parser.error("--normalize cannot be combined with --sync or --number-of-tickets")
+        if args.normalized_dir is None:
+            args.normalized_dir = str(
+                normalize_tickets.DEFAULT_OUTPUT_DIR / datetime.now().strftime("%Y-%m-%d")
+            )
+    elif args.normalized_dir or args.raw_archive:
+        parser.error("--normalized-dir and --raw-archive require --normalize")
+
+    if args.concurrency < 1:
+        parser.error("--concurrency must be a positive integer")
+
     if args.number_of_tickets is not None:
         if not args.fetch_all:
             parser.error("--number-of-tickets requires -a/--all")
@@ -642,22 +1120,50 @@ def main(argv=None):
         if not ticket_key:
             print(f"Error: Invalid ticket key or URL: {args.ticket}", file=sys.stderr)
             sys.exit(1)
-        fetch_single_ticket(ticket_key)
+        fetch_single_ticket(ticket_key, fields=args.fields)
     elif args.tickets_file:
-        fetch_tickets_from_file(args.tickets_file, force=args.yes)
+        failures = fetch_tickets_from_file(
+            args.tickets_file, force=args.yes, concurrency=args.concurrency,
+            fields=args.fields,
+        )
+        if failures:
+            sys.exit(1)
     elif args.fetch_all:
         date_filter = build_date_filter(args)
         custom_jql = load_jql_from_file(args.jql_file) if args.jql_file else None
-        fetch_search(
-            date_filter,
-            force=args.yes,
-            include_unresolved=args.include_unresolved,
-            unresolved_only=args.unresolved_only,
-            include_resolved_only=args.include_resolved_only,
-            jql=custom_jql,
-            number_of_tickets=args.number_of_tickets,
-            output_file=args.output_file,
-        )
+        if args.sync:
+            sync_search(
+                date_filter,
+                force=args.yes,
+                include_unresolved=args.include_unresolved,
+                unresolved_only=args.unresolved_only,
+                include_resolved_only=args.include_resolved_only,
+                jql=custom_jql,
+                sync_key=str(Path(args.jql_file).resolve()) if args.jql_file else SYNC_DEFAULT_KEY,
+                concurrency=args.concurrency,
+                fields=args.fields,
+            )
+        else:
+            writer = None
+            if args.normalize:
+                writer = NormalizedPageWriter(
+                    args.normalized_dir, force=args.yes, raw_archive=args.raw_archive,
+                )
+            fetch_search(
+                date_filter,
+                force=args.yes,
+                include_unresolved=args.include_unresolved,
+                unresolved_only=args.unresolved_only,
+                include_resolved_only=args.include_resolved_only,
+                jql=custom_jql,
+                number_of_tickets=args.number_of_tickets,
+                output_file=args.output_file,
+                concurrency=args.concurrency,
+                fields=args.fields,
+                write_page=writer,
+            )
+            if writer is not None:
+                writer.close()
 
     elapsed = time.monotonic() - start_time
     print(f"\nCompleted in {elapsed:.2f}s.")
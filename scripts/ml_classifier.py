@@ -3,21 +3,28 @@
 Local ML classifier for ticket categorization.
 
 Provides a TF-IDF + SGDClassifier pipeline as a fallback for tickets
-that the rule engine cannot match.  The module is used by:
+that the rule engine cannot match, and a hashing-vectorizer variant
+whose size does not grow with the vocabulary.  The module is used by:
 
 - ``ml_train.py``  — to train and serialize a model
 - ``rule_engine_categorize.py`` — to predict categories at inference time
+
+sklearn, scipy and joblib are imported by the functions that need them,
+not with the module: ``load_model`` returns a ``ml_inference`` model
+when one was exported, and predicting with it imports neither.
 """
 
+import hashlib
 import json
+import os
+import time
+import weakref
 from pathlib import Path
+from typing import NamedTuple
+
+import numpy as np
 
-import joblib
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.linear_model import SGDClassifier
-from sklearn.metrics import classification_report
-from sklearn.model_selection import cross_val_score
-from sklearn.pipeline import Pipeline
+import ml_inference
 
 # Minimum confidence to accept an ML prediction as usable
 ML_CONFIDENCE_THRESHOLD = 0.4
@@ -25,6 +32,58 @@ ML_CONFIDENCE_THRESHOLD = 0.4
 # Minimum number of labeled samples required to train
 MIN_TRAINING_SAMPLES = 20
 
+# Rows per predict_proba call in predict_batch
+PREDICT_BATCH_SIZE = 512
+
+TFIDF_PARAMS = {
+    "max_features": 5000,
+    "ngram_range": (1, 2),
+    "sublinear_tf": True,
+    "min_df": 2,
+    "stop_words": "english",
+}
+
+CLASSIFIER_PARAMS = {
+    "loss": "modified_huber",
+    "class_weight": "balanced",
+    "max_iter": 1000,
+    "random_state": 42,
+}
+
+# Feature extraction of the hashing family.  Raw counts: the TF-IDF step
+# after it applies sublinear tf, IDF and l2 norm as in the tfidf family.
+HASHING_PARAMS = {
+    "n_features": 2 ** 18,
+    "ngram_range": TFIDF_PARAMS["ngram_range"],
+    "stop_words": TFIDF_PARAMS["stop_words"],
+    "alternate_sign": False,
+    "norm": None,
+}
+
+MODEL_FAMILIES = ("tfidf", "hashing")
+
+# Side file of a hashing-family model naming its columns (see TermIndex)
+TERM_INDEX_SUFFIX = ".terms.npz"
+
+# Candidates tried by search_params (ml_train.py --search)
+SEARCH_GRID = {
+    "tfidf__ngram_range": [(1, 1), (1, 2)],
+    "tfidf__max_features": [2000, 5000, 20000],
+    "tfidf__min_df": [1, 2],
+    "clf__alpha": [1e-5, 1e-4, 1e-3],
+}
+
+# Held-out tickets timed for search_params' inference latency, and the
+# timed runs per candidate (the fastest counts)
+LATENCY_SAMPLE = 200
+LATENCY_REPEATS = 3
+
+# Below this many samples min_df=2 could prune every term
+SMALL_DATASET_SAMPLES = 50
+
+# Term-count matrices kept in a feature cache directory
+FEATURE_CACHE_ENTRIES = 4
+
 
 def build_feature_text(ticket_data):
     """Concatenate summary + description + labels + comments into one string.
@@ -52,38 +111,370 @@ def build_feature_text(ticket_data):
 
 def build_pipeline():
     """Return an untrained sklearn Pipeline (TF-IDF + SGDClassifier)."""
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.pipeline import Pipeline
+
+    return Pipeline([
+        ("tfidf", TfidfVectorizer(**TFIDF_PARAMS)),
+        ("clf", build_classifier()),
+    ])
+
+
+def build_classifier(**params):
+    """Return the untrained classifier step, with optional SGD *params*."""
+    from sklearn.linear_model import SGDClassifier
+
+    return SGDClassifier(**dict(CLASSIFIER_PARAMS, **params))
+
+
+def split_params(params):
+    """Split ``{"tfidf__x": ..., "clf__y": ...}`` into the two steps' params.
+
+    Vectorizer params are limited to those ``fit_tfidf`` can apply to the
+    cached term counts.
+    """
+    tfidf, clf = {}, {}
+    for name, value in (params or {}).items():
+        step, _, param = name.partition("__")
+        if step == "tfidf" and param in ("max_features", "min_df", "ngram_range"):
+            tfidf[param] = value
+        elif step == "clf":
+            clf[param] = value
+        else:
+            raise ValueError(f"Unsupported parameter: {name}")
+    return tfidf, clf
+
+
+def count_terms(texts):
+    """Tokenize *texts* once with the pipeline's analyzer.
+
+    Returns ``(counts, terms)``: the CSR document-term count matrix over
+    every n-gram in *texts* and its column terms, sorted alphabetically
+    as ``TfidfVectorizer`` sorts its vocabulary.
+    """
+    import scipy.sparse as sp
+    from sklearn.feature_extraction.text import CountVectorizer
+
+    vectorizer = CountVectorizer(
+        ngram_range=TFIDF_PARAMS["ngram_range"],
+        stop_words=TFIDF_PARAMS["stop_words"],
+        dtype=np.float64,
+    )
+    counts = vectorizer.fit_transform(texts)
+    return sp.csr_matrix(counts), vectorizer.get_feature_names_out()
+
+
+def _feature_cache_key(texts):
+    h = hashlib.sha256(repr(sorted(TFIDF_PARAMS.items())).encode("utf-8"))
+    for text in texts:
+        h.update(text.encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()[:16]
+
+
+def cached_term_counts(texts, cache_dir=None):
+    """Return ``count_terms(texts)``, reusing a copy cached in *cache_dir*.
+
+    Entries are keyed by the distinct texts, so the same corpus relabeled
+    or reordered hits the cache; rows are mapped back to *texts* order.
+    The ``FEATURE_CACHE_ENTRIES`` most recently used entries are kept.
+    """
+    import scipy.sparse as sp
+
+    unique = sorted(set(texts))
+    position = {text: i for i, text in enumerate(unique)}
+    rows = [position[text] for text in texts]
+    if cache_dir is None:
+        counts, terms = count_terms(unique)
+        return counts[rows], terms
+
+    cache_dir = Path(cache_dir)
+    path = cache_dir / f"{_feature_cache_key(unique)}.npz"
+    if path.is_file():
+        with np.load(path, allow_pickle=False) as cached:
+            counts = sp.csr_matrix(
+                (cached["data"], cached["indices"], cached["indptr"]),
+                shape=tuple(cached["shape"]),
+            )
+            terms = cached["terms"]
+        os.utime(path)
+    else:
+        counts, terms = count_terms(unique)
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        with open(tmp, "wb") as f:
+            np.savez(f, data=counts.data, indices=counts.indices,
+                     indptr=counts.indptr, shape=np.array(counts.shape),
+                     terms=np.asarray(terms, dtype=str))
+        tmp.replace(path)
+        entries = sorted(cache_dir.glob("*.npz"), key=lambda p: p.stat().st_mtime_ns)
+        for stale in entries[:-FEATURE_CACHE_ENTRIES]:
+            stale.unlink()
+    return counts[rows], terms
+
+
+def ngram_columns(terms, ngram_range):
+    """Return the columns of *terms* whose n-gram size is in *ngram_range*.
+
+    The cached counts hold every n-gram up to ``TFIDF_PARAMS["ngram_range"]``,
+    and a narrower range selects the same terms the analyzer would emit.
+    """
+    low, high = ngram_range
+    if low < 1 or high < low or high > TFIDF_PARAMS["ngram_range"][1]:
+        raise ValueError(f"Unsupported ngram_range: {ngram_range}")
+    sizes = np.char.count(np.asarray(terms, dtype=str), " ") + 1
+    return np.where((sizes >= low) & (sizes <= high))[0]
+
+
+def fit_tfidf(counts, min_df, max_features=TFIDF_PARAMS["max_features"], columns=None):
+    """Select terms and fit IDF weights on the documents of *counts*.
+
+    Reproduces ``TfidfVectorizer.fit`` on those documents (``min_df``
+    pruning, then the *max_features* most frequent terms) from their
+    term counts, without tokenizing.  *columns* restricts the candidate
+    terms (see ``ngram_columns``).  Returns ``(columns, transformer)``:
+    the kept columns of *counts* and the fitted ``TfidfTransformer``.
+    """
+    from sklearn.feature_extraction.text import TfidfTransformer
+
+    if columns is None:
+        columns = np.arange(counts.shape[1])
+    candidates = counts[:, columns]
+    dfs = np.bincount(candidates.indices, minlength=len(columns))
+    mask = dfs >= min_df
+    if max_features is not None and mask.sum() > max_features:
+        tfs = np.asarray(candidates.sum(axis=0)).ravel()
+        keep = np.where(mask)[0][(-tfs[mask]).argsort()[:max_features]]
+        mask = np.zeros(len(dfs), dtype=bool)
+        mask[keep] = True
+    if not mask.any():
+        raise ValueError(
+            "After pruning, no terms remain. Try a lower min_df or a higher max_df."
+        )
+    transformer = TfidfTransformer(sublinear_tf=TFIDF_PARAMS["sublinear_tf"])
+    transformer.fit(candidates[:, mask])
+    return columns[mask], transformer
+
+
+def fitted_vectorizer(terms, columns, transformer, params):
+    """Return a fitted ``TfidfVectorizer`` for a ``fit_tfidf`` result.
+
+    *params* are the vectorizer params it was fitted with.  It transforms
+    raw text exactly like one fitted on the documents, so the saved
+    pipeline predicts on text as before.
+    """
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
+    vectorizer = TfidfVectorizer(**dict(TFIDF_PARAMS, **params),
+                                 vocabulary=list(terms[columns]))
+    vectorizer.idf_ = transformer.idf_
+    return vectorizer
+
+
+def build_hashing_pipeline(class_weight=None):
+    """Return an untrained hashing-family Pipeline.
+
+    Hashing needs no fitted vocabulary, so new rows can be folded in
+    with ``partial_update``.  ``partial_fit`` does not accept
+    ``class_weight="balanced"``; pass the weights as a dict instead
+    (see ``balanced_class_weight``).
+    """
+    from sklearn.feature_extraction.text import HashingVectorizer, TfidfTransformer
+    from sklearn.pipeline import Pipeline
+
     return Pipeline([
-        ("tfidf", TfidfVectorizer(
-            max_features=5000,
-            ngram_range=(1, 2),
-            sublinear_tf=True,
-            min_df=2,
-            stop_words="english",
-        )),
-        ("clf", SGDClassifier(
-            loss="modified_huber",
-            class_weight="balanced",
-            max_iter=1000,
-            random_state=42,
-        )),
+        ("hash", HashingVectorizer(**HASHING_PARAMS)),
+        ("tfidf", TfidfTransformer(sublinear_tf=TFIDF_PARAMS["sublinear_tf"])),
+        ("clf", build_classifier(class_weight=class_weight)),
     ])
 
 
-def train_model(texts, labels):
+def balanced_class_weight(labels):
+    """Return ``class_weight="balanced"`` for *labels* as a dict."""
+    from sklearn.utils.class_weight import compute_class_weight
+
+    classes = np.unique(labels)
+    weights = compute_class_weight("balanced", classes=classes, y=labels)
+    return dict(zip(classes.tolist(), weights.tolist()))
+
+
+def hash_buckets(terms):
+    """Column ``HashingVectorizer(**HASHING_PARAMS)`` puts each term in."""
+    from sklearn.utils import murmurhash3_32
+
+    hashes = np.array([murmurhash3_32(term, seed=0) for term in terms], dtype=np.int64)
+    return np.abs(hashes) % HASHING_PARAMS["n_features"]
+
+
+def hash_counts(counts, terms):
+    """Map term counts to ``HashingVectorizer(**HASHING_PARAMS)`` output.
+
+    Each term's column is added into its ``hash_buckets`` column, so the
+    hashing family trains from the same cached counts as the TF-IDF one.
+    """
+    import scipy.sparse as sp
+
+    projection = sp.csr_matrix(
+        (np.ones(len(terms)), (np.arange(len(terms)), hash_buckets(terms))),
+        shape=(len(terms), HASHING_PARAMS["n_features"]),
+    )
+    return sp.csr_matrix(counts @ projection)
+
+
+class TermIndex(NamedTuple):
+    """Reverse index of a hashing-family model's columns.
+
+    The training terms sorted by the column they hash to, so the terms
+    of column ``c`` are ``terms[lo:hi]`` for ``lo, hi =
+    buckets.searchsorted([c, c + 1])``.  It is kept out of the pickled
+    pipeline, which therefore has the same size whatever the vocabulary,
+    and only loaded to explain predictions.
+    """
+
+    buckets: np.ndarray
+    terms: list
+
+    def column_terms(self, column):
+        lo, hi = self.buckets.searchsorted([column, column + 1])
+        return self.terms[lo:hi]
+
+
+def build_term_index(terms):
+    """Return the ``TermIndex`` of *terms*."""
+    terms = sorted(set(terms))
+    buckets = hash_buckets(terms)
+    order = np.argsort(buckets, kind="stable")
+    return TermIndex(buckets[order].astype(np.int32), [terms[i] for i in order])
+
+
+def extend_term_index(index, texts):
+    """Return *index* plus the terms of *texts*."""
+    from sklearn.feature_extraction.text import HashingVectorizer
+
+    analyze = HashingVectorizer(**HASHING_PARAMS).build_analyzer()
+    terms = set(index.terms if index is not None else ())
+    for text in texts:
+        terms.update(analyze(text))
+    return build_term_index(terms)
+
+
+def term_index_path(model_path):
+    model_path = Path(model_path)
+    return model_path.with_name(model_path.name + TERM_INDEX_SUFFIX)
+
+
+def save_term_index(path, index):
+    # One UTF-8 blob instead of a fixed-width string array; analyzer
+    # terms never contain a newline
+    blob = "\n".join(index.terms).encode("utf-8")
+    np.savez_compressed(path, buckets=index.buckets,
+                        terms=np.frombuffer(blob, dtype=np.uint8))
+
+
+def load_term_index(model_path):
+    """Return the ``TermIndex`` saved next to *model_path*, or ``None``."""
+    path = term_index_path(model_path)
+    if not path.is_file():
+        return None
+    with np.load(path) as data:
+        buckets = data["buckets"]
+        terms = data["terms"].tobytes().decode("utf-8").split("\n") if len(buckets) else []
+    return TermIndex(buckets, terms)
+
+
+class _CountsFit:
+    """A pipeline of *family* fitted on *rows* of the term counts.
+
+    For the hashing family *counts* are already hashed (``hash_counts``).
+    """
+
+    def __init__(self, family, counts, terms, rows, y, tfidf_params, clf_params):
+        from sklearn.feature_extraction.text import TfidfTransformer
+
+        self.family = family
+        self.counts = counts
+        self.terms = terms
+        self.tfidf_params = tfidf_params
+        if family == "hashing":
+            self.columns = np.arange(counts.shape[1])
+            self.transformer = TfidfTransformer(sublinear_tf=TFIDF_PARAMS["sublinear_tf"])
+            self.transformer.fit(counts[rows])
+            clf_params = dict({"class_weight": balanced_class_weight(y[rows])}, **clf_params)
+        else:
+            params = dict(TFIDF_PARAMS, **tfidf_params)
+            self.columns, self.transformer = fit_tfidf(
+                counts[rows], params["min_df"], params["max_features"],
+                columns=ngram_columns(terms, params["ngram_range"]),
+            )
+        self.clf = build_classifier(**clf_params).fit(self.features(rows), y[rows])
+
+    def features(self, rows):
+        """Model features of *rows* of the counts."""
+        return self.transformer.transform(self.counts[rows][:, self.columns])
+
+    def pipeline(self):
+        """The fitted Pipeline, predicting from raw text."""
+        from sklearn.feature_extraction.text import HashingVectorizer
+        from sklearn.pipeline import Pipeline
+
+        if self.family == "hashing":
+            return Pipeline([
+                ("hash", HashingVectorizer(**HASHING_PARAMS)),
+                ("tfidf", self.transformer),
+                ("clf", self.clf),
+            ])
+        return Pipeline([
+            ("tfidf", fitted_vectorizer(self.terms, self.columns, self.transformer,
+                                        self.tfidf_params)),
+            ("clf", self.clf),
+        ])
+
+
+def _cv_folds(labels):
+    """Stratified CV folds as ``cross_val_score`` would use them, or ``[]``.
+
+    At most 3 folds, fewer if classes are small, none when a class has a
+    single sample.
+    """
+    from sklearn.model_selection import StratifiedKFold
+
+    n_folds = min(3, min(labels.count(c) for c in set(labels)))
+    if n_folds < 2:
+        return []
+    return list(StratifiedKFold(n_folds).split(np.zeros(len(labels)), labels))
+
+
+def train_model(texts, labels, feature_cache=None, params=None, family="tfidf"):
     """Train the pipeline on labeled data.
 
+    The texts are tokenized once (or not at all when *feature_cache*
+    holds their term counts).  The full fit and every cross-validation
+    fold derive their features from those counts, with results identical
+    to fitting ``build_pipeline()`` (or, for the ``"hashing"`` *family*,
+    ``build_hashing_pipeline``) on the texts of each.
+
     Parameters
     ----------
     texts : list[str]
         Feature text for each ticket (output of ``build_feature_text``).
     labels : list[str]
         Ground-truth ``Category of Issue`` label for each ticket.
+    feature_cache : Path | str | None
+        Directory for cached term counts (see ``cached_term_counts``).
+    params : dict | None
+        Pipeline parameter overrides such as ``{"tfidf__min_df": 1,
+        "clf__alpha": 1e-4}`` (see ``split_params``), e.g. the choice of
+        ``search_params``.  Vectorizer overrides apply to the ``"tfidf"``
+        family only.
+    family : str
+        One of ``MODEL_FAMILIES``.
 
     Returns
     -------
     tuple[Pipeline, dict]
         The fitted pipeline and a metrics dict with keys
         ``"cv_accuracy"``, ``"n_samples"``, ``"n_classes"``,
+        ``"params"`` (the effective vectorizer and classifier params)
         and ``"report"`` (the sklearn classification report string).
 
     Raises
@@ -91,45 +482,172 @@ def train_model(texts, labels):
     ValueError
         If fewer than ``MIN_TRAINING_SAMPLES`` samples are provided.
     """
+    from sklearn.metrics import classification_report
+
     if len(texts) < MIN_TRAINING_SAMPLES:
         raise ValueError(
             f"Need at least {MIN_TRAINING_SAMPLES} samples to train, "
             f"got {len(texts)}"
         )
+    if family not in MODEL_FAMILIES:
+        raise ValueError(f"Unknown model family: {family}")
 
-    pipeline = build_pipeline()
-
+    tfidf_params, clf_params = split_params(params)
+    if family == "hashing" and tfidf_params:
+        raise ValueError("Vectorizer parameters apply to the tfidf family only")
     # If min_df=2 would eliminate all features (very small datasets),
-    # rebuild with min_df=1
-    unique_classes = sorted(set(labels))
-    if len(texts) < 50:
-        pipeline.set_params(tfidf__min_df=1)
-
-    pipeline.fit(texts, labels)
-
-    # Cross-validation (use at most 3 folds, or fewer if classes are small)
-    n_folds = min(3, min(labels.count(c) for c in unique_classes))
-    if n_folds >= 2:
-        cv_scores = cross_val_score(pipeline, texts, labels, cv=n_folds)
-        cv_accuracy = float(cv_scores.mean())
+    # use min_df=1
+    if family == "tfidf" and len(texts) < SMALL_DATASET_SAMPLES:
+        tfidf_params.setdefault("min_df", 1)
+
+    counts, terms = cached_term_counts(texts, feature_cache)
+    if family == "hashing":
+        # Name only terms the tfidf family would keep: rare terms make up
+        # most of the vocabulary and explain little
+        min_df = 1 if len(texts) < SMALL_DATASET_SAMPLES else TFIDF_PARAMS["min_df"]
+        term_df = np.bincount(counts.indices, minlength=len(terms))
+        term_index = build_term_index(terms[term_df >= min_df])
+        counts = hash_counts(counts, terms)
+    y = np.asarray(labels)
+    rows = np.arange(len(texts))
+    fit = _CountsFit(family, counts, terms, rows, y, tfidf_params, clf_params)
+
+    folds = _cv_folds(labels)
+    if folds:
+        cv_scores = []
+        for train, test in folds:
+            fold = _CountsFit(family, counts, terms, train, y, tfidf_params, clf_params)
+            cv_scores.append(fold.clf.score(fold.features(test), y[test]))
+        cv_accuracy = float(np.mean(cv_scores))
     else:
         cv_accuracy = -1.0  # not enough data for CV
 
-    # Refit on full data after CV
-    pipeline.fit(texts, labels)
-
-    report = classification_report(labels, pipeline.predict(texts))
+    pipeline = fit.pipeline()
+    report = classification_report(labels, fit.clf.predict(fit.features(rows)))
 
+    if family == "hashing":
+        effective = {f"hash__{k}": v for k, v in HASHING_PARAMS.items()}
+    else:
+        effective = {f"tfidf__{k}": v for k, v in dict(TFIDF_PARAMS, **tfidf_params).items()}
+    effective.update((f"clf__{k}", v) for k, v in dict(CLASSIFIER_PARAMS, **clf_params).items())
     metrics = {
         "cv_accuracy": round(cv_accuracy, 4),
         "n_samples": len(texts),
-        "n_classes": len(unique_classes),
+        "n_classes": len(set(labels)),
+        "params": effective,
         "report": report,
     }
+    if family == "hashing":
+        metrics["term_index"] = term_index
     return pipeline, metrics
 
 
-def save_model(pipeline, category_map, model_path, map_path):
+def _evaluate_fold(counts, terms, y, train, test, params, keep_pipeline=False):
+    """Search task: fit one candidate on one fold.
+
+    Returns ``(accuracy, fit_seconds, pipeline)``; *pipeline* is the
+    fitted pipeline when *keep_pipeline* is set, else ``None``.
+    """
+    tfidf_params, clf_params = split_params(params)
+    start = time.perf_counter()
+    fit = _CountsFit("tfidf", counts, terms, train, y, tfidf_params, clf_params)
+    fit_seconds = time.perf_counter() - start
+    accuracy = fit.clf.score(fit.features(test), y[test])
+    return accuracy, fit_seconds, fit.pipeline() if keep_pipeline else None
+
+
+def inference_latency(pipeline, texts):
+    """Per-ticket ``predict_proba`` time of *pipeline* on raw *texts* (s).
+
+    The fastest of ``LATENCY_REPEATS`` runs, which is the least disturbed
+    by whatever else the machine is doing.
+    """
+    best = None
+    for _ in range(LATENCY_REPEATS):
+        start = time.perf_counter()
+        pipeline.predict_proba(texts)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best / len(texts)
+
+
+def search_params(texts, labels, grid=None, n_jobs=-1, feature_cache=None):
+    """Cross-validate every parameter combination of *grid* in parallel.
+
+    All candidates share one tokenization of *texts*.  Each (candidate,
+    fold) fit is a joblib task, spread over *n_jobs* processes (-1: all
+    cores).  Inference latency is timed afterwards, one candidate at a
+    time, on its first-fold pipeline: timed inside the workers it would
+    compete with the other fits for the cores.  Returns one dict per
+    candidate, in grid order, with ``params``, ``cv_accuracy``,
+    ``fit_ms`` (mean fold fit from term counts) and ``latency_ms``
+    (per-ticket inference from raw text, see ``inference_latency``).
+
+    Raises ``ValueError`` when the labels are too few per class to
+    cross-validate.
+    """
+    from joblib import Parallel, delayed
+    from sklearn.model_selection import ParameterGrid
+
+    folds = _cv_folds(labels)
+    if not folds:
+        raise ValueError("Need at least 2 samples of every class to search")
+    counts, terms = cached_term_counts(texts, feature_cache)
+    y = np.asarray(labels)
+    candidates = list(ParameterGrid(grid or SEARCH_GRID))
+    scores = Parallel(n_jobs=n_jobs)(
+        delayed(_evaluate_fold)(counts, terms, y, train, test, params,
+                                keep_pipeline=fold == 0)
+        for params in candidates
+        for fold, (train, test) in enumerate(folds)
+    )
+    latency_texts = [texts[i] for i in folds[0][1][:LATENCY_SAMPLE]]
+    results = []
+    for i, params in enumerate(candidates):
+        fold_scores = scores[i * len(folds):(i + 1) * len(folds)]
+        accuracy, fit_seconds = np.mean([score[:2] for score in fold_scores], axis=0)
+        latency = inference_latency(fold_scores[0][2], latency_texts)
+        results.append({
+            "params": params,
+            "cv_accuracy": round(float(accuracy), 4),
+            "fit_ms": round(float(fit_seconds) * 1000, 2),
+            "latency_ms": round(latency * 1000, 4),
+        })
+    return results
+
+
+def partial_update(pipeline, texts, labels):
+    """Fold labeled rows into a fitted hashing-family *pipeline*.
+
+    Runs one ``partial_fit`` pass of the classifier.  The vectorizer is
+    stateless and the IDF weights stay as of the last full fit.  Raises
+    ``ValueError`` for a pipeline of another family or labels outside
+    its classes, both of which need a full retrain.
+    """
+    if "hash" not in pipeline.named_steps:
+        raise ValueError("Only hashing-family models can be updated incrementally")
+    unknown = sorted(set(labels) - set(pipeline.classes_))
+    if unknown:
+        raise ValueError(f"New class(es) need a full retrain: {', '.join(unknown)}")
+    features = pipeline[:-1].transform(texts)
+    pipeline.named_steps["clf"].partial_fit(features, np.asarray(labels))
+    return pipeline
+
+
+def choose_params(results, latency_budget_ms):
+    """Pick the most accurate ``search_params`` result within the budget.
+
+    Ties go to the lower inference latency, then the faster fit.  When no
+    candidate meets *latency_budget_ms*, the fastest one is returned.
+    Returns ``(result, within_budget)``.
+    """
+    within = [r for r in results if r["latency_ms"] <= latency_budget_ms]
+    if not within:
+        return min(results, key=lambda r: (r["latency_ms"], r["fit_ms"])), False
+    return min(within, key=lambda r: (-r["cv_accuracy"], r["latency_ms"], r["fit_ms"])), True
+
+
+def save_model(pipeline, category_map, model_path, map_path, term_index=None):
     """Serialize the trained pipeline and category map to disk.
 
     Parameters
@@ -142,22 +660,41 @@ def save_model(pipeline, category_map, model_path, map_path):
         Where to write the joblib file.
     map_path : Path | str
         Where to write the JSON category map.
+    term_index : TermIndex, optional
+        Column names of a hashing-family *pipeline*, written next to the
+        model (``term_index_path``).  A stale index is removed otherwise.
+
+    The pipeline's arrays are also exported for ``load_model`` to
+    memory-map (``ml_inference.save_arrays``).
     """
+    import joblib
+
     model_path = Path(model_path)
     map_path = Path(map_path)
     model_path.parent.mkdir(parents=True, exist_ok=True)
     map_path.parent.mkdir(parents=True, exist_ok=True)
     joblib.dump(pipeline, model_path)
+    ml_inference.save_arrays(pipeline, model_path)
+    if term_index is not None:
+        save_term_index(term_index_path(model_path), term_index)
+    else:
+        term_index_path(model_path).unlink(missing_ok=True)
     with open(map_path, "w", encoding="utf-8") as f:
         json.dump(category_map, f, indent=2)
 
 
-def load_model(model_path, map_path):
+def load_model(model_path, map_path, compiled=True):
     """Load a serialized pipeline and category map.
 
+    With *compiled*, a model whose arrays ``save_model`` exported is
+    loaded as an ``ml_inference.CompiledModel``: the arrays are
+    memory-mapped and sklearn is not imported.  It predicts like the
+    pipeline but cannot be trained further; pass ``compiled=False`` for
+    the pipeline itself.
+
     Returns
     -------
-    tuple[Pipeline, dict]
+    tuple[Pipeline | CompiledModel, dict]
         The deserialized pipeline and category map.
 
     Raises
@@ -171,28 +708,70 @@ def load_model(model_path, map_path):
         raise FileNotFoundError(f"Model file not found: {model_path}")
     if not map_path.is_file():
         raise FileNotFoundError(f"Category map not found: {map_path}")
-    pipeline = joblib.load(model_path)
+    pipeline = ml_inference.load_compiled(model_path) if compiled else None
+    if pipeline is None:
+        import joblib
+
+        pipeline = joblib.load(model_path)
     with open(map_path, encoding="utf-8") as f:
         category_map = json.load(f)
     return pipeline, category_map
 
 
-def extract_top_terms(pipeline, text, n=5):
+# Vectorizer -> get_feature_names_out(), built once per loaded model
+_feature_names = weakref.WeakKeyDictionary()
+
+
+def extract_top_terms(pipeline, text, n=5, term_index=None):
     """Extract the top-N TF-IDF terms from text using the fitted pipeline.
 
     Returns list of (term, score) tuples sorted by score descending.
-    Only terms with a non-zero TF-IDF score are included.
+    Only terms with a non-zero TF-IDF score are included.  Only the
+    non-zero entries of the text's vector are ranked.
+
+    Hashing-family pipelines name their columns through *term_index*
+    (``load_term_index``): a column is reported as the training term in
+    it that occurs in *text*, and columns without one are skipped, as
+    terms outside a TF-IDF vocabulary are.  Without an index they have
+    no terms to report.
     """
-    tfidf = pipeline.named_steps["tfidf"]
-    feature_names = tfidf.get_feature_names_out()
-    vector = tfidf.transform([text])
-    scores = vector.toarray()[0]
-    top_indices = scores.argsort()[-n:][::-1]
-    return [
-        (feature_names[i], float(scores[i]))
-        for i in top_indices
-        if scores[i] > 0
-    ]
+    if isinstance(pipeline, ml_inference.CompiledModel):
+        hashing = pipeline.family == "hashing"
+        columns, weights = pipeline.features(text)
+        analyze = pipeline.analyze
+        feature_names = None if hashing else pipeline.feature_names
+    else:
+        hashing = "hash" in pipeline.named_steps
+        if hashing:
+            vector = pipeline[:-1].transform([text])
+            analyze = pipeline.named_steps["hash"].build_analyzer()
+            feature_names = None
+        else:
+            tfidf = pipeline.named_steps["tfidf"]
+            if tfidf not in _feature_names:
+                _feature_names[tfidf] = tfidf.get_feature_names_out()
+            vector = tfidf.transform([text])
+            feature_names = _feature_names[tfidf]
+        columns, weights = vector.indices, vector.data
+
+    if hashing:
+        if term_index is None:
+            return []
+        text_terms = set(analyze(text))
+
+        def name(column):
+            return next((t for t in term_index.column_terms(column) if t in text_terms), None)
+    else:
+        name = feature_names.__getitem__
+
+    top = []
+    for i in np.argsort(-weights, kind="stable"):
+        term = name(columns[i])
+        if term is not None and weights[i] > 0:
+            top.append((str(term), float(weights[i])))
+            if len(top) == n:
+                break
+    return top
 
 
 def predict(pipeline, category_map, ticket_data):
@@ -225,6 +804,30 @@ def predict(pipeline, category_map, ticket_data):
     return category_of_issue, category, round(confidence, 4)
 
 
+def predict_batch(pipeline, category_map, tickets,
+                  batch_size=PREDICT_BATCH_SIZE):
+    """Predict categories for many tickets with vectorized pipeline calls.
+
+    Returns one ``(category_of_issue, category, confidence)`` tuple per
+    ticket, in input order, identical to calling ``predict`` on each
+    ticket.  Tickets with empty feature text are not sent to the model.
+    """
+    texts = [build_feature_text(ticket_data) for ticket_data in tickets]
+    results = [("uncategorized", "unknown", 0.0)] * len(texts)
+    scored = [i for i, text in enumerate(texts) if text.strip()]
+    classes = pipeline.classes_
+
+    for start in range(0, len(scored), batch_size):
+        batch = scored[start:start + batch_size]
+        proba = pipeline.predict_proba([texts[i] for i in batch])
+        for i, row, best_idx in zip(batch, proba, proba.argmax(axis=1)):
+            category_of_issue = classes[best_idx]
+            category = category_map.get(category_of_issue, "unknown")
+            results[i] = (category_of_issue, category,
+                          round(float(row[best_idx]), 4))
+    return results
+
+
 if __name__ == "__main__":
     print("This module is not meant to be run directly. "
           "Use ml_train.py to train or rule_engine_categorize.py to predict.")
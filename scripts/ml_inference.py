@@ -0,0 +1,335 @@
+#!/usr/bin/env python3
+"""
+Score tickets with a trained ML model without importing sklearn.
+
+``ml_classifier.save_model`` exports the numeric parts of a fitted
+pipeline next to its joblib file, in ``<model>.arrays/``:
+
+- ``coef.npy``: the classifier coefficients, one row per feature, so the
+  few features of a ticket are contiguous reads
+- ``intercept.npy`` and ``idf.npy``
+- ``model.json``: classes, analyzer settings, the vocabulary (tfidf
+  family) or column count (hashing family), and the size, mtime and
+  SHA-256 of the joblib file the arrays were exported from
+
+``load_compiled`` memory-maps the arrays, so starting to score costs the
+numpy import and parsing ``model.json`` rather than importing sklearn
+and unpickling the pipeline.  ``CompiledModel.predict_proba`` computes
+what the pipeline's does: the same analyzer, TF-IDF weighting and
+``modified_huber`` probabilities.
+
+Usage:
+    python3 scripts/ml_inference.py scripts/trained-data/ml-model/classifier.joblib
+"""
+import argparse
+import functools
+import hashlib
+import json
+import re
+import shutil
+import sys
+import time
+from itertools import repeat
+from pathlib import Path
+
+import numpy as np
+
+ARRAYS_SUFFIX = ".arrays"
+FORMAT_VERSION = 1
+ARRAY_NAMES = ("coef", "intercept", "idf")
+
+# Distinct terms whose hashing column a model remembers
+BUCKET_CACHE_SIZE = 1 << 20
+
+
+def arrays_path(model_path):
+    model_path = Path(model_path)
+    return model_path.with_name(model_path.name + ARRAYS_SUFFIX)
+
+
+def file_sha256(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _rotl(x, r):
+    return (x << np.uint32(r)) | (x >> np.uint32(32 - r))
+
+
+def murmurhash3_32(terms):
+    """Signed MurmurHash3 (x86, 32-bit, seed 0) of each of *terms*.
+
+    Matches ``sklearn.utils.murmurhash3_32`` on their UTF-8 bytes.  Terms
+    of equal byte length are hashed together as uint32 array operations
+    (which wrap like the C code), so the Python cost is per length, not
+    per term.
+    """
+    c1, c2 = np.uint32(0xCC9E2D51), np.uint32(0x1B873593)
+    encoded = [term.encode("utf-8") for term in terms]
+    lengths = np.fromiter(map(len, encoded), dtype=np.intp, count=len(encoded))
+    hashes = np.empty(len(encoded), dtype=np.int64)
+    for length in np.unique(lengths).tolist():
+        rows = np.flatnonzero(lengths == length)
+        data = np.frombuffer(b"".join(encoded[i] for i in rows), dtype=np.uint8)
+        data = data.reshape(len(rows), length)
+        h = np.zeros(len(rows), dtype=np.uint32)
+        end = length & ~3
+        blocks = np.ascontiguousarray(data[:, :end]).view("<u4").astype(np.uint32)
+        for b in range(end // 4):
+            h ^= _rotl(blocks[:, b] * c1, 15) * c2
+            h = _rotl(h, 13) * np.uint32(5) + np.uint32(0xE6546B64)
+        if length > end:
+            k = np.zeros(len(rows), dtype=np.uint32)
+            for i in reversed(range(end, length)):
+                k = (k << np.uint32(8)) | data[:, i]
+            h ^= _rotl(k * c1, 15) * c2
+        h ^= np.uint32(length)
+        h ^= h >> np.uint32(16)
+        h *= np.uint32(0x85EBCA6B)
+        h ^= h >> np.uint32(13)
+        h *= np.uint32(0xC2B2AE35)
+        h ^= h >> np.uint32(16)
+        hashes[rows] = h.view(np.int32)
+    return hashes
+
+
+def _analyzer_settings(vectorizer):
+    """``model.json`` fields reproducing *vectorizer*'s analyzer, or ``None``."""
+    if (vectorizer.analyzer != "word" or vectorizer.tokenizer is not None
+            or vectorizer.preprocessor is not None or vectorizer.strip_accents is not None
+            or vectorizer.binary):
+        return None
+    return {
+        "lowercase": vectorizer.lowercase,
+        "token_pattern": vectorizer.token_pattern,
+        "ngram_range": list(vectorizer.ngram_range),
+        "stop_words": sorted(vectorizer.get_stop_words() or ()),
+    }
+
+
+def compile_pipeline(pipeline):
+    """Return ``(meta, arrays)`` exporting a fitted pipeline, or ``None``.
+
+    Handles the pipelines ``ml_classifier`` trains: a tfidf- or
+    hashing-family pipeline ending in a ``modified_huber`` SGD
+    classifier.  Anything else (e.g. an unfitted pipeline) gives
+    ``None`` and is only ever loaded with joblib.
+    """
+    steps = getattr(pipeline, "named_steps", {})
+    clf, tfidf = steps.get("clf"), steps.get("tfidf")
+    if (getattr(clf, "loss", None) != "modified_huber" or not hasattr(clf, "coef_")
+            or not hasattr(tfidf, "idf_") or tfidf.norm not in ("l2", None)):
+        return None
+    hasher = steps.get("hash")
+    if hasher is not None:
+        if hasher.alternate_sign or hasher.norm is not None:
+            return None
+        vectorizer = hasher
+        meta = {"family": "hashing", "n_features": hasher.n_features}
+    else:
+        vectorizer = tfidf
+        meta = {"family": "tfidf",
+                "vocabulary": {term: int(col) for term, col in tfidf.vocabulary_.items()}}
+    settings = _analyzer_settings(vectorizer)
+    if settings is None:
+        return None
+    meta.update(settings, format=FORMAT_VERSION,
+                classes=[str(c) for c in clf.classes_],
+                sublinear_tf=tfidf.sublinear_tf, norm=tfidf.norm)
+    arrays = {"coef": clf.coef_.T, "intercept": clf.intercept_, "idf": tfidf.idf_}
+    return meta, arrays
+
+
+def save_arrays(pipeline, model_path):
+    """Export *pipeline*, saved to *model_path*, for ``load_compiled``.
+
+    Writes to a temporary directory renamed into place.  Removes any
+    previous export when *pipeline* cannot be compiled.  Returns whether
+    it was exported.
+    """
+    target = arrays_path(model_path)
+    tmp = target.with_name(target.name + ".tmp")
+    shutil.rmtree(tmp, ignore_errors=True)
+    compiled = compile_pipeline(pipeline)
+    if compiled is None:
+        shutil.rmtree(target, ignore_errors=True)
+        return False
+    meta, arrays = compiled
+    tmp.mkdir(parents=True)
+    for name in ARRAY_NAMES:
+        np.save(tmp / f"{name}.npy", np.ascontiguousarray(arrays[name], dtype=np.float64))
+    st = Path(model_path).stat()
+    meta.update(model_size=st.st_size, model_mtime_ns=st.st_mtime_ns,
+                model_sha256=file_sha256(model_path))
+    (tmp / "model.json").write_text(json.dumps(meta), encoding="utf-8")
+    shutil.rmtree(target, ignore_errors=True)
+    tmp.rename(target)
+    return True
+
+
+def load_compiled(model_path):
+    """Return the ``CompiledModel`` exported for *model_path*, or ``None``.
+
+    ``None`` means there is no export of this exact joblib file: none was
+    written, or it was exported from another one (e.g. only the joblib
+    file was replaced), in which case a warning is printed.
+
+    The joblib file is matched by size and mtime, so loading does not
+    read it.  Only when the size matches but the mtime does not (e.g. the
+    model directory was copied) is it hashed and compared by SHA-256.
+    """
+    directory = arrays_path(model_path)
+    meta_path = directory / "model.json"
+    if not meta_path.is_file():
+        return None
+    with open(meta_path, encoding="utf-8") as f:
+        meta = json.load(f)
+    if meta.get("format") != FORMAT_VERSION or not _same_model(meta, model_path):
+        print(f"Warning: ignoring {directory}: not exported from {model_path} "
+              "(re-save the model to refresh it)", file=sys.stderr)
+        return None
+    arrays = {name: np.load(directory / f"{name}.npy", mmap_mode="r") for name in ARRAY_NAMES}
+    return CompiledModel(model_path, meta, **arrays)
+
+
+def _same_model(meta, model_path):
+    """Whether *model_path* is the joblib file *meta* was exported from."""
+    st = Path(model_path).stat()
+    if st.st_size != meta.get("model_size"):
+        return False
+    return (st.st_mtime_ns == meta.get("model_mtime_ns")
+            or file_sha256(model_path) == meta.get("model_sha256"))
+
+
+class CompiledModel:
+    """A fitted ``ml_classifier`` pipeline scored with numpy alone.
+
+    Provides the parts of the pipeline API that prediction uses:
+    ``classes_`` and ``predict_proba``.
+    """
+
+    def __init__(self, model_path, meta, coef, intercept, idf):
+        self.model_path = Path(model_path)
+        self.family = meta["family"]
+        self.classes_ = np.array(meta["classes"], dtype=object)
+        self.coef = coef
+        self.intercept = intercept
+        self.idf = idf
+        self.lowercase = meta["lowercase"]
+        self.token_pattern = re.compile(meta["token_pattern"])
+        self.ngram_range = tuple(meta["ngram_range"])
+        self.stop_words = frozenset(meta["stop_words"])
+        self.sublinear_tf = meta["sublinear_tf"]
+        self.norm = meta["norm"]
+        self.vocabulary = meta.get("vocabulary")
+        self.n_features = meta.get("n_features")
+        # Hashing family: term -> column, filled by columns()
+        self._buckets = {}
+
+    def __reduce__(self):
+        # Worker processes map the arrays themselves instead of receiving
+        # copies of them
+        return load_compiled, (str(self.model_path),)
+
+    @functools.cached_property
+    def feature_names(self):
+        """Term of each column (tfidf family)."""
+        names = [None] * len(self.vocabulary)
+        for term, col in self.vocabulary.items():
+            names[col] = term
+        return names
+
+    def analyze(self, text):
+        """The terms of *text*, as the vectorizer's ``build_analyzer()``."""
+        if self.lowercase:
+            text = text.lower()
+        tokens = [t for t in self.token_pattern.findall(text) if t not in self.stop_words]
+        min_n, max_n = self.ngram_range
+        terms = list(tokens) if min_n == 1 else []
+        for n in range(max(min_n, 2), min(max_n, len(tokens)) + 1):
+            terms.extend(" ".join(tokens[i:i + n]) for i in range(len(tokens) - n + 1))
+        return terms
+
+    def columns(self, terms):
+        """Column of each of *terms*; -1 for terms outside the vocabulary.
+
+        Hashing-family columns are remembered per term, so only terms not
+        seen before are hashed.
+        """
+        lookup = self._buckets if self.vocabulary is None else self.vocabulary
+        found = np.fromiter(map(lookup.get, terms, repeat(-1)), dtype=np.intp, count=len(terms))
+        if self.vocabulary is None:
+            missing = np.flatnonzero(found < 0).tolist()
+            if missing:
+                new = list(dict.fromkeys(terms[i] for i in missing))
+                if len(self._buckets) + len(new) > BUCKET_CACHE_SIZE:
+                    self._buckets.clear()
+                buckets = np.abs(murmurhash3_32(new)) % self.n_features
+                self._buckets.update(zip(new, buckets.tolist()))
+                found[missing] = [self._buckets[terms[i]] for i in missing]
+        return found
+
+    def _weights(self, found):
+        columns, counts = np.unique(found[found >= 0], return_counts=True)
+        weights = counts.astype(np.float64)
+        if self.sublinear_tf:
+            weights = np.log(weights) + 1.0
+        weights *= self.idf[columns]
+        if self.norm == "l2":
+            length = np.sqrt(weights @ weights)
+            if length > 0:
+                weights /= length
+        return columns, weights
+
+    def features(self, text):
+        """The TF-IDF vector of *text* as sorted ``(columns, weights)``."""
+        return self._weights(self.columns(self.analyze(text)))
+
+    def decision_function(self, texts):
+        analyzed = [self.analyze(text) for text in texts]
+        # One lookup for the whole batch, split back per text
+        found = self.columns([term for terms in analyzed for term in terms])
+        ends = np.cumsum([len(terms) for terms in analyzed]).tolist()
+        scores = np.empty((len(texts), self.coef.shape[1]))
+        start = 0
+        for i, end in enumerate(ends):
+            columns, weights = self._weights(found[start:end])
+            scores[i] = weights @ self.coef[columns] + self.intercept
+            start = end
+        return scores.ravel() if self.coef.shape[1] == 1 else scores
+
+    def predict_proba(self, texts):
+        """``SGDClassifier(loss="modified_huber").predict_proba`` of *texts*."""
+        scores = self.decision_function(texts)
+        prob = (np.clip(scores, -1, 1) + 1.0) / 2.0
+        if prob.ndim == 1:
+            return np.column_stack([1.0 - prob, prob])
+        prob_sum = prob.sum(axis=1)
+        all_zero = prob_sum == 0
+        prob[all_zero, :] = 1
+        prob_sum[all_zero] = len(self.classes_)
+        return prob / prob_sum[:, None]
+
+
+def parse_args(argv=None):
+    p = argparse.ArgumentParser(description="Time loading a model without sklearn")
+    p.add_argument("model", type=Path, help="Trained classifier.joblib")
+    return p.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    start = time.perf_counter()
+    model = load_compiled(args.model)
+    if model is None:
+        sys.exit(f"No compiled arrays for {args.model}; re-save it with ml_train.py")
+    elapsed = time.perf_counter() - start
+    print(f"Loaded {model.family} model ({len(model.classes_)} classes) "
+          f"in {elapsed * 1000:.1f} ms; sklearn imported: {'sklearn' in sys.modules}")
+
+
+if __name__ == "__main__":
+    main()
@@ -17,6 +17,11 @@ Usage:
         --training-data scripts/trained-data/ml-training-data.csv \\
         --tickets-categorized scripts/analysis/tickets-categorized.csv \\
         --tickets-dir scripts/normalized-tickets/2026-02-08
+
+    # Fold newly audited tickets into the model trained by the last run
+    python3 scripts/ml_train.py --incremental \
+        --training-data scripts/trained-data/ml-training-data.csv \
+        --tickets-categorized scripts/analysis/tickets-categorized.csv
 """
 
 import argparse
@@ -26,6 +31,8 @@ import sys
 from datetime import datetime, timezone
 from pathlib import Path
 
+import ticket_corpus
+
 REPO_ROOT = Path(__file__).resolve().parent.parent
 DEFAULT_OUTPUT_MODEL = (
     REPO_ROOT / "scripts" / "trained-data" / "ml-model" / "classifier.joblib"
@@ -41,6 +48,9 @@ TRAINING_DATA_COLUMNS = {
     "Ticket", "Category of Issue", "Category",
 }
 
+# Incremental updates between full retrains of an --incremental model
+DEFAULT_FULL_RETRAIN_EVERY = 20
+
 CATEGORIZED_COLUMNS = {
     "Ticket", "Category of Issue", "Category",
     "Categorization Source", "Human Audit for Accuracy",
@@ -72,6 +82,40 @@ def parse_args(argv=None):
     p.add_argument(
         "--output-report", type=Path, default=DEFAULT_REPORT,
         help="Where to save the training report")
+    p.add_argument(
+        "--feature-cache", type=Path, default=None,
+        help="Directory caching tokenized term counts by corpus hash, so "
+             "retraining on the same tickets skips text processing "
+             "(default: feature-cache/ next to --output-model)")
+    p.add_argument(
+        "--no-feature-cache", action="store_true",
+        help="Tokenize the ticket texts without reading or writing the cache")
+    p.add_argument(
+        "--model-family", choices=("tfidf", "hashing"), default=None,
+        help="tfidf: TfidfVectorizer with a fitted vocabulary; hashing: "
+             "HashingVectorizer, whose model size does not grow with the "
+             "vocabulary, plus a term index side file for explanations "
+             "(default: tfidf, hashing with --incremental)")
+    p.add_argument(
+        "--search", action="store_true",
+        help="Cross-validate a grid of vectorizer and SGD parameters in "
+             "parallel and train with the most accurate one within "
+             "--latency-budget-ms")
+    p.add_argument(
+        "--latency-budget-ms", type=float, default=5.0,
+        help="Per-ticket inference latency budget for --search (default: 5)")
+    p.add_argument(
+        "--search-jobs", type=int, default=-1,
+        help="Worker processes for --search (default: -1, all cores)")
+    p.add_argument(
+        "--incremental", action="store_true",
+        help="Train a hashing-vectorizer model and, on later runs, fold only "
+             "newly labeled tickets into it with partial_fit instead of "
+             "retraining from scratch")
+    p.add_argument(
+        "--full-retrain-every", type=int, default=DEFAULT_FULL_RETRAIN_EVERY,
+        help="With --incremental, retrain from scratch after this many "
+             f"incremental updates (default: {DEFAULT_FULL_RETRAIN_EVERY})")
     p.add_argument(
         "--min-samples", type=int, default=20,
         help="Minimum labeled samples required to train (default: 20)")
@@ -166,15 +210,60 @@ def load_ticket_texts(tickets_dir, ticket_keys):
     if not tickets_dir or not tickets_dir.is_dir():
         return {}
 
-    texts = {}
-    for json_file in tickets_dir.glob("*.json"):
-        ticket_key = json_file.stem
-        if ticket_key not in ticket_keys:
-            continue
-        with open(json_file, encoding="utf-8") as f:
-            ticket_data = json.load(f)
-        texts[ticket_key] = build_feature_text(ticket_data)
-    return texts
+    return {
+        ticket_key: build_feature_text(ticket_data)
+        for ticket_key, ticket_data in ticket_corpus.iter_tickets(tickets_dir, ticket_keys)
+    }
+
+
+def format_params(params):
+    """Render pipeline params as ``name=value`` pairs, sorted by name."""
+    return ", ".join(f"{name}={value!r}" for name, value in sorted(params.items()))
+
+
+def online_state_path(model_path):
+    """Sidecar recording what an --incremental model was trained on."""
+    return model_path.with_name(model_path.name + ".online.json")
+
+
+def load_online_state(path):
+    """Return the state saved by ``save_online_state``, or ``None``."""
+    if not path.is_file():
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_online_state(path, state):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps(state, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+    tmp.replace(path)
+
+
+def plan_online_update(state, labeled_rows, full_retrain_every):
+    """Decide how to bring an --incremental model up to date.
+
+    Returns ``(new_rows, reason)``: the rows whose tickets the model has
+    not seen, and why a full retrain is needed instead of folding them
+    in, or ``None``.  ``partial_fit`` can only add evidence, so removed
+    or changed labels and new classes force a full retrain, as does the
+    ``full_retrain_every`` safeguard against drift from many updates.
+    """
+    if state is None:
+        return labeled_rows, "no incremental model yet"
+    seen = state["labels"]
+    current = {row["Ticket"]: row["Category of Issue"] for row in labeled_rows}
+    changed = sum(1 for key, label in seen.items() if current.get(key) != label)
+    if changed:
+        return labeled_rows, f"{changed} ticket(s) relabeled or unlabeled"
+    new_rows = [row for row in labeled_rows if row["Ticket"] not in seen]
+    new_classes = {row["Category of Issue"] for row in new_rows} - set(seen.values())
+    if new_classes:
+        return labeled_rows, f"new class(es): {', '.join(sorted(new_classes))}"
+    if new_rows and state["updates"] >= full_retrain_every:
+        return labeled_rows, f"{state['updates']} incremental updates since the last"
+    return new_rows, None
 
 
 def build_category_map(labeled_rows):
@@ -190,9 +279,19 @@ def build_category_map(labeled_rows):
 
 def main(argv=None):
     args = parse_args(argv)
+    if args.incremental and args.search:
+        sys.exit("--search cannot be combined with --incremental")
+    family = args.model_family or ("hashing" if args.incremental else "tfidf")
+    if args.incremental and family != "hashing":
+        sys.exit("--incremental needs --model-family hashing")
+    if args.search and family != "tfidf":
+        sys.exit("--search applies to --model-family tfidf only")
 
     # Import here so tests can mock
-    from ml_classifier import save_model, train_model, ML_CONFIDENCE_THRESHOLD
+    from ml_classifier import (
+        ML_CONFIDENCE_THRESHOLD, choose_params, extend_term_index, load_model,
+        load_term_index, partial_update, save_model, search_params, train_model,
+    )
 
     # --- Load labeled data ---
     print(f"Loading training data from: {args.training_data}")
@@ -224,9 +323,26 @@ def main(argv=None):
             "Label more tickets in the training data CSV."
         )
 
+    # --- Decide what to train on ---
+    new_rows, retrain_reason = all_labels, None
+    if args.incremental:
+        state_path = online_state_path(args.output_model)
+        state = None
+        if args.output_model.is_file():
+            state = load_online_state(state_path)
+        new_rows, retrain_reason = plan_online_update(state, all_labels,
+                                                      args.full_retrain_every)
+        if retrain_reason:
+            print(f"\nFull retrain: {retrain_reason}")
+        elif new_rows:
+            print(f"\nIncremental update: {len(new_rows)} newly labeled ticket(s)")
+        else:
+            print("\nModel up to date: no newly labeled tickets")
+            return
+
     # --- Load ticket texts ---
     tickets_dir = args.tickets_dir or find_latest_tickets_dir()
-    ticket_keys = {row["Ticket"] for row in all_labels}
+    ticket_keys = {row["Ticket"] for row in new_rows}
     ticket_texts = load_ticket_texts(tickets_dir, ticket_keys)
 
     if tickets_dir:
@@ -237,7 +353,7 @@ def main(argv=None):
     # the normalized JSON is not available
     texts = []
     labels = []
-    for row in all_labels:
+    for row in new_rows:
         text = ticket_texts.get(row["Ticket"], "")
         if not text:
             # Minimal fallback: use the label itself as text
@@ -248,32 +364,95 @@ def main(argv=None):
 
     # Warn about underrepresented classes
     from collections import Counter
-    class_counts = Counter(labels)
+    class_counts = Counter(row["Category of Issue"] for row in all_labels)
     for cls, count in sorted(class_counts.items()):
         if count < 3:
             print(f"  WARNING: class '{cls}' has only {count} sample(s)")
 
+    timestamp = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    category_map = build_category_map(all_labels)
+    if args.incremental and not retrain_reason:
+        pipeline, _ = load_model(args.output_model, args.output_category_map,
+                                 compiled=False)
+        partial_update(pipeline, texts, labels)
+        term_index = extend_term_index(load_term_index(args.output_model), texts)
+        state["updates"] += 1
+        state["labels"].update(zip((row["Ticket"] for row in new_rows), labels))
+        save_model(pipeline, category_map, args.output_model,
+                   args.output_category_map, term_index=term_index)
+        save_online_state(state_path, state)
+        print(f"  Folded into {args.output_model} (update {state['updates']} of "
+              f"{args.full_retrain_every} before the next full retrain)")
+        report_path = args.output_report
+        report_path.parent.mkdir(parents=True, exist_ok=True)
+        report_content = (
+            f"Training Report\n"
+            f"===============\n"
+            f"Timestamp: {timestamp}\n"
+            f"Training samples: {len(all_labels)}\n"
+            f"Classes: {len(class_counts)}\n"
+            f"CV Accuracy: n/a (incremental update)\n"
+            f"Confidence threshold: {ML_CONFIDENCE_THRESHOLD}\n"
+            f"Model family: {family}\n"
+            f"Configuration: {format_params(state['params'])}\n"
+            f"Incremental update: {len(new_rows)} newly labeled ticket(s) folded in, "
+            f"update {state['updates']} of {args.full_retrain_every} since the full "
+            f"retrain at {state['full_retrain']}\n"
+            f"\nClass distribution:\n"
+        )
+        for cls, count in sorted(class_counts.items()):
+            report_content += f"  {cls}: {count}\n"
+        with open(report_path, "w", encoding="utf-8") as f:
+            f.write(report_content)
+        print(f"Report saved to: {report_path}")
+        return
+
     # --- Train ---
     print(f"\nTraining model on {len(texts)} samples "
           f"across {len(class_counts)} classes...")
-    pipeline, metrics = train_model(texts, labels)
+    feature_cache = None
+    if not args.no_feature_cache:
+        feature_cache = args.feature_cache or args.output_model.parent / "feature-cache"
+    params = None
+    search_results = None
+    if args.search:
+        print("\nSearching parameters...")
+        try:
+            search_results = search_params(texts, labels, n_jobs=args.search_jobs,
+                                           feature_cache=feature_cache)
+        except ValueError as exc:
+            sys.exit(f"Parameter search failed: {exc}")
+        best, within_budget = choose_params(search_results, args.latency_budget_ms)
+        params = best["params"]
+        print(f"  {len(search_results)} candidate(s); chose {format_params(params)}")
+        print(f"  CV accuracy {best['cv_accuracy']}, fit {best['fit_ms']} ms, "
+              f"inference {best['latency_ms']} ms/ticket")
+        if not within_budget:
+            print(f"  WARNING: no candidate within {args.latency_budget_ms} ms/ticket; "
+                  "using the fastest")
+
+    pipeline, metrics = train_model(texts, labels, feature_cache=feature_cache,
+                                    params=params, family=family)
 
     print(f"  Cross-validation accuracy: {metrics['cv_accuracy']}")
     print(f"\n{metrics['report']}")
 
-    # --- Build category map ---
-    category_map = build_category_map(all_labels)
-
     # --- Save ---
     save_model(pipeline, category_map, args.output_model,
-               args.output_category_map)
+               args.output_category_map, term_index=metrics.get("term_index"))
     print(f"\nModel saved to: {args.output_model}")
     print(f"Category map saved to: {args.output_category_map}")
+    if args.incremental:
+        save_online_state(state_path, {
+            "full_retrain": timestamp,
+            "updates": 0,
+            "params": metrics["params"],
+            "labels": {row["Ticket"]: row["Category of Issue"] for row in all_labels},
+        })
 
     # Write training report
     report_path = args.output_report
     report_path.parent.mkdir(parents=True, exist_ok=True)
-    timestamp = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
     report_content = (
         f"Training Report\n"
         f"===============\n"
@@ -282,8 +461,24 @@ def main(argv=None):
         f"Classes: {metrics['n_classes']}\n"
         f"CV Accuracy: {metrics['cv_accuracy']}\n"
         f"Confidence threshold: {ML_CONFIDENCE_THRESHOLD}\n"
-        f"\nClass distribution:\n"
+        f"Model family: {family}\n"
+        f"Configuration: {format_params(metrics['params'])}\n"
     )
+    if search_results is not None:
+        report_content += (
+            f"\nParameter search (latency budget "
+            f"{args.latency_budget_ms} ms/ticket"
+            f"{'' if within_budget else ', none within budget'}):\n"
+            f"  {'CV acc':>7} {'fit ms':>9} {'ms/ticket':>9}  params\n"
+        )
+        ranked = sorted(search_results, key=lambda r: -r["cv_accuracy"])
+        for result in ranked:
+            marker = "*" if result is best else " "
+            report_content += (
+                f"{marker} {result['cv_accuracy']:>7.4f} {result['fit_ms']:>9.2f} "
+                f"{result['latency_ms']:>9.4f}  {format_params(result['params'])}\n"
+            )
+    report_content += "\nClass distribution:\n"
     for cls, count in sorted(class_counts.items()):
         report_content += f"  {cls}: {count}\n"
     report_content += f"\nClassification Report:\n{metrics['report']}\n"
@@ -8,18 +8,26 @@ Filters out noise labels, automated bot comments, and API metadata.
 """
 
 import argparse
+import hashlib
 import json
 import random
 import re
 import shutil
 import sys
 import time
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
+from functools import partial
 from pathlib import Path
 
+import ticket_corpus
+
 SCRIPT_DIR = Path(__file__).resolve().parent
 DEFAULT_INPUT_DIR = SCRIPT_DIR / "tickets-json"
 DEFAULT_OUTPUT_DIR = SCRIPT_DIR / "normalized-tickets"
+# Written under the output base directory by --incremental.  A dotfile so
+# the "latest dated directory" lookups and *.json globs never pick it up.
+MANIFEST_NAME = ".normalize-manifest.json"
 
 # Label prefixes to remove (redundant with location/metadata fields)
 NOISE_LABEL_PREFIXES = (
@@ -52,57 +60,75 @@ def trim_date(date_str):
     return date_str
 
 
+# tqdm progress-bar block characters (U+2580-U+259F)
+_PROGRESS_BLOCKS = tuple(chr(c) for c in range(0x2580, 0x25A0))
+
+# Markup substitutions, applied in this order.  Each step sees the output
+# of the previous one (removing "{color}" can expose a "{code}"), so they
+# cannot be merged into one alternation without changing the output.
+# Each step names a literal the pattern cannot match without (at the
+# start of a line for anchored patterns); when it is absent the regex
+# scan is skipped.
+_MARKUP_STEPS = (
+    # Jira formatting tags: strip markup, keep inner content
+    ("{color", False, re.compile(r"\{color(?::[^}]*)?\}"), ""),
+    ("{code", False, re.compile(r"\{code(?::[^}]*)?\}"), "\n"),
+    ("{noformat}", False, re.compile(r"\{noformat\}"), "\n"),
+    ("{panel", False, re.compile(r"\{panel(?::[^}]*)?\}"), "\n"),
+    ("{*}", False, re.compile(r"\{\*\}"), ""),           # empty bold marker
+    # Jira links: [display text|url] -> display text
+    ("[", False, re.compile(r"\[([^|\]]+)\|[^\]]+\]"), r"\1"),
+    # Image references: !filename.png! -> (remove)
+    ("!", False, re.compile(r"![^!\s]+!"), ""),
+    # Headings: h1. through h6. at start of line
+    ("h", True, re.compile(r"^h[1-6]\.\s*", re.MULTILINE), ""),
+    # Horizontal rules
+    ("----", True, re.compile(r"^-{4,}\s*$", re.MULTILINE), ""),
+)
+# Jira key-value table rows: |*Key*|Value| -> Key: Value
+_TABLE_ROW = re.compile(r"\|\*([^*|]+)\*\|([^|\n]*)\|")
+_BLANK_LINES = re.compile(r"\n{3,}")
+
+
 def clean_jira_text(text):
     """Clean Jira wiki markup and unicode artifacts, keeping content."""
     if not text:
         return None
     text = text.replace("\r\n", "\n")
 
-    # Unicode cleanup
-    text = text.replace("\u00a0", " ")        # non-breaking space
-    text = text.replace("\ufffd", "")          # replacement character
-    text = text.replace("\u2013", "-")         # en dash
-    text = text.replace("\u2026", "...")        # ellipsis
-
-    # Remove tqdm progress bar block chars (U+2580-U+259F range)
-    text = re.sub(r"[\u2580-\u259f]+", "", text)
-
-    # Jira formatting tags — strip markup, keep inner content
-    text = re.sub(r"\{color(?::[^}]*)?\}", "", text)
-    text = re.sub(r"\{code(?::[^}]*)?\}", "\n", text)
-    text = re.sub(r"\{noformat\}", "\n", text)
-    text = re.sub(r"\{panel(?::[^}]*)?\}", "\n", text)
-    text = re.sub(r"\{\*\}", "", text)         # empty bold marker
-
-    # Jira links: [display text|url] → display text
-    text = re.sub(r"\[([^|\]]+)\|[^\]]+\]", r"\1", text)
-
-    # Image references: !filename.png! → (remove)
-    text = re.sub(r"![^!\s]+!", "", text)
-
-    # Headings: h1. through h6. at start of line
-    text = re.sub(r"^h[1-6]\.\s*", "", text, flags=re.MULTILINE)
-
-    # Horizontal rules
-    text = re.sub(r"^-{4,}\s*$", "", text, flags=re.MULTILINE)
+    # Unicode cleanup; none of these characters can occur in ASCII text
+    if not text.isascii():
+        text = (text.replace("\u00a0", " ")       # non-breaking space
+                .replace("\ufffd", "")             # replacement character
+                .replace("\u2013", "-")            # en dash
+                .replace("\u2026", "..."))         # ellipsis
+        # Remove tqdm progress bar block chars; a bar uses only a few of
+        # them and str.replace beats a character-class regex scan
+        for block in _PROGRESS_BLOCKS:
+            if block in text:
+                text = text.replace(block, "")
+
+    for literal, at_line_start, pattern, repl in _MARKUP_STEPS:
+        if text.startswith(literal) or (
+                ("\n" + literal if at_line_start else literal) in text):
+            text = pattern.sub(repl, text)
 
     # Forced line breaks
     text = text.replace("\\\\", "\n")
 
-    # Jira key-value table rows: |*Key*|Value| → Key: Value
-    text = re.sub(r"\|\*([^*|]+)\*\|([^|\n]*)\|", r"\1: \2", text)
-
-    # Table header/cell separators left over
-    text = re.sub(r"\|\|", " | ", text)
+    if "|*" in text:
+        text = _TABLE_ROW.sub(r"\1: \2", text)
 
-    # Bold/italic markers around text (keep text)
-    text = re.sub(r"\*\|", " ", text)
+    # Table header/cell separators left over, then bold/italic markers
+    # around text (keep text)
+    text = text.replace("||", " | ").replace("*|", " ")
 
     # Collapse multiple blank lines
-    text = re.sub(r"\n{3,}", "\n\n", text)
+    if "\n\n\n" in text:
+        text = _BLANK_LINES.sub("\n\n", text)
 
     # Strip trailing whitespace per line and overall
-    text = "\n".join(line.rstrip() for line in text.split("\n"))
+    text = "\n".join(map(str.rstrip, text.split("\n")))
     text = text.strip()
 
     return text if text else None
@@ -323,6 +349,30 @@ def normalize_issue(issue):
     return result
 
 
+class _FieldRecorder(dict):
+    """Empty ``fields`` mapping that records every key looked up."""
+
+    def __init__(self):
+        super().__init__()
+        self.seen = []
+
+    def get(self, key, default=None):
+        self.seen.append(key)
+        return default
+
+
+def source_fields():
+    """Return the Jira field ids :func:`normalize_issue` reads, in read order.
+
+    Traced by normalizing an issue with empty ``fields``, so the list
+    follows the extractors without a second registry to keep in sync.
+    get_tickets.py requests only these fields from Jira.
+    """
+    fields = _FieldRecorder()
+    normalize_issue({"fields": fields})
+    return list(dict.fromkeys(fields.seen))
+
+
 def normalize_json(data):
     """Normalize ticket JSON - handles both single tickets and paginated search results."""
     if "issues" in data:
@@ -334,6 +384,20 @@ def normalize_json(data):
     return data
 
 
+def write_normalized_issue(issue, output_dir):
+    """Normalize one raw *issue* and write it to ``<output_dir>/<KEY>.json``.
+
+    Returns ``(out_path, normalized_size)``.
+    """
+    normalized = normalize_issue(issue)
+    output = json.dumps(normalized, indent=2)
+    ticket_key = normalized.get("ticket", {}).get("key", "unknown")
+    out_path = Path(output_dir) / f"{ticket_key}.json"
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    out_path.write_text(output)
+    return out_path, len(output)
+
+
 def process_file(path, in_place=False, output_dir=None, allowed_ticket_keys=None):
     """Process a single JSON file.
 
@@ -353,16 +417,8 @@ def process_file(path, in_place=False, output_dir=None, allowed_ticket_keys=None
         for issue in data["issues"]:
             if allowed_ticket_keys is not None and issue.get("key") not in allowed_ticket_keys:
                 continue
-            normalized = normalize_issue(issue)
-            output = json.dumps(normalized, indent=2)
-            ticket_key = normalized.get("ticket", {}).get("key", "unknown")
-            if output_dir:
-                out_path = Path(output_dir) / f"{ticket_key}.json"
-            else:
-                out_path = Path(path).parent / f"{ticket_key}.json"
-            out_path.parent.mkdir(parents=True, exist_ok=True)
-            out_path.write_text(output)
-            results.append((str(out_path), original_size, len(output)))
+            out_path, size = write_normalized_issue(issue, output_dir or Path(path).parent)
+            results.append((str(out_path), original_size, size))
         # Use full original size only for the first entry; rest get 0
         # to avoid double-counting in totals
         for i in range(1, len(results)):
@@ -389,6 +445,42 @@ def process_file(path, in_place=False, output_dir=None, allowed_ticket_keys=None
     return results
 
 
+def iter_processed_files(files, workers=1, **kwargs):
+    """Yield ``(filepath, process_file results)`` for *files*, in order.
+
+    *kwargs* are passed to :func:`process_file`.  With *workers* > 1 the
+    files are normalized on a process pool.  Results still arrive in input
+    order, so the printed report is the same as a serial run.  When two
+    files write the same ticket (e.g. a ticket that shifted between
+    search pages), workers may race on it, so afterwards each such ticket
+    is rewritten from the last file that contains it, which is the file a
+    serial run would have left in place.
+    """
+    task = partial(process_file, **kwargs)
+    if workers <= 1:
+        for filepath in files:
+            yield filepath, task(filepath)
+        return
+
+    last_writer = {}
+    conflicts = set()
+    chunksize = max(1, len(files) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for filepath, results in zip(files, pool.map(task, files, chunksize=chunksize)):
+            for out_path, _, _ in results:
+                if last_writer.get(out_path, filepath) != filepath:
+                    conflicts.add(out_path)
+                last_writer[out_path] = filepath
+            yield filepath, results
+
+    rewrite = {}
+    for out_path in conflicts:
+        rewrite.setdefault(last_writer[out_path], set()).add(Path(out_path).stem)
+    for filepath in files:
+        if filepath in rewrite:
+            process_file(filepath, **dict(kwargs, allowed_ticket_keys=rewrite[filepath]))
+
+
 def collect_ticket_keys(files):
     """Collect unique ticket keys across input files."""
     keys = set()
@@ -433,6 +525,125 @@ def archive_existing(output_dir, force=False):
     return archive_path
 
 
+def issue_digest(issue):
+    """Return a content hash of a raw Jira issue.
+
+    Keys are sorted so the hash does not depend on the field order Jira
+    happened to return.
+    """
+    raw = json.dumps(issue, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def normalizer_digest():
+    """Digest of this module's source, recorded in the manifest.
+
+    Any change to the normalizer (cleaner, extractors, field list) changes
+    it, so files normalized by older code are not carried forward.
+    """
+    return hashlib.sha256(Path(__file__).read_bytes()).hexdigest()[:16]
+
+
+def load_manifest(path):
+    """Load ``{ticket_key: {"hash", "path"}}`` from an incremental manifest.
+
+    A missing manifest is empty, so the first incremental run normalizes
+    everything.  So is one written by a different normalizer (see
+    ``normalizer_digest``), with a note that every ticket is renormalized.
+    """
+    path = Path(path)
+    if not path.is_file():
+        return {}
+    manifest = json.loads(path.read_text(encoding="utf-8"))
+    if manifest.get("normalizer") != normalizer_digest():
+        print("Incremental: the normalizer changed since the manifest was written; "
+              "renormalizing every ticket")
+        return {}
+    return manifest.get("tickets", {})
+
+
+def save_manifest(path, tickets):
+    """Write the manifest atomically so an interrupted run keeps the old one."""
+    path = Path(path)
+    tmp = path.with_name(path.name + ".tmp")
+    manifest = {"normalizer": normalizer_digest(), "tickets": tickets}
+    tmp.write_text(json.dumps(manifest, indent=2, sort_keys=True) + "\n",
+                   encoding="utf-8")
+    tmp.replace(path)
+
+
+def plan_incremental(files, manifest, base_dir, output_dir, allowed_ticket_keys=None):
+    """Decide which tickets in *files* need normalizing against *manifest*.
+
+    A ticket is unchanged when its raw issue hashes to the manifest entry
+    and the normalized file recorded there still exists.  When a ticket
+    appears in several files the last one wins, as in a full run.  Files
+    without a ticket key cannot be tracked and are always processed.
+
+    Returns ``(files_to_process, changed_keys, carried, entries)`` where
+    *carried* holds ``(previous_output, new_output)`` paths to copy and
+    *entries* are the manifest entries for every ticket seen.
+    """
+    base_dir = Path(base_dir)
+    output_dir = Path(output_dir)
+    rel_dir = output_dir.relative_to(base_dir).as_posix()
+    latest = {}
+    untracked = set()
+    for filepath in files:
+        data = json.loads(Path(filepath).read_text())
+        if isinstance(data, dict) and "issues" in data:
+            issues = [(issue, f"{issue['key']}.json")
+                      for issue in data["issues"] if issue.get("key")]
+        elif isinstance(data, dict) and data.get("key"):
+            issues = [(data, Path(filepath).name)]
+        else:
+            untracked.add(filepath)
+            continue
+        for issue, name in issues:
+            key = issue["key"]
+            if allowed_ticket_keys is None or key in allowed_ticket_keys:
+                latest[key] = (filepath, issue_digest(issue), name)
+
+    changed_keys = set()
+    carried = []
+    entries = {}
+    for key, (filepath, digest, name) in latest.items():
+        previous = manifest.get(key)
+        if (previous and previous["hash"] == digest
+                and (base_dir / previous["path"]).is_file()):
+            carried.append((base_dir / previous["path"], output_dir / name))
+        else:
+            changed_keys.add(key)
+            untracked.add(filepath)
+        entries[key] = {"hash": digest, "path": f"{rel_dir}/{name}"}
+
+    files_to_process = [f for f in files if f in untracked]
+    return files_to_process, changed_keys, carried, entries
+
+
+def carry_forward(carried):
+    """Copy unchanged normalized files into the new output directory."""
+    for src, dest in carried:
+        if Path(src).resolve() != Path(dest).resolve():
+            shutil.copyfile(src, dest)
+
+
+def remove_stale_outputs(output_dir, entries):
+    """Delete normalized tickets in *output_dir* that *entries* do not list.
+
+    A full run archives the directory first; an incremental run reusing
+    it removes the tickets that left the input instead, so both produce
+    the same directory.  Returns the removed file names.
+    """
+    keep = {Path(entry["path"]).name for entry in entries.values()}
+    removed = []
+    for path in sorted(Path(output_dir).glob("*.json")):
+        if path.name not in keep:
+            path.unlink()
+            removed.append(path.name)
+    return removed
+
+
 def load_tickets_file(path):
     """Load ticket keys from a text file for filtering.
 
@@ -491,6 +702,9 @@ examples:
   %(prog)s tickets-json/DO-2639750.json            Normalize specific file(s)
   %(prog)s --in-place tickets-json/*.json          Normalize files in place
   %(prog)s -y                                       Skip overwrite confirmation
+  %(prog)s --workers 8                              Normalize on 8 processes
+  %(prog)s --incremental                            Only renormalize tickets whose raw JSON changed
+  %(prog)s --corpus                                 Also pack the output into a single-file corpus
 """,
     )
     parser.add_argument(
@@ -527,10 +741,33 @@ examples:
         type=int,
         help="Randomly select N ticket keys from the resolved input set before normalization",
     )
+    parser.add_argument(
+        "--workers", type=int, default=1,
+        help="Number of worker processes used to normalize files "
+             "(default: 1, no pool). Output is unchanged.",
+    )
+    parser.add_argument(
+        "--incremental", action="store_true",
+        help=f"Skip tickets whose raw JSON is unchanged since the last "
+             f"incremental run and copy their normalized files forward "
+             f"(hashes kept in <output-dir>/{MANIFEST_NAME}); nothing is archived",
+    )
+    parser.add_argument(
+        "--corpus", action="store_true",
+        help=f"After normalizing, pack the dated output directory into "
+             f"{ticket_corpus.CORPUS_NAME} with a key index, which the "
+             f"categorizer and trainers read instead of the per-ticket files",
+    )
 
     args = parser.parse_args(argv)
     if args.random_sample is not None and args.random_sample <= 0:
         parser.error("--random-sample must be a positive integer")
+    if args.workers < 1:
+        parser.error("--workers must be a positive integer")
+    if args.incremental and args.in_place:
+        parser.error("--incremental cannot be combined with --in-place")
+    if args.corpus and args.in_place:
+        parser.error("--corpus cannot be combined with --in-place")
 
     # Default input: <input-dir>/*.json
     files = args.files
@@ -579,22 +816,45 @@ examples:
             date_stamp = datetime.now().strftime("%Y-%m-%d")
         output_dir = base_dir / date_stamp
         output_dir.mkdir(parents=True, exist_ok=True)
-        archive_existing(output_dir, force=args.yes)
+        if not args.incremental:
+            archive_existing(output_dir, force=args.yes)
+        # The files are about to change; a corpus left behind would be stale
+        ticket_corpus.remove_corpus(output_dir)
         print(f"Output: {output_dir}/")
 
+    manifest_entries = None
+    if args.incremental:
+        manifest_path = base_dir / MANIFEST_NAME
+        manifest = load_manifest(manifest_path)
+        files, selected_ticket_keys, carried, manifest_entries = plan_incremental(
+            files, manifest, base_dir, output_dir,
+            allowed_ticket_keys=selected_ticket_keys,
+        )
+        carry_forward(carried)
+        removed = remove_stale_outputs(output_dir, manifest_entries)
+        # Forget tickets this directory no longer holds
+        rel_dir = output_dir.relative_to(base_dir).as_posix()
+        manifest = {key: entry for key, entry in manifest.items()
+                    if Path(entry["path"]).parent.as_posix() != rel_dir}
+        print(f"Incremental: {len(carried)} unchanged ticket(s) carried forward, "
+              f"{len(selected_ticket_keys)} to normalize")
+        if removed:
+            print(f"Incremental: removed {len(removed)} ticket(s) no longer in the input")
+
     print()
 
     total_original = 0
     total_normalized = 0
     total_tickets = 0
 
-    for filepath in files:
-        file_results = process_file(
-            filepath,
-            in_place=args.in_place,
-            output_dir=str(output_dir) if output_dir else None,
-            allowed_ticket_keys=selected_ticket_keys,
-        )
+    processed = iter_processed_files(
+        files,
+        workers=args.workers,
+        in_place=args.in_place,
+        output_dir=str(output_dir) if output_dir else None,
+        allowed_ticket_keys=selected_ticket_keys,
+    )
+    for filepath, file_results in processed:
         for out_path, orig, norm in file_results:
             total_original += orig
             total_normalized += norm
@@ -605,6 +865,13 @@ examples:
             else:
                 print(f"  -> {out_path} ({norm:,} chars)")
 
+    if manifest_entries is not None:
+        save_manifest(manifest_path, {**manifest, **manifest_entries})
+    if args.corpus:
+        packed = ticket_corpus.write_corpus(output_dir)
+        print(f"Corpus: packed {packed} ticket(s) into "
+              f"{output_dir / ticket_corpus.CORPUS_NAME}")
+
     total_reduction = 100 - (total_normalized * 100 // total_original) if total_original else 0
     elapsed = time.monotonic() - start_time
     print(f"\nDone. {total_tickets} ticket(s), {total_original:,} -> {total_normalized:,} chars total (-{total_reduction}%). Took {elapsed:.2f}s.")
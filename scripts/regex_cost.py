@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+Static and empirical cost checks for rule-engine regex patterns.
+
+``static_issues`` flags constructs prone to catastrophic backtracking
+(nested unbounded quantifiers, long ``.*`` chains); ``time_pattern`` times
+a pattern on reference texts in a child process that is killed once it
+runs past its time limit, so a pathological pattern cannot hang the
+caller.  Used by rule_engine_categorize.py to screen rules before a run
+and by run_training.py to reject generated proposals.
+
+Usage:
+    python3 scripts/regex_cost.py
+    python3 scripts/regex_cost.py --rule-engine scripts/trained-data/rule-engine.local.csv
+    python3 scripts/regex_cost.py --tickets-dir scripts/normalized-tickets/2026-02-08 --budget-ms 50
+"""
+import argparse
+import multiprocessing
+import re
+import sys
+import time
+from pathlib import Path
+from re import _parser as sre_parse
+
+# Issue codes returned by static_issues
+NESTED_QUANTIFIER = "nested-quantifier"
+WILDCARD_CHAIN = "wildcard-chain"
+
+# Unbounded ``.*``/``.+`` in one alternative before it is flagged; each
+# extra one multiplies the backtracking on a near-miss line of text.
+WILDCARD_CHAIN_LIMIT = 3
+
+# Shape of the synthetic near-miss text built from a pattern's literals.
+# ``.`` does not cross newlines, so backtracking cost is per line; lines
+# this long full of partial matches are already rare in real tickets.
+CHAIN_PROBE_LINE_CHARS = 500
+CHAIN_PROBE_LINES = 10
+# Repeats of a single pattern character, enough to make exponential
+# backtracking of a nested quantifier run for minutes
+REPEAT_PROBE_LEN = 32
+
+# Greedy and lazy repeats backtrack; possessive repeats do not
+_BACKTRACKING_REPEATS = (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT)
+_REPEATS = _BACKTRACKING_REPEATS + (sre_parse.POSSESSIVE_REPEAT,)
+
+
+def _children(op, av):
+    """Return the sub-patterns nested in one parsed regex node."""
+    if op in _REPEATS:
+        return [av[2]]
+    if op == sre_parse.SUBPATTERN:
+        return [av[3]]
+    if op == sre_parse.BRANCH:
+        return av[1]
+    if op == sre_parse.ATOMIC_GROUP:
+        return [av]
+    if op in (sre_parse.ASSERT, sre_parse.ASSERT_NOT):
+        return [av[1]]
+    if op == sre_parse.GROUPREF_EXISTS:
+        return [sub for sub in av[1:] if sub is not None]
+    return []
+
+
+def _is_unbounded(op, av):
+    return op in _BACKTRACKING_REPEATS and av[1] == sre_parse.MAXREPEAT
+
+
+def _has_unbounded_repeat(sub):
+    """Whether *sub* contains a backtracking unbounded repeat.
+
+    Atomic groups give up their backtracking positions, so repeats inside
+    them do not count.
+    """
+    return any(
+        _is_unbounded(op, av)
+        or (op != sre_parse.ATOMIC_GROUP
+            and any(_has_unbounded_repeat(c) for c in _children(op, av)))
+        for op, av in sub
+    )
+
+
+def _branches(parsed):
+    items = list(parsed)
+    if len(items) == 1 and items[0][0] == sre_parse.BRANCH:
+        return items[0][1][1]
+    return [items]
+
+
+def _count_wildcards(branch):
+    return sum(
+        1 for op, av in branch
+        if _is_unbounded(op, av) and list(av[2]) == [(sre_parse.ANY, None)]
+    )
+
+
+def static_issues(pattern):
+    """Return ``(code, message)`` pairs for risky constructs in *pattern*.
+
+    Raises ``re.error`` for an invalid pattern.
+    """
+    parsed = sre_parse.parse(pattern, re.IGNORECASE)
+    issues = []
+
+    def walk(sub):
+        for op, av in sub:
+            if _is_unbounded(op, av) and _has_unbounded_repeat(av[2]):
+                issues.append((NESTED_QUANTIFIER,
+                               "unbounded quantifier nested inside another"))
+            for child in _children(op, av):
+                walk(child)
+
+    walk(parsed)
+    for branch in _branches(parsed):
+        wildcards = _count_wildcards(branch)
+        if wildcards >= WILDCARD_CHAIN_LIMIT:
+            issues.append((WILDCARD_CHAIN,
+                           f"{wildcards} unbounded wildcards in one alternative"))
+    return list(dict.fromkeys(issues))
+
+
+def probe_texts(pattern):
+    """Return synthetic near-miss texts that stress *pattern*'s backtracking.
+
+    The chain probe repeats the literal runs of the alternative with the
+    most wildcards, without its last run, so ``a.*b.*c`` sees lines full
+    of ``a``/``b`` but no ``c``.  The repeat probe is one literal
+    character of the pattern repeated and followed by a character that
+    breaks the match.
+    """
+    parsed = sre_parse.parse(pattern, re.IGNORECASE)
+    runs, run = [], []
+    for op, av in max(_branches(parsed), key=_count_wildcards):
+        if op == sre_parse.LITERAL:
+            run.append(chr(av))
+        elif run:
+            runs.append("".join(run))
+            run = []
+    if run:
+        runs.append("".join(run))
+
+    probes = []
+    if len(runs) > 1:
+        unit = " ".join(runs[:-1]) + " "
+        line = (unit * (CHAIN_PROBE_LINE_CHARS // len(unit) + 1))[:CHAIN_PROBE_LINE_CHARS]
+        probes.append("\n".join([line] * CHAIN_PROBE_LINES))
+
+    def first_literal(sub):
+        for op, av in sub:
+            if op == sre_parse.LITERAL:
+                return chr(av)
+            for child in _children(op, av):
+                found = first_literal(child)
+                if found:
+                    return found
+        return None
+
+    char = first_literal(parsed)
+    if char:
+        probes.append(char * REPEAT_PROBE_LEN + "\x00")
+    return probes
+
+
+def worst_search_time(pattern, texts):
+    """Return the longest single ``search`` of *pattern* over *texts* (s)."""
+    regex = re.compile(pattern, re.IGNORECASE)
+    worst = 0.0
+    for text in texts:
+        start = time.perf_counter()
+        regex.search(text)
+        worst = max(worst, time.perf_counter() - start)
+    return worst
+
+
+def _probe(conn, pattern, texts):
+    """Child-process entry point for ``time_pattern``."""
+    conn.send(worst_search_time(pattern, texts))
+    conn.close()
+
+
+def time_pattern(pattern, texts, timeout):
+    """Time *pattern* on *texts* in a child process.
+
+    Returns the worst single-search time in seconds, or ``None`` when the
+    child did not finish within *timeout* seconds (it is killed) or died.
+    """
+    receiver, sender = multiprocessing.Pipe(duplex=False)
+    proc = multiprocessing.Process(target=_probe, args=(sender, pattern, texts),
+                                   daemon=True)
+    proc.start()
+    sender.close()
+    result = None
+    try:
+        if receiver.poll(timeout):
+            result = receiver.recv()
+    except EOFError:
+        pass
+    finally:
+        proc.kill()
+        proc.join()
+        receiver.close()
+    return result
+
+
+def screen_pattern(pattern, texts, budget):
+    """Check *pattern* against a per-search *budget* (seconds).
+
+    Runs *texts* plus ``probe_texts(pattern)`` through ``time_pattern``.
+    The child is allowed ``budget`` per text, so running out of time
+    implies at least one search went over budget.  Returns
+    ``(worst_seconds_or_None, over_budget)``.
+    """
+    texts = list(texts) + probe_texts(pattern)
+    worst = time_pattern(pattern, texts, timeout=budget * (len(texts) + 1) + 1.0)
+    return worst, worst is None or worst > budget
+
+
+def parse_args(argv=None):
+    p = argparse.ArgumentParser(description="Lint rule-engine regex patterns for cost")
+    p.add_argument("--rule-engine", type=Path, default=None,
+                   help="Path to rule-engine.csv (default: the golden rule engine)")
+    p.add_argument("--tickets-dir", type=Path, default=None,
+                   help="Normalized tickets used as the reference corpus "
+                        "(default: synthetic probes only)")
+    p.add_argument("--sample", type=int, default=200,
+                   help="Reference tickets to time each pattern on")
+    p.add_argument("--budget-ms", type=float, default=500.0,
+                   help="Per-search time budget; slower patterns fail the lint")
+    p.add_argument("--all", action="store_true",
+                   help="Time every pattern, not only the statically flagged ones")
+    return p.parse_args(argv)
+
+
+def main(argv=None):
+    import rule_engine_categorize as rec
+    import ticket_corpus
+
+    args = parse_args(argv)
+    rule_engine = args.rule_engine or rec.DEFAULT_RULE_ENGINE
+    if not rule_engine.is_file():
+        sys.exit(f"Rule engine not found: {rule_engine}")
+    rules = rec.load_rules(rule_engine)
+    paths = []
+    if args.tickets_dir:
+        paths = rec.sample_ticket_files(ticket_corpus.ticket_refs(args.tickets_dir), args.sample)
+    budget = args.budget_ms / 1000
+
+    failures = 0
+    for rule in rules:
+        if rule["_re"] is None:
+            continue
+        issues = static_issues(rule["Rule Pattern"])
+        if not issues and not args.all:
+            continue
+        texts = rec.reference_texts(paths, rule["_fields"])
+        worst, over = screen_pattern(rule["Rule Pattern"], texts, budget)
+        failures += over
+        timing = "timed out" if worst is None else f"{worst * 1000:.1f} ms"
+        status = "OVER BUDGET" if over else "ok"
+        print(f"{rule['RuleID']:<8} {status:<11} worst {timing:<10} {rule['Rule Pattern']}")
+        for _code, message in issues:
+            print(f"         - {message}")
+    print(f"\n{failures} rule(s) over the {args.budget_ms:g} ms budget")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
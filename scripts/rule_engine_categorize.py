@@ -8,15 +8,29 @@ Usage:
     python3 scripts/rule_engine_categorize.py --rule-engine scripts/trained-data/golden-rules-engine/rule-engine.csv
     python3 scripts/rule_engine_categorize.py --output-dir scripts/analysis
     python3 scripts/rule_engine_categorize.py --project HPC
+    python3 scripts/rule_engine_categorize.py --workers 8
+    python3 scripts/rule_engine_categorize.py --rule-engine scripts/trained-data/rule-engine.local.csv --incremental
+    python3 scripts/rule_engine_categorize.py --profile-rules --write-hit-counts scripts/analysis/rule-engine.hits.csv
 """
 import argparse
 import csv
+import hashlib
+import io
 import json
 import os
 import re
+import shutil
+import sqlite3
 import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
+from re import _parser as sre_parse
+
+import ticket_corpus
+from regex_cost import screen_pattern, static_issues
 
 REPO_ROOT = Path(__file__).resolve().parent.parent
 DEFAULT_RULE_ENGINE = REPO_ROOT / "scripts" / "trained-data" / "golden-rules-engine" / "rule-engine.csv"
@@ -32,6 +46,57 @@ HUMAN_AUDIT_GUIDANCE = (
 # Meta-rules only set Runbook Present; they don't count as categorization rules
 META_RULE_FAILURE = "Runbook Present = TRUE"
 
+# Ticket files categorized per batch: rules run over the whole batch, then
+# unmatched tickets go through one batched ML call.  In --workers mode each
+# batch is one pool task.
+CATEGORIZE_CHUNK_SIZE = 128
+
+# Output rows written between flush+fsync of the in-progress CSV
+FLUSH_EVERY_ROWS = 500
+
+# Suffix of the in-progress CSV, renamed over the real output on completion
+PARTIAL_SUFFIX = ".partial"
+
+# Suffix of the resume sidecar that records what each output row was built from
+STATE_SUFFIX = ".state"
+
+# Suffix of the copy of the rule engine the sidecar's match sets came from
+RULES_SNAPSHOT_SUFFIX = ".rules.csv"
+
+# Rule columns whose change can alter a ticket's output row
+RULE_DIFF_FIELDS = (
+    "Project Key", "Rule Pattern", "Match Field", "Failure Category",
+    "Category", "Priority", "Confidence",
+)
+
+# Per-ticket regex results cache, kept in the output directory by default
+MATCH_CACHE_NAME = "rule-match-cache.sqlite"
+
+# Per-rule timing and hit report written by --profile-rules
+RULE_PROFILE_NAME = "rule-profile.csv"
+RULE_PROFILE_FIELDS = [
+    "RuleID", "Category", "Match Field", "Regex Runs", "Matches", "Wins",
+    "Total ms", "Max ms", "Mean us",
+]
+# Slowest rules printed in the run summary
+RULE_PROFILE_TOP = 10
+
+# Longest a single rule regex search may take before the rule is
+# quarantined for the rest of the run (--rule-budget-ms)
+DEFAULT_RULE_BUDGET_MS = 500.0
+# Tickets sampled as the reference corpus when screening flagged rules
+SCREEN_SAMPLE_TICKETS = 20
+# Ticket keys listed in the summary for tickets evaluated without a
+# rule quarantined mid-run
+INCOMPLETE_LIST_MAX = 20
+
+# Shortest literal worth indexing; shorter runs match nearly every ticket.
+MIN_PREFILTER_LITERAL = 3
+
+# Characters that re.IGNORECASE matches against ASCII letters but that
+# str.lower() does not fold to them (dotted/dotless I, long s).
+_CASEFOLD_FIXES = str.maketrans({"\u0130": "i", "\u0131": "i", "\u017f": "s"})
+
 
 def parse_args():
     p = argparse.ArgumentParser(description="Rule-engine-only ticket categorization")
@@ -46,7 +111,9 @@ def parse_args():
                    help="Only evaluate rules for this project key. "
                         "If omitted, auto-detects from each ticket's project field.")
     p.add_argument("--resume", action="store_true",
-                   help="Skip tickets already present in the output CSV")
+                   help="Skip tickets already categorized with unchanged "
+                        "inputs (ticket JSON, rule engine, ML model), "
+                        "continuing an interrupted run if one was left behind")
     p.add_argument("-y", "--yes", action="store_true",
                    help="Skip overwrite confirmation when replacing output CSV")
     p.add_argument("--ml-model", type=Path, default=None,
@@ -55,7 +122,47 @@ def parse_args():
                         "tickets that no rule matches.")
     p.add_argument("--ml-category-map", type=Path, default=None,
                    help="Path to category_map.json for ML classifier")
-    return p.parse_args()
+    p.add_argument("--workers", type=int, default=1,
+                   help="Number of worker processes used to categorize "
+                        "tickets (default: 1, no pool). Output order is "
+                        "unchanged.")
+    p.add_argument("--incremental", action="store_true",
+                   help="After a rule-engine change, re-evaluate only the "
+                        "added/changed rules against the match sets cached "
+                        "by the previous run and patch the affected rows "
+                        "(implies --resume)")
+    p.add_argument("--match-cache", type=Path, default=None,
+                   help="SQLite cache of per-ticket rule match results, "
+                        f"reused across runs (default: <output-dir>/{MATCH_CACHE_NAME})")
+    p.add_argument("--no-match-cache", action="store_true",
+                   help="Evaluate every rule without reading or updating "
+                        "the match cache")
+    p.add_argument("--profile-rules", action="store_true",
+                   help="Record per-rule regex runs, matches, wins and regex "
+                        f"time and write <output-dir>/{RULE_PROFILE_NAME} "
+                        "(bypasses the match cache so every regex is timed)")
+    p.add_argument("--write-hit-counts", type=Path, default=None,
+                   help="Write a copy of the rule engine with Hit Count set "
+                        "to each rule's matches in this run (implies "
+                        "--profile-rules)")
+    p.add_argument("--rule-budget-ms", type=float, default=DEFAULT_RULE_BUDGET_MS,
+                   help="Per-search time budget for a rule regex; rules over "
+                        "it are quarantined for the rest of the run and "
+                        "listed in the summary (0 disables). Only patterns "
+                        "flagged as risky are timed before the run; others "
+                        "are checked after each search returns, so a search "
+                        "that never finishes is not stopped (lint all "
+                        "patterns with regex_cost.py --all)")
+    args = p.parse_args()
+    if args.workers < 1:
+        p.error("--workers must be a positive integer")
+    if args.write_hit_counts:
+        if args.write_hit_counts.resolve() == args.rule_engine.resolve():
+            p.error("--write-hit-counts must not overwrite --rule-engine")
+        args.profile_rules = True
+    if args.incremental:
+        args.resume = True
+    return args
 
 
 def find_latest_tickets_dir():
@@ -69,8 +176,427 @@ def find_latest_tickets_dir():
     return date_dirs[-1]
 
 
+def fold_text(text):
+    """Lower-case *text* the way the literal prefilter expects."""
+    return text.translate(_CASEFOLD_FIXES).lower()
+
+
+def required_literals(pattern):
+    """Return literals of which at least one must occur for *pattern* to match.
+
+    Each top-level alternative contributes its longest run of plain ASCII
+    characters, lower-cased for comparison against ``fold_text`` output.
+    Returns ``None`` when some alternative has no run of at least
+    ``MIN_PREFILTER_LITERAL`` characters, meaning the rule cannot be
+    prefiltered and must always be evaluated.
+    """
+    items = list(sre_parse.parse(pattern, re.IGNORECASE))
+    if len(items) == 1 and items[0][0] == sre_parse.BRANCH:
+        branches = items[0][1][1]
+    else:
+        branches = [items]
+
+    literals = set()
+    for branch in branches:
+        best = ""
+        run = []
+        for op, av in list(branch) + [(None, None)]:
+            if op == sre_parse.LITERAL and av < 128:
+                run.append(chr(av))
+                continue
+            if len(run) > len(best):
+                best = "".join(run)
+            run = []
+        if len(best) < MIN_PREFILTER_LITERAL:
+            return None
+        literals.add(best.lower())
+    return tuple(sorted(literals))
+
+
+def parse_match_field(field_spec):
+    """Split a ``Match Field`` spec like 'summary+description' into a tuple."""
+    return tuple(f.strip() for f in field_spec.split("+"))
+
+
+class TicketView:
+    """Match texts for one ticket, each field combination built only once.
+
+    Rules sharing a ``Match Field`` (or overlapping ones such as
+    ``description`` and ``description+comments``) reuse the same per-field
+    parts and joined strings instead of re-concatenating comment bodies for
+    every rule.
+    """
+
+    def __init__(self, ticket_data):
+        self.ticket_data = ticket_data
+        self._parts = {}
+        self._texts = {}
+        self._folded = {}
+
+    def parts(self, field):
+        """Return the list of text parts contributed by a single field."""
+        if field not in self._parts:
+            ticket = self.ticket_data
+            if field == "summary":
+                parts = [ticket.get("ticket", {}).get("summary", "")]
+            elif field == "description":
+                parts = [ticket.get("description", "")]
+            elif field == "labels":
+                parts = [" ".join(ticket.get("labels", []))]
+            elif field == "comments":
+                parts = [c.get("body", "") for c in ticket.get("comments", [])]
+            else:
+                parts = []
+            self._parts[field] = parts
+        return self._parts[field]
+
+    def text(self, fields):
+        """Return the newline-joined text for a tuple of field names."""
+        if fields not in self._texts:
+            self._texts[fields] = "\n".join(
+                part for field in fields for part in self.parts(field)
+            )
+        return self._texts[fields]
+
+    def folded(self, fields):
+        """Return ``fold_text`` of ``text(fields)``, cached."""
+        if fields not in self._folded:
+            self._folded[fields] = fold_text(self.text(fields))
+        return self._folded[fields]
+
+
+class RuleSet(list):
+    """Priority-ordered rules with a per-``Match Field`` literal prefilter.
+
+    Behaves like the plain list ``load_rules`` used to return.  On top of
+    that, rules are grouped by ``Match Field`` and indexed by their
+    required literals so ``match`` only runs the regexes of rules that can
+    possibly fire on a ticket.  Build a new ``RuleSet`` after changing the
+    rules; the index is not kept in sync with list mutations.
+
+    Setting ``profile`` to a ``RuleProfile`` records every regex search's
+    time.  With ``budget`` (seconds) set, a rule whose search takes longer
+    is added to ``quarantined`` (RuleID -> reason) and skipped from then on.
+    The check runs after the search returns, so it cannot interrupt one:
+    only ``screen_rules`` protects against a search that never finishes.
+    """
+
+    def __init__(self, rules=()):
+        super().__init__(rules)
+        self.profile = None
+        self.budget = None
+        self.quarantined = {}
+        # field tuple -> (literal -> rule positions, always-evaluated positions)
+        self.field_groups = {}
+        # position -> rule_match_key, the rule's identity in a MatchCache
+        self.keys = {}
+        for pos, rule in enumerate(self):
+            if rule["_re"] is None:
+                continue
+            fields = rule.get("_fields") or parse_match_field(rule["Match Field"])
+            self.keys[pos] = rule_match_key(rule["_re"].pattern, fields)
+            by_literal, unfiltered = self.field_groups.setdefault(
+                fields, ({}, []),
+            )
+            literals = required_literals(rule["_re"].pattern)
+            if literals is None:
+                unfiltered.append(pos)
+            else:
+                for literal in literals:
+                    by_literal.setdefault(literal, []).append(pos)
+
+    def match(self, ticket_data, project_key=None, cached=None, skipped=None):
+        """Return the rules whose pattern matches *ticket_data*, in priority order.
+
+        *ticket_data* may be a normalized ticket dict or a ``TicketView``.
+        *cached* is an optional ``MatchBits`` for the ticket; rules it
+        already has a result for are not searched again.  *skipped*, if
+        given, is a set that collects the RuleIDs of quarantined rules
+        the ticket would otherwise have been searched with.
+        """
+        view = ticket_data if isinstance(ticket_data, TicketView) else TicketView(ticket_data)
+        hits = []
+        for fields, (by_literal, unfiltered) in self.field_groups.items():
+            text = view.text(fields)
+            candidates = set(unfiltered)
+            if by_literal:
+                folded = view.folded(fields)
+                for literal, positions in by_literal.items():
+                    if literal in folded:
+                        candidates.update(positions)
+            for pos in candidates:
+                rule = self[pos]
+                if project_key and rule.get("Project Key", "") != project_key:
+                    continue
+                if rule["RuleID"] in self.quarantined:
+                    if skipped is not None:
+                        skipped.add(rule["RuleID"])
+                    continue
+                if self._search(pos, text, view, cached):
+                    hits.append(pos)
+        return [self[pos] for pos in sorted(hits)]
+
+    def _search(self, pos, text, view, cached):
+        """Run (or look up in *cached*) one rule's regex over *text*."""
+        key = self.keys[pos]
+        if cached is not None and key in cached:
+            cached.hits += 1
+            return cached[key]
+        rule = self[pos]
+        start = time.perf_counter()
+        matched = int(rule["_re"].search(text) is not None)
+        elapsed = time.perf_counter() - start
+        if self.profile is not None:
+            self.profile.record(rule["RuleID"], elapsed)
+        if self.budget is not None and elapsed > self.budget:
+            ticket_key = view.ticket_data.get("ticket", {}).get("key")
+            self.quarantined.setdefault(
+                rule["RuleID"], f"search took {elapsed * 1000:.0f} ms on {ticket_key}")
+        if cached is not None:
+            cached.add(key, matched)
+        return matched
+
+
+def rule_match_key(pattern, fields):
+    """Return a short digest identifying a rule's pattern and match fields.
+
+    Only these decide whether a rule's regex matches a ticket, so edits to
+    a rule's category, priority or confidence keep its cached results.
+    """
+    spec = pattern + "\0" + "+".join(fields)
+    return hashlib.sha256(spec.encode("utf-8")).hexdigest()[:16]
+
+
+class MatchBits(dict):
+    """Cached regex results for one ticket: rule key -> matched (0/1).
+
+    ``RuleSet.match`` counts the results it reuses in ``hits`` and
+    records the ones it had to compute with ``add``.
+    """
+
+    def __init__(self, bits=()):
+        super().__init__(bits)
+        self.hits = 0
+        self.new = []
+
+    def add(self, key, matched):
+        self[key] = matched
+        self.new.append((key, matched))
+
+
+class MatchCache:
+    """On-disk ``(ticket content digest, rule key) -> matched`` cache.
+
+    Lets a run skip the regexes of unchanged rules on unchanged tickets.
+    New results are buffered in ``pending`` and written by ``flush``;
+    ``hits``/``misses`` count rule evaluations answered from the cache
+    and evaluated afresh.  Pool workers open their own connection and hand
+    their buffered results back to the parent through ``take``/``merge``.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._db = sqlite3.connect(self.path, timeout=60)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS matches ("
+            "ticket TEXT NOT NULL, rule TEXT NOT NULL, hit INTEGER NOT NULL, "
+            "PRIMARY KEY (ticket, rule)) WITHOUT ROWID"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS matches_rule ON matches (rule)")
+        self._db.commit()
+        self.pending = []
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(self, digest):
+        """Return the ``MatchBits`` cached for the ticket with *digest*."""
+        return MatchBits(self._db.execute(
+            "SELECT rule, hit FROM matches WHERE ticket = ?", (digest,)))
+
+    def store(self, digest, bits):
+        """Count and buffer the results *bits* gained for ticket *digest*."""
+        self.hits += bits.hits
+        self.misses += len(bits.new)
+        self.pending.extend((digest, key, hit) for key, hit in bits.new)
+
+    def take(self):
+        """Return and reset ``(pending, hits, misses)``."""
+        taken = (self.pending, self.hits, self.misses)
+        self.pending, self.hits, self.misses = [], 0, 0
+        return taken
+
+    def merge(self, pending, hits, misses):
+        """Add results and counters returned by a worker's ``take``."""
+        self.pending.extend(pending)
+        self.hits += hits
+        self.misses += misses
+
+    def flush(self):
+        """Write buffered results to disk."""
+        if self.pending:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO matches (ticket, rule, hit) VALUES (?, ?, ?)",
+                self.pending,
+            )
+            self._db.commit()
+            self.pending = []
+
+    def evict(self, tickets=None, rules=None):
+        """Delete results for tickets/rules outside the live sets given.
+
+        Returns the number of cached results removed.
+        """
+        removed = 0
+        for column, live in (("ticket", tickets), ("rule", rules)):
+            if live is None:
+                continue
+            stored = {k for (k,) in self._db.execute(
+                f"SELECT DISTINCT {column} FROM matches")}
+            for key in stored - set(live):
+                removed += self._db.execute(
+                    f"DELETE FROM matches WHERE {column} = ?", (key,)).rowcount
+        self._db.commit()
+        return removed
+
+    def close(self):
+        self.flush()
+        self._db.close()
+
+
+class RuleProfile:
+    """Per-RuleID regex runs, regex time, matches and wins.
+
+    ``record`` is called by ``RuleSet.match`` for every regex run;
+    ``evaluations`` counts those runs only, not rules the literal
+    prefilter or the match cache answered without running the regex.
+    Matches and wins are counted per ticket from its matched RuleIDs via
+    ``count_matches``; a rule "wins" a ticket when it is the
+    highest-priority category rule that matched.
+    """
+
+    def __init__(self):
+        self.evaluations = Counter()
+        self.seconds = Counter()
+        self.max_seconds = Counter()
+        self.matches = Counter()
+        self.wins = Counter()
+
+    def record(self, rule_id, elapsed):
+        self.evaluations[rule_id] += 1
+        self.seconds[rule_id] += elapsed
+        if elapsed > self.max_seconds[rule_id]:
+            self.max_seconds[rule_id] = elapsed
+
+    def count_matches(self, matched_ids, rules_by_id):
+        """Count one ticket's matched RuleIDs (in priority order)."""
+        self.matches.update(matched_ids)
+        for rule_id in matched_ids:
+            rule = rules_by_id.get(rule_id)
+            if rule is not None and rule["Failure Category"] != META_RULE_FAILURE:
+                self.wins[rule_id] += 1
+                break
+
+    def take(self):
+        """Return and reset the timing counters (for pool workers)."""
+        taken = (self.evaluations, self.seconds, self.max_seconds)
+        self.evaluations, self.seconds, self.max_seconds = Counter(), Counter(), Counter()
+        return taken
+
+    def merge(self, evaluations, seconds, max_seconds):
+        """Add timing counters returned by a worker's ``take``."""
+        self.evaluations.update(evaluations)
+        self.seconds.update(seconds)
+        for rule_id, elapsed in max_seconds.items():
+            self.max_seconds[rule_id] = max(self.max_seconds[rule_id], elapsed)
+
+    def report(self, rules):
+        """Return one ``RULE_PROFILE_FIELDS`` row per rule, slowest first."""
+        rows = []
+        for rule in rules:
+            rule_id = rule["RuleID"]
+            evaluations = self.evaluations[rule_id]
+            total = self.seconds[rule_id]
+            rows.append({
+                "RuleID": rule_id,
+                "Category": rule["Category"],
+                "Match Field": rule["Match Field"],
+                "Regex Runs": evaluations,
+                "Matches": self.matches[rule_id],
+                "Wins": self.wins[rule_id],
+                "Total ms": round(total * 1000, 3),
+                "Max ms": round(self.max_seconds[rule_id] * 1000, 3),
+                "Mean us": round(total / evaluations * 1e6, 2) if evaluations else 0,
+            })
+        rows.sort(key=lambda r: r["Total ms"], reverse=True)
+        return rows
+
+
+def sample_ticket_files(paths, count):
+    """Return up to *count* of *paths*, evenly spaced."""
+    if len(paths) <= count:
+        return list(paths)
+    step = len(paths) / count
+    return [paths[int(i * step)] for i in range(count)]
+
+
+def reference_texts(paths, fields):
+    """Return the *fields* match text of each ticket JSON in *paths*."""
+    return [TicketView(json.loads(path.read_bytes())).text(fields) for path in paths]
+
+
+def screen_rules(rules, ticket_files, budget):
+    """Warn about risky patterns and quarantine the ones over *budget*.
+
+    Rules flagged by ``regex_cost.static_issues`` are timed in a child
+    process on a sample of *ticket_files* plus synthetic near-miss texts;
+    those exceeding *budget* seconds per search (or not finishing) are
+    added to ``rules.quarantined``.  Unflagged rules are only subject to
+    the evaluation-time budget, which quarantines a rule after a slow
+    search has finished; a pathological pattern the static checks miss
+    can still hang the run.  With *budget* ``None`` nothing is timed.
+    """
+    sample = sample_ticket_files(ticket_files, SCREEN_SAMPLE_TICKETS)
+    for rule in rules:
+        if rule["_re"] is None:
+            continue
+        issues = static_issues(rule["Rule Pattern"])
+        if not issues:
+            continue
+        for _code, message in issues:
+            print(f"WARNING: {rule['RuleID']} pattern risk: {message}", file=sys.stderr)
+        if budget is None:
+            continue
+        worst, over = screen_pattern(rule["Rule Pattern"],
+                                     reference_texts(sample, rule["_fields"]), budget)
+        if over:
+            rules.quarantined[rule["RuleID"]] = (
+                "timed out on reference texts" if worst is None
+                else f"{worst * 1000:.0f} ms per search on reference texts")
+
+
+def write_hit_counts(rule_engine_path, output_path, matches, rule_ids):
+    """Copy the rule engine to *output_path* with ``Hit Count`` from *matches*.
+
+    Every rule in *rule_ids* (the rules loaded for this run) gets its
+    match count, 0 when it never matched.  Other rules (e.g. other
+    projects under ``--project``) keep their existing count.
+    """
+    with open(rule_engine_path, newline="", encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        fieldnames = reader.fieldnames
+        rows = list(reader)
+    for row in rows:
+        if row["RuleID"] in rule_ids:
+            row["Hit Count"] = matches.get(row["RuleID"], 0)
+    with open(output_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
 def load_rules(path, project=None):
-    """Load rule-engine.csv, return list of rule dicts sorted by priority (desc).
+    """Load rule-engine.csv, return a ``RuleSet`` sorted by priority (desc).
 
     If *project* is given (e.g. "DO"), only rules whose ``Project Key``
     matches are loaded.  When *project* is None all rules are loaded and
@@ -85,6 +611,7 @@ def load_rules(path, project=None):
             row["Priority"] = int(row["Priority"])
             row["Confidence"] = float(row["Confidence"])
             row["Hit Count"] = int(row["Hit Count"])
+            row["_fields"] = parse_match_field(row["Match Field"])
             # Pre-compile the regex pattern
             try:
                 row["_re"] = re.compile(row["Rule Pattern"], re.IGNORECASE)
@@ -93,28 +620,18 @@ def load_rules(path, project=None):
                 row["_re"] = None
             rules.append(row)
     rules.sort(key=lambda r: r["Priority"], reverse=True)
-    return rules
+    return RuleSet(rules)
 
 
 def get_ticket_field_text(ticket, field_spec):
     """
     Build the search text from a field spec like 'summary+description' or 'labels'.
+    *field_spec* may also be a tuple from ``parse_match_field``.
     Returns a single string to regex-match against.
     """
-    fields = [f.strip() for f in field_spec.split("+")]
-    parts = []
-    for field in fields:
-        if field == "summary":
-            parts.append(ticket.get("ticket", {}).get("summary", ""))
-        elif field == "description":
-            parts.append(ticket.get("description", ""))
-        elif field == "labels":
-            labels = ticket.get("labels", [])
-            parts.append(" ".join(labels))
-        elif field == "comments":
-            for c in ticket.get("comments", []):
-                parts.append(c.get("body", ""))
-    return "\n".join(parts)
+    if isinstance(field_spec, str):
+        field_spec = parse_match_field(field_spec)
+    return TicketView(ticket).text(field_spec)
 
 
 def get_ticket_project(ticket_data):
@@ -122,30 +639,34 @@ def get_ticket_project(ticket_data):
     return ticket_data.get("ticket", {}).get("project", {}).get("key", "")
 
 
-def evaluate_ticket(ticket_data, rules, project_key=None):
+def evaluate_ticket(ticket_data, rules, project_key=None, cached=None, skipped=None):
     """
     Evaluate all rules against a ticket.
 
+    *rules* is the ``RuleSet`` from ``load_rules``; a plain list of rule
+    dicts is also accepted and indexed on the fly.
+
     *project_key* is the resolved project for this ticket.  When set, rules
     whose ``Project Key`` doesn't match are skipped.  When the caller already
     filtered rules at load-time (``--project`` flag) this can be ``None``.
 
+    *cached* is an optional ``MatchBits`` consulted before running regexes.
+    *skipped* collects quarantined RuleIDs (see ``RuleSet.match``).
+
     Returns (category_rules, meta_rules) — lists of matched rule dicts.
     """
+    if not isinstance(rules, RuleSet):
+        rules = RuleSet(rules)
+
     category_rules = []
     meta_rules = []
 
-    for rule in rules:
-        if rule["_re"] is None:
-            continue
-        if project_key and rule.get("Project Key", "") != project_key:
-            continue
-        text = get_ticket_field_text(ticket_data, rule["Match Field"])
-        if rule["_re"].search(text):
-            if rule["Failure Category"] == META_RULE_FAILURE:
-                meta_rules.append(rule)
-            else:
-                category_rules.append(rule)
+    for rule in rules.match(TicketView(ticket_data), project_key=project_key,
+                            cached=cached, skipped=skipped):
+        if rule["Failure Category"] == META_RULE_FAILURE:
+            meta_rules.append(rule)
+        else:
+            category_rules.append(rule)
 
     return category_rules, meta_rules
 
@@ -161,7 +682,7 @@ def compute_age(created_str):
 
 
 def categorize_ticket(ticket_data, rules, project_key=None,
-                      ml_model=None, ml_category_map=None):
+                      ml_model=None, ml_category_map=None, cached=None):
     """Produce one output row dict for a ticket.
 
     *project_key* is passed through to ``evaluate_ticket`` so that only
@@ -169,6 +690,35 @@ def categorize_ticket(ticket_data, rules, project_key=None,
 
     When *ml_model* and *ml_category_map* are provided and no category
     rule matches, the ML classifier is used as a fallback.
+
+    *cached* is an optional ``MatchBits`` passed to ``evaluate_ticket``.
+    The row's ``_skipped`` holds the quarantined RuleIDs the ticket was
+    not searched with.
+    """
+    skipped = set()
+    category_rules, meta_rules = evaluate_ticket(
+        ticket_data, rules, project_key=project_key, cached=cached, skipped=skipped,
+    )
+    row = build_row(ticket_data, category_rules, meta_rules)
+    row["_skipped"] = tuple(sorted(skipped))
+
+    # ML fallback: attempt classification if model is loaded
+    if (row["Categorization Source"] == "none"
+            and ml_model is not None and ml_category_map is not None):
+        from ml_classifier import predict as ml_predict
+        from ml_classifier import ML_CONFIDENCE_THRESHOLD
+        apply_ml_prediction(
+            row, ml_predict(ml_model, ml_category_map, ticket_data),
+            ML_CONFIDENCE_THRESHOLD,
+        )
+    return row
+
+
+def build_row(ticket_data, category_rules, meta_rules):
+    """Build the output row dict for a ticket from its matched rules.
+
+    The row also carries ``_matched``, the RuleIDs of every matched rule,
+    which is recorded in the resume sidecar but not written to the CSV.
     """
     ticket_info = ticket_data.get("ticket", {})
     status_info = ticket_data.get("status", {})
@@ -186,10 +736,6 @@ def categorize_ticket(ticket_data, rules, project_key=None,
     # Trim created to date only
     created_date = created[:10] if created else ""
 
-    category_rules, meta_rules = evaluate_ticket(
-        ticket_data, rules, project_key=project_key,
-    )
-
     runbook_present = "TRUE" if meta_rules else "FALSE"
 
     if category_rules:
@@ -220,34 +766,12 @@ def categorize_ticket(ticket_data, rules, project_key=None,
         confidence = max(r["Confidence"] for r in category_rules)
         audit = "needs-review" if confidence < 0.5 else "pending-review"
     else:
-        # ML fallback: attempt classification if model is loaded
-        if ml_model is not None and ml_category_map is not None:
-            from ml_classifier import predict as ml_predict
-            from ml_classifier import ML_CONFIDENCE_THRESHOLD
-            cat_of_issue, cat, ml_conf = ml_predict(
-                ml_model, ml_category_map, ticket_data)
-            if ml_conf >= ML_CONFIDENCE_THRESHOLD:
-                category_of_issue = cat_of_issue
-                category = cat
-                rules_used = ""
-                source = "ml"
-                confidence = ml_conf
-                audit = ("needs-review" if ml_conf < 0.5
-                         else "pending-review")
-            else:
-                category_of_issue = "uncategorized"
-                category = "unknown"
-                rules_used = ""
-                source = "none"
-                confidence = ml_conf
-                audit = "needs-review"
-        else:
-            category_of_issue = "uncategorized"
-            category = "unknown"
-            rules_used = ""
-            source = "none"
-            confidence = ""
-            audit = "needs-review"
+        category_of_issue = "uncategorized"
+        category = "unknown"
+        rules_used = ""
+        source = "none"
+        confidence = ""
+        audit = "needs-review"
 
     return {
         "Project Key": ticket_project,
@@ -266,9 +790,158 @@ def categorize_ticket(ticket_data, rules, project_key=None,
         "Human Audit for Accuracy": audit,
         "Human Audit Guidance": HUMAN_AUDIT_GUIDANCE,
         "Human Comments": "",
+        "_matched": tuple(r["RuleID"] for r in category_rules + meta_rules),
+    }
+
+
+def apply_ml_prediction(row, prediction, threshold):
+    """Fill an unmatched output row from an ML ``(coi, category, confidence)``.
+
+    Predictions at or above *threshold* become ``source="ml"`` rows;
+    weaker ones stay uncategorized but record the confidence.
+    """
+    cat_of_issue, cat, ml_conf = prediction
+    row["LLM Confidence"] = ml_conf
+    if ml_conf >= threshold:
+        row["Category of Issue"] = cat_of_issue
+        row["Category"] = cat
+        row["Categorization Source"] = "ml"
+        row["Human Audit for Accuracy"] = ("needs-review" if ml_conf < 0.5
+                                           else "pending-review")
+    else:
+        row["Human Audit for Accuracy"] = "needs-review"
+
+
+def categorize_files(paths, rules, project_filter=None,
+                     ml_model=None, ml_category_map=None, match_cache=None):
+    """Categorize a batch of ticket files, returning rows in *paths* order.
+
+    Runs in two phases: rules are evaluated for every ticket first, then
+    the tickets no category rule matched are scored by the ML model in a
+    single ``predict_batch`` call instead of one ``predict_proba`` per
+    ticket.  With a *match_cache* each ticket's cached regex results are
+    looked up by content digest and the new ones are buffered back.
+
+    Each row carries the ticket's ``ticket_fingerprint`` as
+    ``_fingerprint``, so callers recording it need not read the file again.
+    """
+    use_ml = ml_model is not None and ml_category_map is not None
+    rows = []
+    unmatched = []
+    for path in paths:
+        # Stat first: a file changed after this is seen as changed next run
+        st = path.stat()
+        ticket_data = json.loads(path.read_bytes())
+        digest = ticket_digest(ticket_data)
+
+        cached = None
+        if match_cache is not None:
+            cached = match_cache.lookup(digest)
+
+        # When --project is set, rules are already filtered at load time
+        # so no per-ticket filtering needed.  Otherwise auto-detect from ticket.
+        per_ticket_project = None if project_filter else get_ticket_project(ticket_data)
+        row = categorize_ticket(ticket_data, rules, project_key=per_ticket_project,
+                                cached=cached)
+        if cached is not None:
+            match_cache.store(digest, cached)
+        row["_fingerprint"] = (st.st_mtime_ns, st.st_size, digest)
+        rows.append(row)
+        if use_ml and row["Categorization Source"] == "none":
+            unmatched.append((row, ticket_data))
+
+    if unmatched:
+        from ml_classifier import ML_CONFIDENCE_THRESHOLD, predict_batch
+        predictions = predict_batch(
+            ml_model, ml_category_map, [ticket_data for _, ticket_data in unmatched],
+        )
+        for (row, _), prediction in zip(unmatched, predictions):
+            apply_ml_prediction(row, prediction, ML_CONFIDENCE_THRESHOLD)
+    return rows
+
+
+# Per-process state installed once by ``_init_worker`` in --workers mode.
+_worker_state = {}
+
+
+def _init_worker(rules, project_filter, ml_model, ml_category_map,
+                 match_cache_path=None):
+    """Pool initializer: keep the compiled rules and ML model per process.
+
+    Each worker opens its own connection to the match cache, if any.
+    """
+    _worker_state.update(
+        rules=rules,
+        project_filter=project_filter,
+        ml_model=ml_model,
+        ml_category_map=ml_category_map,
+        match_cache=MatchCache(match_cache_path) if match_cache_path else None,
+    )
+
+
+def _categorize_chunk(paths):
+    """Pool task: categorize a chunk of ticket files with the worker state.
+
+    Returns ``(rows, results)`` where *results* holds the match cache's
+    and rule profile's ``take()`` (or ``None``) and the worker's
+    quarantined rules, for the parent to merge.
+    """
+    rows = categorize_files(paths, **_worker_state)
+    rules = _worker_state["rules"]
+    match_cache = _worker_state["match_cache"]
+    return rows, {
+        "match_cache": match_cache.take() if match_cache is not None else None,
+        "profile": rules.profile.take() if rules.profile is not None else None,
+        "quarantined": rules.quarantined,
     }
 
 
+def iter_categorized_rows(ticket_files, rules, project_filter=None,
+                          ml_model=None, ml_category_map=None, workers=1,
+                          match_cache=None):
+    """Yield one output row per ticket file, in *ticket_files* order.
+
+    Files are categorized in ``CATEGORIZE_CHUNK_SIZE`` chunks via
+    ``categorize_files``.  With *workers* > 1 the chunks are handed to a
+    process pool.  The rules and ML model are passed to each worker once
+    through the pool initializer, and chunk results are yielded in
+    submission order so the output is identical to a serial run.
+
+    New *match_cache* results are flushed once per chunk; in pool mode
+    workers only read the cache and the parent writes their results.
+    Workers' regex timings and quarantined rules are likewise merged
+    into ``rules.profile`` and ``rules.quarantined``.
+    """
+    chunks = [
+        ticket_files[i:i + CATEGORIZE_CHUNK_SIZE]
+        for i in range(0, len(ticket_files), CATEGORIZE_CHUNK_SIZE)
+    ]
+    if workers <= 1:
+        for chunk in chunks:
+            rows = categorize_files(chunk, rules, project_filter,
+                                    ml_model, ml_category_map, match_cache)
+            if match_cache is not None:
+                match_cache.flush()
+            yield from rows
+        return
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(rules, project_filter, ml_model, ml_category_map,
+                  match_cache.path if match_cache is not None else None),
+    ) as pool:
+        for rows, results in pool.map(_categorize_chunk, chunks):
+            if results["match_cache"] is not None:
+                match_cache.merge(*results["match_cache"])
+                match_cache.flush()
+            if results["profile"] is not None:
+                rules.profile.merge(*results["profile"])
+            for rule_id, reason in results["quarantined"].items():
+                rules.quarantined.setdefault(rule_id, reason)
+            yield from rows
+
+
 OUTPUT_FIELDS = [
     "Project Key", "Ticket", "Ticket URL", "Ticket Description",
     "Status", "Created", "Age", "Runbook Present",
@@ -278,6 +951,373 @@ OUTPUT_FIELDS = [
 ]
 
 
+def trim_partial_row(path):
+    """Drop a truncated trailing CSV record left by an interrupted write.
+
+    ``csv`` terminates every row with CRLF, so anything after the last
+    CRLF is an incomplete row.  Only the tail of the file is read.
+    """
+    with open(path, "rb+") as f:
+        end = f.seek(0, os.SEEK_END)
+        pos = end
+        while pos > 0:
+            start = max(0, pos - 65536)
+            f.seek(start)
+            # Overlap one byte so a terminator split across blocks is found
+            block = f.read(min(end, pos + 1) - start)
+            idx = block.rfind(b"\r\n")
+            if idx != -1:
+                f.truncate(start + idx + 2)
+                return
+            pos = start
+        f.truncate(0)
+
+
+def load_done_tickets(path):
+    """Return the set of ticket keys already written to an output CSV."""
+    with open(path, newline="", encoding="utf-8") as f:
+        return {row["Ticket"] for row in csv.DictReader(f)}
+
+
+def file_digest(*paths, extra=""):
+    """Return a short sha256 over the bytes of *paths* and the *extra* string."""
+    h = hashlib.sha256()
+    for path in paths:
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                h.update(block)
+        h.update(b"\0")
+    h.update(extra.encode("utf-8"))
+    return h.hexdigest()[:16]
+
+
+def quarantine_digest(rules_hash, rule_ids):
+    """Return *rules_hash* qualified by the quarantined *rule_ids*.
+
+    Rows evaluated without some rules are recorded in the sidecar under
+    this digest rather than the plain rules digest, so --resume and
+    --incremental treat them as out of date and evaluate them again.
+    """
+    if not rule_ids:
+        return rules_hash
+    return file_digest(extra=f"{rules_hash}:{','.join(sorted(rule_ids))}")
+
+
+def ticket_digest(ticket_data):
+    """Return a short sha256 of a parsed ticket.
+
+    Hashes the compact JSON a corpus stores, so a ticket gets the same
+    digest from its pretty-printed file and from its corpus line, and
+    packing a directory keeps its .state entries and match cache.
+    """
+    return hashlib.sha256(ticket_corpus.compact_json(ticket_data) + b"\0").hexdigest()[:16]
+
+
+def ticket_fingerprint(path, previous=None):
+    """Return ``(mtime_ns, size, content_digest)`` for a ticket ref.
+
+    When *previous* (a state entry) has the same mtime and size, its
+    digest is reused instead of re-reading the ticket.
+    """
+    st = path.stat()
+    if previous is not None and tuple(previous[:2]) == (st.st_mtime_ns, st.st_size):
+        return tuple(previous[:3])
+    return (st.st_mtime_ns, st.st_size, ticket_digest(json.loads(path.read_bytes())))
+
+
+def read_state(path):
+    """Parse a resume sidecar.
+
+    Each line is ``key<TAB>mtime_ns<TAB>size<TAB>digest<TAB>rules<TAB>model``
+    optionally followed by ``<TAB>`` and the comma-separated RuleIDs that
+    matched the ticket (``None`` in the entry when absent).  ``@<offset>``
+    checkpoint lines record the CSV length the entries before them are
+    durable up to.  Entries after the last checkpoint are ignored.
+
+    Returns ``(entries, offset)`` where *offset* is ``None`` if the file has
+    no checkpoint.
+    """
+    entries = {}
+    pending = {}
+    offset = None
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if not line.endswith("\n"):
+                break  # torn final line
+            line = line[:-1]
+            if line.startswith("@"):
+                entries.update(pending)
+                pending = {}
+                offset = int(line[1:])
+            else:
+                key, mtime, size, digest, rules_hash, model_hash, *rest = (
+                    line.split("\t"))
+                matched = tuple(filter(None, rest[0].split(","))) if rest else None
+                pending[key] = (int(mtime), int(size), digest,
+                                rules_hash, model_hash, matched)
+    return entries, offset
+
+
+class CategorizedOutput:
+    """Crash-safe writer for tickets-categorized.csv and its resume sidecar.
+
+    Rows are appended to ``<csv>.partial`` and their state entries to
+    ``<csv>.state.partial``.  Every ``FLUSH_EVERY_ROWS`` rows the CSV is
+    fsynced, then the buffered entries and an ``@<csv length>`` checkpoint
+    are written and fsynced, so after a crash the state describes exactly
+    a prefix of the partial CSV.  ``commit`` renames both over the final
+    files, state first.
+    """
+
+    def __init__(self, output_csv):
+        self.output_csv = Path(output_csv)
+        name = self.output_csv.name
+        self.partial_csv = self.output_csv.with_name(name + PARTIAL_SUFFIX)
+        self.state_path = self.output_csv.with_name(name + STATE_SUFFIX)
+        self.partial_state = self.output_csv.with_name(
+            name + STATE_SUFFIX + PARTIAL_SUFFIX)
+        self.rules_snapshot = self.output_csv.with_name(
+            name + RULES_SNAPSHOT_SUFFIX)
+        self.rows_written = 0
+        self._csv = None
+        self._state = None
+        self._offset = 0
+        self._pending = []
+        self._buf = io.StringIO()
+        self._writer = csv.DictWriter(self._buf, fieldnames=OUTPUT_FIELDS,
+                                      extrasaction="ignore")
+
+    def discard_partial(self):
+        """Remove leftovers of an interrupted run before starting over."""
+        for path in (self.partial_csv, self.partial_state):
+            if path.is_file():
+                path.unlink()
+
+    def prepare_resume(self):
+        """Ready the partial files for appending and report what they hold.
+
+        Returns ``(entries, legacy_keys)``.  *entries* maps ticket key to
+        its state entry.  *legacy_keys* is only non-empty for an output
+        CSV without a usable sidecar; its tickets are trusted as done,
+        matching the old ``--resume`` behaviour.
+        """
+        exact = True
+        if self.partial_csv.is_file():
+            print(f"Found interrupted run: {self.partial_csv}")
+            if self.partial_state.is_file():
+                exact = False
+            elif self.state_path.is_file():
+                # Interrupted between the two renames in commit()
+                os.replace(self.state_path, self.partial_state)
+        elif self.output_csv.is_file():
+            shutil.copyfile(self.output_csv, self.partial_csv)
+            if self.state_path.is_file():
+                shutil.copyfile(self.state_path, self.partial_state)
+        else:
+            return {}, set()
+
+        if self.partial_state.is_file():
+            entries, offset = read_state(self.partial_state)
+            size = self.partial_csv.stat().st_size
+            if offset is not None and (offset == size or not exact and offset < size):
+                with open(self.partial_csv, "rb+") as f:
+                    f.truncate(offset)
+                return entries, set()
+            self.partial_state.unlink()
+
+        # No usable sidecar: fall back to the keys present in the CSV
+        trim_partial_row(self.partial_csv)
+        return {}, load_done_tickets(self.partial_csv)
+
+    def rewrite(self, entries, drop=frozenset(), replacements=None):
+        """Rewrite the partial CSV and sidecar in one streaming pass.
+
+        Rows for tickets in *drop* are removed, rows for tickets in
+        *replacements* (key -> row dict) are swapped in place, and the
+        sidecar is rewritten from *entries* minus *drop*.
+        """
+        replacements = replacements or {}
+        tmp = self.partial_csv.with_name(self.partial_csv.name + ".tmp")
+        with open(self.partial_csv, newline="", encoding="utf-8") as src, \
+                open(tmp, "w", newline="", encoding="utf-8") as dst:
+            writer = csv.DictWriter(dst, fieldnames=OUTPUT_FIELDS,
+                                    extrasaction="ignore")
+            writer.writeheader()
+            for row in csv.DictReader(src):
+                if row["Ticket"] not in drop:
+                    writer.writerow(replacements.get(row["Ticket"], row))
+        os.replace(tmp, self.partial_csv)
+        with open(self.partial_state, "w", encoding="utf-8") as f:
+            for key, entry in entries.items():
+                if key not in drop:
+                    f.write(_format_state_entry(key, entry))
+            f.write(f"@{self.partial_csv.stat().st_size}\n")
+
+    def open(self):
+        """Open the partial files for appending, writing the header if new."""
+        self._csv = open(self.partial_csv, "ab")
+        self._offset = self._csv.tell()
+        self._state = open(self.partial_state, "a", encoding="utf-8")
+        if self._offset == 0:
+            self._buf.seek(0)
+            self._buf.truncate()
+            self._writer.writeheader()
+            self._write_bytes(self._buf.getvalue())
+            self.checkpoint()
+
+    def _write_bytes(self, text):
+        data = text.encode("utf-8")
+        self._csv.write(data)
+        self._offset += len(data)
+
+    def record(self, key, entry):
+        """Queue a state entry that has no new CSV row (e.g. a refreshed mtime)."""
+        self._pending.append(_format_state_entry(key, entry))
+
+    def write(self, key, row, entry):
+        """Append one output row and queue its state entry."""
+        self._buf.seek(0)
+        self._buf.truncate()
+        self._writer.writerow(row)
+        self._write_bytes(self._buf.getvalue())
+        self.record(key, entry)
+        self.rows_written += 1
+        if self.rows_written % FLUSH_EVERY_ROWS == 0:
+            self.checkpoint()
+
+    def checkpoint(self):
+        """Make every row written so far durable and record it in the sidecar."""
+        self._csv.flush()
+        os.fsync(self._csv.fileno())
+        self._pending.append(f"@{self._offset}\n")
+        self._state.write("".join(self._pending))
+        self._pending = []
+        self._state.flush()
+        os.fsync(self._state.fileno())
+
+    def close(self):
+        """Close the partial files without publishing them."""
+        for f in (self._csv, self._state):
+            if f is not None:
+                f.close()
+        self._csv = self._state = None
+
+    def commit(self, rule_engine_path):
+        """Checkpoint, close, and rename the partial files over the outputs.
+
+        A copy of *rule_engine_path* is kept as the rules snapshot that
+        ``--incremental`` diffs the next rule engine against.
+        """
+        self.checkpoint()
+        self.close()
+        tmp = self.rules_snapshot.with_name(self.rules_snapshot.name + ".tmp")
+        shutil.copyfile(rule_engine_path, tmp)
+        os.replace(tmp, self.rules_snapshot)
+        os.replace(self.partial_state, self.state_path)
+        os.replace(self.partial_csv, self.output_csv)
+
+
+def _format_state_entry(key, entry):
+    fields = [key, *map(str, entry[:5])]
+    if entry[5] is not None:
+        fields.append(",".join(entry[5]))
+    return "\t".join(fields) + "\n"
+
+
+def diff_rules(old_rules, new_rules):
+    """Compare two rule lists by RuleID.
+
+    Returns ``(changed_ids, removed_ids)``: RuleIDs that are new or whose
+    ``RULE_DIFF_FIELDS`` differ, and RuleIDs no longer present.
+    """
+    def signatures(rules):
+        return {r["RuleID"]: tuple(r[f] for f in RULE_DIFF_FIELDS) for r in rules}
+
+    old = signatures(old_rules)
+    new = signatures(new_rules)
+    changed = {rid for rid, sig in new.items() if old.get(rid) != sig}
+    return changed, set(old) - set(new)
+
+
+def apply_rule_diff(ticket_files, entries, old_rules_hash, rules, rules_hash,
+                    model_hash, changed_ids, removed_ids, project_filter=None,
+                    ml_model=None, ml_category_map=None):
+    """Update cached match sets for a rule-engine diff without a full pass.
+
+    For every sidecar entry produced with the old rules (and an unchanged
+    ticket file and model), rules in *changed_ids* / *removed_ids* are
+    dropped from its match set and only the *changed_ids* rules are
+    re-evaluated.  Entries are updated in place to the new rules digest.
+    *ticket_files* maps ticket keys to their files (or corpus refs).
+
+    The changed rules share ``budget`` and ``quarantined`` with *rules*,
+    so rules quarantined by ``screen_rules`` are not searched.  A ticket
+    that misses a rule quarantined during the diff keeps its old entry
+    and is re-categorized by the full pass that follows.
+
+    Returns ``(replacements, evaluated)``: key -> rebuilt row for tickets
+    whose output changed, and how many tickets were re-evaluated.
+    """
+    delta = RuleSet([r for r in rules if r["RuleID"] in changed_ids])
+    delta.budget = rules.budget
+    delta.quarantined = rules.quarantined
+    screened = set(rules.quarantined)
+    position = {r["RuleID"]: i for i, r in enumerate(rules)}
+    replacements = {}
+    unmatched = []
+    evaluated = 0
+
+    for key, entry in entries.items():
+        old_ids = entry[5]
+        if entry[3:5] != (old_rules_hash, model_hash) or old_ids is None:
+            continue
+        path = ticket_files.get(key)
+        if path is None:
+            continue
+        fingerprint = ticket_fingerprint(path, entry)
+        if fingerprint[2] != entry[2]:
+            continue  # content changed: re-categorized by the normal resume path
+
+        matched = {rid for rid in old_ids
+                   if rid not in changed_ids and rid not in removed_ids}
+        ticket_data = None
+        if delta:
+            ticket_data = json.loads(path.read_bytes())
+            project_key = None if project_filter else get_ticket_project(ticket_data)
+            skipped = set()
+            matched.update(r["RuleID"] for r in delta.match(ticket_data, project_key,
+                                                             skipped=skipped))
+            evaluated += 1
+            if skipped - screened:
+                continue
+        new_ids = tuple(sorted(matched, key=position.__getitem__))
+        entries[key] = fingerprint + (rules_hash, model_hash, new_ids)
+        if set(new_ids) == set(old_ids) and not matched & changed_ids:
+            continue
+
+        if ticket_data is None:
+            ticket_data = json.loads(path.read_bytes())
+        hits = [rules[position[rid]] for rid in new_ids]
+        row = build_row(
+            ticket_data,
+            [r for r in hits if r["Failure Category"] != META_RULE_FAILURE],
+            [r for r in hits if r["Failure Category"] == META_RULE_FAILURE],
+        )
+        replacements[key] = row
+        if (row["Categorization Source"] == "none"
+                and ml_model is not None and ml_category_map is not None):
+            unmatched.append((row, ticket_data))
+
+    if unmatched:
+        from ml_classifier import ML_CONFIDENCE_THRESHOLD, predict_batch
+        predictions = predict_batch(
+            ml_model, ml_category_map, [ticket_data for _, ticket_data in unmatched],
+        )
+        for (row, _), prediction in zip(unmatched, predictions):
+            apply_ml_prediction(row, prediction, ML_CONFIDENCE_THRESHOLD)
+    return replacements, evaluated
+
+
 def main():
     args = parse_args()
     tickets_dir = args.tickets_dir or find_latest_tickets_dir()
@@ -288,6 +1328,8 @@ def main():
     print(f"Rule engine : {rule_engine_path}")
     print(f"Output dir  : {output_dir}")
     print(f"Project     : {args.project or 'auto-detect'}")
+    if args.workers > 1:
+        print(f"Workers     : {args.workers}")
 
     if not tickets_dir.is_dir():
         sys.exit(f"Tickets directory not found: {tickets_dir}")
@@ -314,14 +1356,21 @@ def main():
             args.ml_model, args.ml_category_map)
         print(f"ML fallback : enabled (model={args.ml_model})")
 
-    # Collect all ticket JSONs
-    ticket_files = sorted(tickets_dir.glob("*.json"))
-    print(f"Found {len(ticket_files)} ticket files")
+    # Collect all ticket JSONs, from the packed corpus when there is one
+    ticket_files = ticket_corpus.ticket_refs(tickets_dir)
+    if ticket_files and not isinstance(ticket_files[0], Path):
+        print(f"Found {len(ticket_files)} tickets in {ticket_corpus.CORPUS_NAME}")
+    else:
+        print(f"Found {len(ticket_files)} ticket files")
 
     if not ticket_files:
         print("Nothing to process.")
         return
 
+    rules.budget = args.rule_budget_ms / 1000 if args.rule_budget_ms > 0 else None
+    screen_rules(rules, ticket_files, rules.budget)
+    screened = set(rules.quarantined)
+
     # Load already-done tickets if resuming
     output_csv = output_dir / "tickets-categorized.csv"
     if output_csv.is_file() and not args.resume:
@@ -335,65 +1384,184 @@ def main():
                 print("Aborted.")
                 sys.exit(0)
 
-    done_tickets = set()
-    if args.resume and output_csv.is_file():
-        with open(output_csv, newline="", encoding="utf-8") as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                done_tickets.add(row["Ticket"])
-        print(f"Resuming — {len(done_tickets)} tickets already processed")
+    # Rows stream into .partial files that replace the output CSV and its
+    # .state sidecar only once the run completes; an interrupted run leaves
+    # them behind for --resume.  The sidecar records each ticket's source
+    # file fingerprint plus the rule-engine and model digests, so --resume
+    # re-categorizes exactly the tickets whose inputs changed.  Rules
+    # quarantined before the run are part of the rules digest recorded.
+    output = CategorizedOutput(output_csv)
+    rules_hash = file_digest(rule_engine_path, extra=project_filter or "")
+    run_hash = quarantine_digest(rules_hash, screened)
+    model_hash = (file_digest(args.ml_model, args.ml_category_map)
+                  if ml_model is not None else "-")
+    entries = {}
+    legacy_keys = set()
+    if args.resume:
+        entries, legacy_keys = output.prepare_resume()
+        if entries or legacy_keys:
+            print(f"Resuming — {len(entries) + len(legacy_keys)} "
+                  "tickets already processed")
+    else:
+        output.discard_partial()
+
+    replacements = {}
+    if args.incremental:
+        old_rules_hash = (file_digest(output.rules_snapshot, extra=project_filter or "")
+                          if output.rules_snapshot.is_file() else None)
+        if old_rules_hash is None or not entries:
+            print("Incremental : no cached match sets; running a full resume")
+        elif old_rules_hash != rules_hash:
+            old_rules = load_rules(output.rules_snapshot, project=project_filter)
+            changed_ids, removed_ids = diff_rules(old_rules, rules)
+            print(f"Incremental : {len(changed_ids)} added/changed, "
+                  f"{len(removed_ids)} removed rule(s)")
+            replacements, evaluated = apply_rule_diff(
+                {tf.stem: tf for tf in ticket_files}, entries, old_rules_hash, rules, run_hash,
+                model_hash, changed_ids, removed_ids,
+                project_filter=project_filter,
+                ml_model=ml_model, ml_category_map=ml_category_map,
+            )
+            print(f"Incremental : {evaluated} ticket(s) re-evaluated, "
+                  f"{len(replacements)} row(s) patched")
 
     # Process
-    results = []
-    stats = {"rule": 0, "ml": 0, "none": 0, "runbook": 0, "skipped": 0}
+    stats = {"rule": 0, "ml": 0, "none": 0, "runbook": 0, "skipped": 0,
+             "changed": 0}
+    # Content digests of every ticket in this run, to evict the rest from
+    # the match cache once the run completes
+    live_tickets = set()
+    # Tickets evaluated without a rule quarantined during the run
+    incomplete = []
+    profile = None
+    if args.profile_rules:
+        profile = rules.profile = RuleProfile()
+        rules_by_id = {r["RuleID"]: r for r in rules}
 
+    pending_files = []
+    stale_keys = set()
+    refreshed = {}
     for tf in ticket_files:
-        ticket_id = tf.stem
-        if ticket_id in done_tickets:
+        key = tf.stem
+        if key in legacy_keys:
+            refreshed[key] = ticket_fingerprint(tf) + (run_hash, model_hash, None)
+            live_tickets.add(refreshed[key][2])
             stats["skipped"] += 1
             continue
+        entry = entries.get(key)
+        if entry is not None and entry[3:5] == (run_hash, model_hash):
+            fingerprint = ticket_fingerprint(tf, entry)
+            if fingerprint[2] == entry[2]:
+                live_tickets.add(fingerprint[2])
+                stats["skipped"] += 1
+                if profile is not None and entry[5] is not None:
+                    profile.count_matches(entry[5], rules_by_id)
+                if fingerprint != entry[:3]:
+                    refreshed[key] = fingerprint + entry[3:]
+                continue
+        if entry is not None:
+            stale_keys.add(key)
+        pending_files.append(tf)
 
-        with open(tf, encoding="utf-8") as f:
-            ticket_data = json.load(f)
+    if stale_keys:
+        stats["changed"] = len(stale_keys)
+        print(f"Re-categorizing {len(stale_keys)} ticket(s) whose inputs changed")
+    if stale_keys or replacements:
+        output.rewrite(entries, drop=stale_keys, replacements=replacements)
 
-        # When --project is set, rules are already filtered at load time
-        # so no per-ticket filtering needed.  Otherwise auto-detect from ticket.
-        per_ticket_project = None if project_filter else get_ticket_project(ticket_data)
-        row = categorize_ticket(ticket_data, rules,
-                                project_key=per_ticket_project,
-                                ml_model=ml_model,
-                                ml_category_map=ml_category_map)
-        results.append(row)
-
-        source = row["Categorization Source"]
-        if source == "rule":
-            stats["rule"] += 1
-        elif source == "ml":
-            stats["ml"] += 1
-        else:
-            stats["none"] += 1
-        if row["Runbook Present"] == "TRUE":
-            stats["runbook"] += 1
+    match_cache = None
+    if not args.no_match_cache and profile is None:
+        match_cache = MatchCache(args.match_cache or output_dir / MATCH_CACHE_NAME)
 
-    # Write output
-    write_header = not (args.resume and output_csv.is_file() and done_tickets)
-    mode = "a" if (args.resume and output_csv.is_file() and done_tickets) else "w"
+    output.open()
+    try:
+        for key, entry in refreshed.items():
+            output.record(key, entry)
 
-    with open(output_csv, mode, newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=OUTPUT_FIELDS)
-        if write_header:
-            writer.writeheader()
-        writer.writerows(results)
+        rows = iter_categorized_rows(pending_files, rules,
+                                     project_filter=project_filter,
+                                     ml_model=ml_model,
+                                     ml_category_map=ml_category_map,
+                                     workers=args.workers,
+                                     match_cache=match_cache)
+        for tf, row in zip(pending_files, rows):
+            fingerprint = row["_fingerprint"]
+            live_tickets.add(fingerprint[2])
+            skipped = screened.union(row.get("_skipped", ()))
+            if skipped != screened:
+                incomplete.append(tf.stem)
+            output.write(tf.stem, row, fingerprint
+                         + (quarantine_digest(rules_hash, skipped), model_hash, row["_matched"]))
+            if profile is not None:
+                profile.count_matches(row["_matched"], rules_by_id)
+
+            source = row["Categorization Source"]
+            if source == "rule":
+                stats["rule"] += 1
+            elif source == "ml":
+                stats["ml"] += 1
+            else:
+                stats["none"] += 1
+            if row["Runbook Present"] == "TRUE":
+                stats["runbook"] += 1
+
+        output.commit(rule_engine_path)
+        if match_cache is not None:
+            # Rules of other projects are not loaded under --project, so
+            # only a full rule engine says which rules are retired.
+            evicted = match_cache.evict(
+                tickets=live_tickets,
+                rules=None if project_filter else set(rules.keys.values()),
+            )
+    finally:
+        output.close()
+        if match_cache is not None:
+            match_cache.close()
+    total = output.rows_written
 
-    total = len(results)
     print(f"\nDone. {total} tickets categorized → {output_csv}")
     print(f"  Rule matched : {stats['rule']}")
     if stats["ml"]:
         print(f"  ML matched   : {stats['ml']}")
     print(f"  No match     : {stats['none']}")
     print(f"  Runbook=TRUE : {stats['runbook']}")
+    if stats["changed"]:
+        print(f"  Changed      : {stats['changed']}")
     if stats["skipped"]:
         print(f"  Skipped      : {stats['skipped']}")
+    if match_cache is not None and (match_cache.hits or match_cache.misses):
+        print(f"  Match cache  : {match_cache.hits} hits, "
+              f"{match_cache.misses} misses, {evicted} evicted")
+
+    for rule_id, reason in rules.quarantined.items():
+        print(f"  Quarantined  : {rule_id} ({reason})")
+    if incomplete:
+        shown = ", ".join(incomplete[:INCOMPLETE_LIST_MAX])
+        more = f" and {len(incomplete) - INCOMPLETE_LIST_MAX} more" if len(
+            incomplete) > INCOMPLETE_LIST_MAX else ""
+        print(f"  Incomplete   : {len(incomplete)} ticket(s) evaluated without a rule "
+              f"quarantined mid-run, re-evaluated on the next --resume: {shown}{more}")
+
+    if profile is not None:
+        report = profile.report(rules)
+        profile_csv = output_dir / RULE_PROFILE_NAME
+        with open(profile_csv, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=RULE_PROFILE_FIELDS)
+            writer.writeheader()
+            writer.writerows(report)
+        print(f"\nRule profile → {profile_csv}")
+        print(f"  {'RuleID':<10} {'Runs':>8} {'Matches':>8} {'Wins':>6} "
+              f"{'Total ms':>10} {'Max ms':>9}")
+        for row in report[:RULE_PROFILE_TOP]:
+            print(f"  {row['RuleID']:<10} {row['Regex Runs']:>8} {row['Matches']:>8} "
+                  f"{row['Wins']:>6} {row['Total ms']:>10} {row['Max ms']:>9}")
+        unmatched = [r["RuleID"] for r in report if not r["Matches"]]
+        if unmatched:
+            print(f"  Never matched: {', '.join(unmatched)}")
+        if args.write_hit_counts:
+            write_hit_counts(rule_engine_path, args.write_hit_counts, profile.matches,
+                             {rule["RuleID"] for rule in rules})
+            print(f"Hit counts   → {args.write_hit_counts}")
 
 
 if __name__ == "__main__":
@@ -50,6 +50,9 @@ from io import TextIOBase
 from pathlib import Path
 from typing import Any, Dict
 
+import ticket_corpus
+from regex_cost import NESTED_QUANTIFIER, static_issues
+
 REPO_ROOT = Path(__file__).resolve().parent.parent
 DEFAULT_OUTPUT_RULE_ENGINE = (
     REPO_ROOT / "scripts" / "trained-data" / "rule-engine.local.csv"
@@ -454,6 +457,13 @@ def normalize_proposal(
         print(f"Skipping proposal due to invalid regex '{rule_pattern}': {exc}", file=sys.stderr)
         return None
 
+    for code, message in static_issues(rule_pattern):
+        if code == NESTED_QUANTIFIER:
+            print(f"Skipping proposal due to catastrophic-backtracking risk in "
+                  f"'{rule_pattern}': {message}", file=sys.stderr)
+            return None
+        print(f"WARNING: costly regex proposal '{rule_pattern}': {message}", file=sys.stderr)
+
     try:
         priority = int(priority_raw)
     except (TypeError, ValueError):
@@ -674,15 +684,11 @@ def _load_ticket_jsons(tickets_dir, ticket_keys):
     """
     if not tickets_dir or not tickets_dir.is_dir():
         return {}
-    result = {}
-    for json_file in tickets_dir.glob("*.json"):
-        if json_file.stem in ticket_keys:
-            with open(json_file, encoding="utf-8") as f:
-                result[json_file.stem] = json.load(f)
-    return result
+    return dict(ticket_corpus.iter_tickets(tickets_dir, ticket_keys))
 
 
-def generate_ml_proposals(review_rows, ml_pipeline, ml_category_map, tickets_dir):
+def generate_ml_proposals(review_rows, ml_pipeline, ml_category_map, tickets_dir,
+                          ml_term_index=None):
     """Generate rule proposals using the ML classifier.
 
     For each review row:
@@ -692,6 +698,8 @@ def generate_ml_proposals(review_rows, ml_pipeline, ml_category_map, tickets_dir
     4. Build regex pattern from those terms
     5. Create a rule proposal
 
+    *ml_term_index* names the terms of a hashing-family model.
+
     Returns a list of proposal dicts (same shape as Codex proposals).
     """
     from ml_classifier import (
@@ -735,7 +743,7 @@ def generate_ml_proposals(review_rows, ml_pipeline, ml_category_map, tickets_dir
             continue
 
         # Extract top TF-IDF terms for pattern building
-        top_terms = extract_top_terms(ml_pipeline, text, n=5)
+        top_terms = extract_top_terms(ml_pipeline, text, n=5, term_index=ml_term_index)
         if not top_terms:
             print(f"  ML: skipping {ticket_key} — no distinctive terms found")
             continue
@@ -820,14 +828,17 @@ def main(argv=None):
 
         ml_pipeline = None
         ml_category_map = None
+        ml_term_index = None
         tickets_dir = None
         if uses_ml:
             from ml_classifier import load_model as ml_load_model
+            from ml_classifier import load_term_index
             validate_file(args.ml_model, "ML model")
             validate_file(args.ml_category_map, "ML category map")
             ml_pipeline, ml_category_map = ml_load_model(
                 args.ml_model, args.ml_category_map
             )
+            ml_term_index = load_term_index(args.ml_model)
             tickets_dir = args.tickets_dir or find_latest_tickets_dir()
             print(f"ML model: {args.ml_model}")
             print(f"ML category map: {args.ml_category_map}")
@@ -905,7 +916,8 @@ def main(argv=None):
         if uses_ml and ml_input_rows:
             print("\n--- ML Rule Generation ---")
             ml_proposals = generate_ml_proposals(
-                ml_input_rows, ml_pipeline, ml_category_map, tickets_dir
+                ml_input_rows, ml_pipeline, ml_category_map, tickets_dir,
+                ml_term_index=ml_term_index,
             )
             all_proposals.extend(ml_proposals)
             print(f"ML proposals generated: {len(ml_proposals)}")
@@ -123,17 +123,15 @@ if [[ "$ASSUME_YES" == "true" ]]; then
   YES_ARGS=(-y)
 fi
 
-echo "[1/3] Fetching tickets..."
+echo "[1/2] Fetching and normalizing tickets..."
 uv run python3 scripts/get_tickets.py \
   -a "$START_DATE" "$END_DATE" \
   --include-resolved-only \
   --jql-file "$JQL_FILE" \
+  --normalize \
   "${YES_ARGS[@]}"
 
-echo "[2/3] Normalizing tickets..."
-uv run python3 scripts/normalize_tickets.py --input-dir scripts/tickets-json/ "${YES_ARGS[@]}"
-
-echo "[3/3] Categorizing with rule engine..."
+echo "[2/2] Categorizing with rule engine..."
 ML_ARGS=()
 if [[ "$ENGINE" == "ml" || "$ENGINE" == "codex+ml" ]]; then
   ML_ARGS=(--ml-model "$ML_MODEL" --ml-category-map "$ML_CATEGORY_MAP")
@@ -0,0 +1,67 @@
+"""Tests for bench_normalize.py."""
+
+import importlib
+import json
+
+bench = importlib.import_module("bench_normalize")
+
+SMALL_SIZES = {"dmesg": 2000, "tqdm": 2000, "markup": 1500, "comment": 300}
+
+
+class TestGenerateBodies:
+    def test_sizes_and_content(self, monkeypatch):
+        monkeypatch.setattr(bench, "BODY_SIZES", SMALL_SIZES)
+        bodies = bench.generate_bodies(seed=1)
+        assert {name: len(text) for name, text in bodies.items()} == SMALL_SIZES
+        assert "█" in bodies["tqdm"]
+        assert "\r\n" in bodies["dmesg"]
+        assert "{code:bash}" in bodies["markup"]
+
+    def test_deterministic(self, monkeypatch):
+        monkeypatch.setattr(bench, "BODY_SIZES", SMALL_SIZES)
+        assert bench.generate_bodies(seed=3) == bench.generate_bodies(seed=3)
+
+
+class TestCompareResults:
+    def test_reports_throughput_ratio(self):
+        baseline = {"clean_jira_text": {"dmesg": {"mb_per_sec": 10.0},
+                                        "tqdm": {"mb_per_sec": None}},
+                    "normalize_issue": {"median_ms": 600.0}}
+        current = {"clean_jira_text": {"dmesg": {"mb_per_sec": 30.0},
+                                       "tqdm": {"mb_per_sec": 5.0},
+                                       "comment": {"mb_per_sec": 1.0}},
+                   "normalize_issue": {"median_ms": 300.0}}
+        lines = bench.compare_results(baseline, current)
+        assert len(lines) == 2
+        assert "x3.00" in lines[0]
+        assert "x2.00 faster" in lines[1]
+
+    def test_empty_baseline(self):
+        current = {"clean_jira_text": {"dmesg": {"mb_per_sec": 1.0}},
+                   "normalize_issue": {"median_ms": 1.0}}
+        assert bench.compare_results({}, current) == []
+
+
+class TestMain:
+    def test_writes_results_and_compares(self, tmp_path, monkeypatch, capsys):
+        monkeypatch.setattr(bench, "BODY_SIZES", SMALL_SIZES)
+        output = tmp_path / "out" / "bench.json"
+        bench.main(["--repeat", "2", "--output", str(output)])
+        report = json.loads(output.read_text(encoding="utf-8"))
+        assert set(report["clean_jira_text"]) == set(SMALL_SIZES)
+        assert report["clean_jira_text"]["dmesg"]["chars"] == 2000
+        assert report["normalize_issue"]["comments"] == bench.COMMENTS_PER_ISSUE
+
+        bench.main(["--repeat", "1", "--output", str(tmp_path / "again.json"),
+                    "--baseline", str(output)])
+        out = capsys.readouterr().out
+        assert "Compared with" in out
+        assert "normalize_issue" in out.split("Compared with")[1]
+
+    def test_baseline_without_results(self, tmp_path, monkeypatch, capsys):
+        monkeypatch.setattr(bench, "BODY_SIZES", SMALL_SIZES)
+        baseline = tmp_path / "baseline.json"
+        baseline.write_text("{}", encoding="utf-8")
+        bench.main(["--repeat", "1", "--output", str(tmp_path / "b.json"),
+                    "--baseline", str(baseline)])
+        assert "no comparable results" in capsys.readouterr().out
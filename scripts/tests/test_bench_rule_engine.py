@@ -0,0 +1,157 @@
+"""Tests for bench_rule_engine.py."""
+
+import importlib
+import json
+import random
+import subprocess
+from unittest.mock import patch
+
+import pytest
+
+bench = importlib.import_module("bench_rule_engine")
+rec = importlib.import_module("rule_engine_categorize")
+
+RULES_CSV = (
+    "Project Key,RuleID,Rule Pattern,Match Field,Failure Category,Category,"
+    "Priority,Confidence,Created By,Hit Count\n"
+    "DO,R001,CDFP.*fault|link down,summary,CDFP Fault,CDFP,100,0.95,human,0\n"
+    "DO,R002,\\d+,description,Digits,NUM,50,0.5,human,0\n"
+    "DO,R003,[bad,summary,Bad,BAD,10,0.5,human,0\n"
+    "HPC,R004,dimm.*replace,description+comments,DIMM,HW,80,0.9,human,0\n"
+)
+
+
+@pytest.fixture
+def rule_engine(tmp_path):
+    path = tmp_path / "rules.csv"
+    path.write_text(RULES_CSV, encoding="utf-8")
+    return path
+
+
+def _load(path):
+    with patch("sys.stderr"):
+        return rec.load_rules(path)
+
+
+class TestRulePhrases:
+    def test_literal_runs_of_first_alternative(self, rule_engine):
+        phrases = bench.rule_phrases(_load(rule_engine))
+        assert sorted(phrases) == ["CDFP fault", "dimm replace"]
+
+
+class TestGenerateTicket:
+    def test_shape(self):
+        ticket = bench.generate_ticket(random.Random(1), 7, ["CDFP fault"])
+        assert ticket["ticket"]["key"].endswith("-1000007")
+        assert ticket["ticket"]["project"]["key"] in ("DO", "HPC")
+        assert len(ticket["comments"]) <= bench.MAX_COMMENTS
+        assert ticket["status"]["created"].endswith("Z")
+        assert isinstance(ticket["labels"], list)
+
+    def test_phrases_embedded(self):
+        rng = random.Random(3)
+        tickets = [bench.generate_ticket(rng, i, ["zzphrase"]) for i in range(50)]
+        assert any("zzphrase" in t["description"] for t in tickets)
+
+
+class TestGenerateCorpus:
+    def test_writes_and_reuses(self, tmp_path):
+        corpus = tmp_path / "corpus"
+        paths = bench.generate_corpus(corpus, 5, [])
+        assert len(paths) == 5
+        mtimes = [p.stat().st_mtime_ns for p in paths]
+        assert bench.generate_corpus(corpus, 5, []) == paths
+        assert [p.stat().st_mtime_ns for p in paths] == mtimes
+
+    def test_regenerates_on_size_change(self, tmp_path):
+        corpus = tmp_path / "corpus"
+        bench.generate_corpus(corpus, 5, [])
+        assert len(bench.generate_corpus(corpus, 3, [])) == 3
+        assert len(list(corpus.glob("*.json"))) == 3
+
+
+class TestStats:
+    def test_percentile(self):
+        values = list(range(1, 101))
+        assert bench.percentile(values, 50) == 50
+        assert bench.percentile(values, 99) == 99
+        assert bench.percentile([5], 99) == 5
+
+    def test_summarize(self):
+        stats = bench.summarize([0.001, 0.002, 0.003, 0.004])
+        assert stats["count"] == 4
+        assert stats["tickets_per_sec"] == 400.0
+        assert stats["p50_ms"] == 2.0
+
+    def test_summarize_zero_total(self):
+        assert bench.summarize([0.0], total_seconds=0)["tickets_per_sec"] is None
+
+    def test_peak_rss(self):
+        rss = bench.peak_rss_mb()
+        assert rss["self"] > 0
+
+
+class TestGitCommit:
+    def test_git_unavailable(self):
+        with patch.object(bench.subprocess, "run", side_effect=OSError):
+            assert bench.git_commit() is None
+
+    def test_git_error(self):
+        err = subprocess.CalledProcessError(128, "git")
+        with patch.object(bench.subprocess, "run", side_effect=err):
+            assert bench.git_commit() is None
+
+
+class TestCompareResults:
+    def test_reports_change_for_matching_sizes(self):
+        baseline = {"results": [
+            {"tickets": 10, "evaluate_ticket": {"tickets_per_sec": 100.0},
+             "main": {"tickets_per_sec": None}},
+        ]}
+        current = {"results": [
+            {"tickets": 10, "evaluate_ticket": {"tickets_per_sec": 150.0},
+             "categorize_ticket": {"tickets_per_sec": 80.0},
+             "main": {"tickets_per_sec": 50.0}},
+            {"tickets": 20, "evaluate_ticket": {"tickets_per_sec": 1.0}},
+        ]}
+        lines = bench.compare_results(baseline, current)
+        assert len(lines) == 1
+        assert "evaluate_ticket" in lines[0]
+        assert "+50.0%" in lines[0]
+
+
+class TestMain:
+    def test_writes_results_and_compares(self, tmp_path, rule_engine, capsys):
+        output = tmp_path / "out" / "bench.json"
+        bench.main(["--sizes", "4", "2", "--rule-engine", str(rule_engine),
+                    "--output", str(output), "--corpus-dir", str(tmp_path / "c")])
+        report = json.loads(output.read_text(encoding="utf-8"))
+        assert [r["tickets"] for r in report["results"]] == [2, 4]
+        result = report["results"][0]
+        for stage in ("evaluate_ticket", "categorize_ticket", "main"):
+            assert result[stage]["count"] == 2
+        assert result["load_rules"]["count"] == bench.LOAD_RULES_REPEAT
+        assert report["rules"] == 4
+        assert (tmp_path / "c" / "tickets-4").is_dir()
+
+        again = tmp_path / "again.json"
+        bench.main(["--sizes", "2", "--rule-engine", str(rule_engine),
+                    "--output", str(again), "--baseline", str(output)])
+        out = capsys.readouterr().out
+        assert "Compared with" in out
+        assert "evaluate_ticket" in out.split("Compared with")[1]
+
+    def test_baseline_without_matching_sizes(self, tmp_path, rule_engine, capsys):
+        baseline = tmp_path / "baseline.json"
+        baseline.write_text(json.dumps({"results": []}), encoding="utf-8")
+        bench.main(["--sizes", "1", "--rule-engine", str(rule_engine),
+                    "--output", str(tmp_path / "b.json"),
+                    "--baseline", str(baseline)])
+        assert "no matching sizes" in capsys.readouterr().out
+
+    def test_missing_rule_engine(self, tmp_path):
+        with pytest.raises(SystemExit, match="Rule engine not found"):
+            bench.main(["--rule-engine", str(tmp_path / "missing.csv")])
+
+    def test_default_sizes(self):
+        assert bench.parse_args([]).sizes == [1000, 10000, 100000]
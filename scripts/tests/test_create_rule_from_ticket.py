@@ -9,6 +9,7 @@ from pathlib import Path
 import pytest
 
 import create_rule_from_ticket
+import ticket_corpus
 
 
 RULE_HEADER = (
@@ -270,3 +271,16 @@ def test_run_interactive_requires_raw_ticket_json(tmp_path):
             input_fn=_make_prompt_inputs(ticket_key),
             print_fn=lambda *_: None,
         )
+
+
+def test_find_normalized_ticket_reads_packed_corpus(tmp_path):
+    root = tmp_path / "normalized-tickets"
+    _write_json(root / "2026-02-14" / "HPC-100001.json", {"ticket": {"summary": "older"}})
+    packed = root / "2026-02-15"
+    _write_json(packed / "HPC-100001.json", {"ticket": {"summary": "newer"}})
+    ticket_corpus.write_corpus(packed)
+    (packed / "HPC-100001.json").unlink()
+
+    picked = create_rule_from_ticket.find_normalized_ticket(root, "HPC-100001")
+    assert create_rule_from_ticket.load_ticket_json(picked, "normalized") == {
+        "ticket": {"summary": "newer"}}
@@ -1,5 +1,6 @@
 """Tests for get_tickets.py"""
 
+import gzip
 import importlib
 import json
 import sys
@@ -22,8 +23,26 @@ load_jira_token = get_tickets.load_jira_token
 load_tickets_file = get_tickets.load_tickets_file
 fetch_tickets_from_file = get_tickets.fetch_tickets_from_file
 _request_json = get_tickets._request_json
+make_session = get_tickets.make_session
 
 
+class _RequestsGetSession:
+    """Stand-in for ``make_session`` that routes through ``requests.get``."""
+
+    def __init__(self, *args, **kwargs):
+        self.headers = {}
+
+    def get(self, *args, **kwargs):
+        return get_tickets.requests.get(*args, **kwargs)
+
+    def close(self):
+        pass
+
+
+@pytest.fixture(autouse=True)
+def _session_uses_requests_get(monkeypatch):
+    """Let tests keep patching ``requests.get`` for pooled-session requests."""
+    monkeypatch.setattr(get_tickets, "make_session", _RequestsGetSession)
 
 # --- parse_ticket_key ---
 
@@ -686,8 +705,8 @@ class TestFetchTicketsFromFile:
         monkeypatch.setattr(get_tickets, "OUTPUT_DIR", tmp_path)
 
         fetched = []
-        monkeypatch.setattr(get_tickets, "fetch_single_ticket",
-                            lambda k: fetched.append(k))
+        monkeypatch.setattr(get_tickets, "_fetch_ticket",
+                            lambda k, session, fields: fetched.append(k))
 
         fetch_tickets_from_file(str(tickets_file), force=True)
         assert fetched == ["DO-123", "DO-456"]
@@ -700,7 +719,7 @@ class TestFetchTicketsFromFile:
         out_dir.mkdir()
         (out_dir / "old.json").write_text("{}")
         monkeypatch.setattr(get_tickets, "OUTPUT_DIR", out_dir)
-        monkeypatch.setattr(get_tickets, "fetch_single_ticket", lambda k: None)
+        monkeypatch.setattr(get_tickets, "_fetch_ticket", lambda k, session, fields: None)
 
         fetch_tickets_from_file(str(tickets_file), force=True)
         assert not (out_dir / "old.json").exists()
@@ -711,8 +730,8 @@ class TestFetchTicketsFromFile:
         monkeypatch.setattr(get_tickets, "OUTPUT_DIR", tmp_path)
 
         fetched = []
-        monkeypatch.setattr(get_tickets, "fetch_single_ticket",
-                            lambda k: fetched.append(k))
+        monkeypatch.setattr(get_tickets, "_fetch_ticket",
+                            lambda k, session, fields: fetched.append(k))
 
         fetch_tickets_from_file(str(tickets_file), force=True)
         assert fetched == ["DO-123", "DO-456"]
@@ -721,12 +740,66 @@ class TestFetchTicketsFromFile:
         tickets_file = tmp_path / "tickets.txt"
         tickets_file.write_text("DO-123\nDO-456\n")
         monkeypatch.setattr(get_tickets, "OUTPUT_DIR", tmp_path)
-        monkeypatch.setattr(get_tickets, "fetch_single_ticket", lambda k: None)
+        monkeypatch.setattr(get_tickets, "_fetch_ticket", lambda k, session, fields: None)
 
         fetch_tickets_from_file(str(tickets_file), force=True)
         out = capsys.readouterr().out
         assert "2 unique ticket(s)" in out
-        assert "Fetched 2 ticket(s) from file" in out
+        assert "Fetched 2 ticket(s) from file in" in out
+        assert "tickets/s, concurrency 1" in out
+
+    def test_concurrent_fetch_collects_failures(self, tmp_path, monkeypatch, capsys):
+        tickets_file = tmp_path / "tickets.txt"
+        tickets_file.write_text("DO-1\nDO-2\nDO-3\nDO-4\n")
+        monkeypatch.setattr(get_tickets, "OUTPUT_DIR", tmp_path)
+        token_loads = []
+        monkeypatch.setattr(get_tickets, "make_headers",
+                            lambda: token_loads.append(1) or {})
+
+        def fake_get(url, **kwargs):
+            key = url.rsplit("/", 1)[1]
+            if key == "DO-2":
+                body = {"errorMessages": ["Issue does not exist"]}
+            elif key == "DO-3":
+                body = {"unexpected": True}
+            else:
+                body = {"key": key}
+            return MagicMock(status_code=200, json=MagicMock(return_value=body))
+
+        monkeypatch.setattr(get_tickets.requests, "get", fake_get)
+
+        failures = fetch_tickets_from_file(str(tickets_file), force=True, concurrency=3)
+
+        assert token_loads == [1]
+        assert set(failures) == {"DO-2", "DO-3"}
+        assert failures["DO-2"] == "Issue does not exist"
+        assert failures["DO-3"].startswith("unexpected response")
+        assert json.loads((tmp_path / "DO-4.json").read_text()) == {"key": "DO-4"}
+        assert not (tmp_path / "DO-2.json").exists()
+        captured = capsys.readouterr()
+        assert "Fetched 2 ticket(s) from file" in captured.out
+        assert "concurrency 3" in captured.out
+        assert "2 ticket(s) failed" in captured.err
+        assert "DO-2: Issue does not exist" in captured.err
+
+    def test_request_failure_does_not_abort_batch(self, tmp_path, monkeypatch, capsys):
+        tickets_file = tmp_path / "tickets.txt"
+        tickets_file.write_text("DO-1\nDO-2\n")
+        monkeypatch.setattr(get_tickets, "OUTPUT_DIR", tmp_path)
+        monkeypatch.setattr(get_tickets.time, "sleep", lambda s: None)
+
+        def fake_get(url, **kwargs):
+            if url.endswith("DO-1"):
+                raise requests.ConnectionError("reset")
+            return MagicMock(status_code=200, json=MagicMock(return_value={"key": "DO-2"}))
+
+        monkeypatch.setattr(get_tickets.requests, "get", fake_get)
+
+        failures = fetch_tickets_from_file(str(tickets_file), force=True)
+
+        assert list(failures) == ["DO-1"]
+        assert "failed after 3 attempt(s)" in failures["DO-1"]
+        assert (tmp_path / "DO-2.json").exists()
 
 
 # --- parse_args --tickets-file ---
@@ -791,9 +864,10 @@ class TestMainTicketsFile:
         monkeypatch.setattr(get_tickets, "OUTPUT_DIR", tmp_path)
 
         captured = {}
-        def fake_fetch(path, force=False):
+        def fake_fetch(path, force=False, concurrency=1, fields=None):
             captured["path"] = path
             captured["force"] = force
+            captured["concurrency"] = concurrency
         monkeypatch.setattr(get_tickets, "fetch_tickets_from_file", fake_fetch)
 
         get_tickets.main(["-f", str(tickets_file)])
@@ -806,13 +880,29 @@ class TestMainTicketsFile:
         monkeypatch.setattr(get_tickets, "OUTPUT_DIR", tmp_path)
 
         captured = {}
-        def fake_fetch(path, force=False):
+        def fake_fetch(path, force=False, concurrency=1, fields=None):
             captured["force"] = force
         monkeypatch.setattr(get_tickets, "fetch_tickets_from_file", fake_fetch)
 
         get_tickets.main(["-f", str(tickets_file), "-y"])
         assert captured["force"] is True
 
+    def test_threads_concurrency_and_exits_on_failures(self, tmp_path, monkeypatch):
+        tickets_file = tmp_path / "tickets.txt"
+        tickets_file.write_text("DO-123\n")
+        captured = {}
+
+        def fake_fetch(path, force=False, concurrency=1, fields=None):
+            captured["concurrency"] = concurrency
+            return {"DO-123": "Issue does not exist"}
+
+        monkeypatch.setattr(get_tickets, "fetch_tickets_from_file", fake_fetch)
+
+        with pytest.raises(SystemExit) as exc_info:
+            get_tickets.main(["-f", str(tickets_file), "--concurrency", "16"])
+        assert exc_info.value.code == 1
+        assert captured["concurrency"] == 16
+
 
 # --- _request_json retry logic ---
 
@@ -889,3 +979,510 @@ class TestRequestJsonRetry:
         out = capsys.readouterr().err
         assert "failed" in out
         assert "400 Bad Request" in out
+
+
+class TestRequestJsonRateLimit:
+    def test_waits_retry_after_without_using_attempts(self, monkeypatch, capsys):
+        limited = MagicMock(status_code=429, headers={"Retry-After": "7"})
+        ok = MagicMock(status_code=200, json=MagicMock(return_value={"ok": True}))
+        responses = iter([limited, limited, limited, ok])
+        monkeypatch.setattr(get_tickets.requests, "get", lambda *a, **kw: next(responses))
+        sleeps = []
+        monkeypatch.setattr(get_tickets.time, "sleep", sleeps.append)
+
+        assert _request_json("http://example.com", context="Test 429") == {"ok": True}
+        assert sleeps == [7.0, 7.0, 7.0]
+        assert "rate limited; retrying in 7s" in capsys.readouterr().err
+
+    def test_unparseable_retry_after_uses_default_delay(self, monkeypatch):
+        limited = MagicMock(status_code=429, headers={"Retry-After": "Wed, 21 Oct 2026 07:28:00 GMT"})
+        ok = MagicMock(status_code=200, json=MagicMock(return_value={}))
+        responses = iter([limited, ok])
+        monkeypatch.setattr(get_tickets.requests, "get", lambda *a, **kw: next(responses))
+        sleeps = []
+        monkeypatch.setattr(get_tickets.time, "sleep", sleeps.append)
+
+        _request_json("http://example.com")
+        assert sleeps == [get_tickets.REQUEST_RETRY_DELAY_SECONDS]
+
+    def test_persistent_429_counts_as_failed_attempt(self, monkeypatch, capsys):
+        limited = MagicMock(status_code=429, headers={})
+        limited.raise_for_status.side_effect = requests.HTTPError("429 Too Many Requests")
+        calls = []
+
+        def fake_get(*args, **kwargs):
+            calls.append(1)
+            return limited
+
+        monkeypatch.setattr(get_tickets.requests, "get", fake_get)
+        monkeypatch.setattr(get_tickets.time, "sleep", lambda s: None)
+
+        with pytest.raises(SystemExit):
+            _request_json("http://example.com")
+        per_attempt = get_tickets.RATE_LIMIT_MAX_WAITS + 1
+        assert len(calls) == per_attempt * get_tickets.REQUEST_RETRY_COUNT
+        assert "429 Too Many Requests" in capsys.readouterr().err
+
+    def test_uses_session_when_given(self, monkeypatch):
+        monkeypatch.setattr(get_tickets.requests, "get", MagicMock(side_effect=AssertionError))
+        session = MagicMock()
+        session.get.return_value = MagicMock(json=MagicMock(return_value={"via": "session"}))
+
+        assert _request_json("http://example.com", session=session) == {"via": "session"}
+        assert session.get.call_args[1]["timeout"] == get_tickets.REQUEST_TIMEOUT_SECONDS
+
+
+class TestMakeSession:
+    def test_pool_size_and_headers(self):
+        session = make_session(4, headers={"Authorization": "Bearer x"})
+        try:
+            adapter = session.get_adapter("https://jira.example.com")
+            assert adapter._pool_maxsize == 4
+            assert session.headers["Authorization"] == "Bearer x"
+        finally:
+            session.close()
+
+
+class TestFetchSearchConcurrent:
+    @staticmethod
+    def _pages(total, page_size=100, extra=None):
+        """Fake search endpoint serving *total* issues (plus *extra* created later)."""
+        issues = [{"key": f"DO-{i}"} for i in range(total + (extra or 0))]
+        seen = []
+
+        def fake_get(*args, **kwargs):
+            params = kwargs["params"]
+            start = params["startAt"]
+            seen.append(start)
+            page = issues[start:start + params["maxResults"]]
+            return MagicMock(json=MagicMock(return_value={"issues": page, "total": total}))
+
+        return fake_get, seen
+
+    def test_fetches_remaining_pages_in_parallel(self, tmp_path, monkeypatch, capsys):
+        monkeypatch.setattr(get_tickets, "OUTPUT_DIR", tmp_path)
+        fake_get, seen = self._pages(350)
+        monkeypatch.setattr(get_tickets.requests, "get", fake_get)
+
+        fetch_search(concurrency=3)
+
+        assert seen[0] == 0
+        assert sorted(seen[1:4]) == [100, 200, 300]
+        assert seen[4:] == [400]
+        names = sorted(p.name for p in tmp_path.glob("page_*.json"))
+        assert names == ["page_0.json", "page_100.json", "page_200.json", "page_300.json"]
+        page = json.loads((tmp_path / "page_300.json").read_text())
+        assert [i["key"] for i in page["issues"]][0] == "DO-300"
+        out = capsys.readouterr().out
+        assert "3 more page(s) with 3 concurrent requests" in out
+        assert "Fetched 350 tickets across 4 pages" in out
+
+    def test_serial_tail_picks_up_late_tickets(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(get_tickets, "OUTPUT_DIR", tmp_path)
+        fake_get, seen = self._pages(150, extra=80)
+        monkeypatch.setattr(get_tickets.requests, "get", fake_get)
+
+        fetch_search(concurrency=4)
+
+        assert seen[-2:] == [200, 300]
+        assert (tmp_path / "page_200.json").exists()
+
+    def test_single_page_skips_pool(self, tmp_path, monkeypatch, capsys):
+        monkeypatch.setattr(get_tickets, "OUTPUT_DIR", tmp_path)
+        fake_get, seen = self._pages(40)
+        monkeypatch.setattr(get_tickets.requests, "get", fake_get)
+
+        fetch_search(concurrency=4)
+
+        assert seen == [0, 100]
+        assert "concurrent requests" not in capsys.readouterr().out
+
+    def test_bad_page_exits(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(get_tickets, "OUTPUT_DIR", tmp_path)
+
+        def fake_get(*args, **kwargs):
+            start = kwargs["params"]["startAt"]
+            body = {"issues": [{"key": "DO-1"}] * 100, "total": 300} if start == 0 else {"error": "x"}
+            return MagicMock(json=MagicMock(return_value=body))
+
+        monkeypatch.setattr(get_tickets.requests, "get", fake_get)
+
+        with pytest.raises(SystemExit):
+            fetch_search(concurrency=2)
+
+    def test_main_threads_concurrency(self, tmp_path, monkeypatch):
+        captured = {}
+        monkeypatch.setattr(get_tickets, "fetch_search",
+                            lambda *a, **kw: captured.update(kw))
+        monkeypatch.setattr(get_tickets, "OUTPUT_DIR", tmp_path)
+
+        get_tickets.main(["-a", "--concurrency", "8", "-2d"])
+
+        assert captured["concurrency"] == 8
+
+    def test_rejects_non_positive_concurrency(self, capsys):
+        with pytest.raises(SystemExit) as exc_info:
+            get_tickets.main(["-a", "--concurrency", "0"])
+        assert exc_info.value.code == 2
+        assert "--concurrency must be a positive integer" in capsys.readouterr().err
+
+
+# --- sync_search ---
+
+def _issue(key, updated):
+    return {"key": key, "fields": {"summary": key, "updated": updated}}
+
+
+class TestSyncSearch:
+    @pytest.fixture(autouse=True)
+    def _dirs(self, tmp_path, monkeypatch):
+        self.out = tmp_path / "tickets-json"
+        self.state_path = tmp_path / "sync-state.json"
+        monkeypatch.setattr(get_tickets, "OUTPUT_DIR", self.out)
+        monkeypatch.setattr(get_tickets, "SYNC_STATE_PATH", self.state_path)
+
+    @staticmethod
+    def _serve(monkeypatch, issues, total=None, profile=None):
+        queries = []
+
+        def fake_get(url, **kwargs):
+            if url.endswith("/myself"):
+                body = {"timeZone": "UTC"} if profile is None else profile
+                return MagicMock(status_code=200, json=MagicMock(return_value=body))
+            params = kwargs["params"]
+            queries.append(params["jql"])
+            start = params["startAt"]
+            page = issues[start:start + params["maxResults"]]
+            body = {"issues": page, "total": len(issues) if total is None else total}
+            return MagicMock(status_code=200, json=MagicMock(return_value=body))
+
+        monkeypatch.setattr(get_tickets.requests, "get", fake_get)
+        return queries
+
+    def test_first_sync_fetches_all_and_records_mark(self, monkeypatch, capsys):
+        queries = self._serve(monkeypatch, [
+            _issue("DO-1", "2026-10-16T08:00:00.000+0000"),
+            _issue("DO-2", "2026-10-17T03:12:45.000+0000"),
+            {"key": "DO-3", "fields": {}},
+        ])
+
+        assert get_tickets.sync_search(jql="project = DO", sync_key="k") == 3
+
+        assert "updated >=" not in queries[0]
+        assert queries[0].endswith("ORDER BY key ASC")
+        assert sorted(p.name for p in self.out.iterdir()) == ["DO-1.json", "DO-2.json", "DO-3.json"]
+        assert json.loads((self.out / "DO-2.json").read_text())["key"] == "DO-2"
+        state = json.loads(self.state_path.read_text())
+        assert state["k"]["updated"] == "2026-10-17T03:12:45+00:00"
+        assert state["k"]["tickets"] == 3
+        assert "no high-water mark" in capsys.readouterr().out
+
+    def test_user_order_by_replaced(self, monkeypatch, capsys):
+        queries = self._serve(monkeypatch, [_issue("DO-1", "2026-10-16T08:00:00.000+0000")])
+        get_tickets.sync_search(jql='project = DO AND summary ~ "order by"\norder by  created DESC',
+                                sync_key="k", include_unresolved=True)
+        assert queries[0] == 'project = DO AND summary ~ "order by"\nORDER BY key ASC'
+        assert "dropping the ORDER BY" in capsys.readouterr().out
+
+        queries = self._serve(monkeypatch, [])
+        get_tickets.sync_search(jql='project = DO AND summary ~ "order by"',
+                                sync_key="k", include_unresolved=True)
+        assert queries[0].startswith('project = DO AND summary ~ "order by"\n     AND updated >=')
+
+    def test_delta_sync_upserts_in_place(self, monkeypatch):
+        self._serve(monkeypatch, [_issue("DO-1", "2026-10-16T08:00:00.000+0000"),
+                                  _issue("DO-2", "2026-10-16T09:00:00.000+0000")])
+        get_tickets.sync_search(jql="project = DO", sync_key="k")
+        untouched = (self.out / "DO-1.json").stat().st_mtime_ns
+
+        changed = _issue("DO-2", "2026-10-18T01:30:00.000+0000")
+        changed["fields"]["summary"] = "edited"
+        queries = self._serve(monkeypatch, [changed, _issue("DO-9", "2026-10-18T01:00:00.000+0000")])
+        assert get_tickets.sync_search(jql="project = DO", sync_key="k") == 2
+
+        # Ten minutes of overlap before the mark
+        assert 'AND updated >= "2026-10-16 08:50"' in queries[0]
+        assert json.loads((self.out / "DO-2.json").read_text())["fields"]["summary"] == "edited"
+        assert (self.out / "DO-9.json").exists()
+        assert (self.out / "DO-1.json").stat().st_mtime_ns == untouched
+        assert json.loads(self.state_path.read_text())["k"]["updated"] == "2026-10-18T01:30:00+00:00"
+
+    def test_empty_delta_keeps_mark(self, monkeypatch):
+        self.state_path.write_text(json.dumps({"k": {
+            "jql": "project = DO" + get_tickets.RESOLVED_FILTER, "updated": "2026-10-01 00:00"}}))
+        queries = self._serve(monkeypatch, [])
+
+        assert get_tickets.sync_search(jql="project = DO", sync_key="k") == 0
+
+        assert '"2026-09-30 23:50"' in queries[0]
+        assert json.loads(self.state_path.read_text())["k"]["updated"] == "2026-10-01T00:00:00+00:00"
+
+    def test_changed_query_resyncs_everything(self, monkeypatch):
+        self.state_path.write_text(json.dumps({"k": {"jql": "old", "updated": "2026-10-01 00:00"}}))
+        queries = self._serve(monkeypatch, [])
+
+        get_tickets.sync_search(jql="project = DO", sync_key="k")
+
+        assert "updated >=" not in queries[0]
+
+    def test_page_files_are_archived_and_force_full_sync(self, monkeypatch):
+        self.out.mkdir()
+        (self.out / "page_0.json").write_text("{}")
+        self.state_path.write_text(json.dumps({get_tickets.SYNC_DEFAULT_KEY: {
+            "jql": get_tickets.BASE_JQL + get_tickets.RESOLVED_FILTER,
+            "updated": "2026-10-01 00:00"}}))
+        queries = self._serve(monkeypatch, [_issue("DO-1", "2026-10-02T00:00:00.000+0000")])
+
+        get_tickets.sync_search(force=True)
+
+        assert "updated >=" not in queries[0]
+        assert not (self.out / "page_0.json").exists()
+        assert list(self.out.parent.glob("tickets_json_*.zip"))
+
+    def test_concurrent_pages(self, monkeypatch):
+        issues = [_issue(f"DO-{i}", f"2026-10-{1 + i // 100:02d}T00:00:00.000+0000")
+                  for i in range(250)]
+        self._serve(monkeypatch, issues)
+
+        assert get_tickets.sync_search(sync_key="k", concurrency=3) == 250
+
+        assert len(list(self.out.glob("DO-*.json"))) == 250
+        assert json.loads(self.state_path.read_text())["k"]["updated"] == "2026-10-03T00:00:00+00:00"
+
+    def _mark_state(self, mark="2026-10-16T09:00:00+00:00"):
+        self.state_path.write_text(json.dumps({"k": {
+            "jql": "project = DO" + get_tickets.RESOLVED_FILTER, "updated": mark}}))
+
+    def test_mark_converted_to_profile_timezone(self, monkeypatch):
+        self._mark_state()
+        queries = self._serve(monkeypatch, [], profile={"timeZone": "America/Los_Angeles"})
+        get_tickets.sync_search(jql="project = DO", sync_key="k")
+        # 09:00 UTC is 02:00 PDT
+        assert 'AND updated >= "2026-10-16 01:50"' in queries[0]
+
+    @pytest.mark.parametrize("profile", [{}, {"timeZone": "Mars/Olympus"}])
+    def test_unknown_timezone_widens_overlap(self, monkeypatch, capsys, profile):
+        self._mark_state()
+        queries = self._serve(monkeypatch, [], profile=profile)
+        get_tickets.sync_search(jql="project = DO", sync_key="k")
+        assert 'AND updated >= "2026-10-15 18:50"' in queries[0]
+        assert "timezone unknown" in capsys.readouterr().out
+
+    def test_mark_never_passes_sync_start_or_goes_back(self, monkeypatch):
+        self._mark_state()
+        # Only an overlap ticket, and one with an updated time ahead of our clock
+        self._serve(monkeypatch, [_issue("DO-1", "2026-10-16T08:55:00.000+0000")])
+        get_tickets.sync_search(jql="project = DO", sync_key="k")
+        assert json.loads(self.state_path.read_text())["k"]["updated"] == "2026-10-16T09:00:00+00:00"
+
+        self._serve(monkeypatch, [_issue("DO-2", "2999-01-01T00:00:00.000+0000")])
+        before = get_tickets.datetime.now(get_tickets.timezone.utc)
+        get_tickets.sync_search(jql="project = DO", sync_key="k")
+        mark = get_tickets.parse_sync_mark(json.loads(self.state_path.read_text())["k"]["updated"])
+        assert before - get_tickets.timedelta(seconds=1) <= mark <= get_tickets.datetime.now(
+            get_tickets.timezone.utc)
+
+    def test_unreadable_state_runs_full_sync(self, capsys):
+        self.state_path.write_text("{not json")
+        assert get_tickets.load_sync_state() == {}
+        assert "running a full sync" in capsys.readouterr().out
+
+    def test_missing_state(self):
+        assert get_tickets.load_sync_state() == {}
+
+
+class TestSyncArgs:
+    def test_requires_all(self, capsys):
+        with pytest.raises(SystemExit):
+            parse_args(["--sync", "-t", "DO-1"])
+        assert "--sync requires -a/--all" in capsys.readouterr().err
+
+    def test_excludes_number_of_tickets(self, capsys):
+        with pytest.raises(SystemExit):
+            parse_args(["-a", "--sync", "--number-of-tickets", "5"])
+        assert "mutually exclusive" in capsys.readouterr().err
+
+    def test_main_dispatches_with_jql_file_key(self, tmp_path, monkeypatch):
+        jql_file = tmp_path / "team.jql"
+        jql_file.write_text("project = DO\n")
+        captured = {}
+        monkeypatch.setattr(get_tickets, "sync_search", lambda *a, **kw: captured.update(kw))
+        monkeypatch.setattr(get_tickets, "fetch_search", MagicMock(side_effect=AssertionError))
+
+        get_tickets.main(["-a", "--sync", "--jql-file", str(jql_file), "-2d"])
+
+        assert captured["sync_key"] == str(jql_file.resolve())
+        assert captured["jql"] == "project = DO"
+
+    def test_main_default_key(self, monkeypatch):
+        captured = {}
+        monkeypatch.setattr(get_tickets, "sync_search", lambda *a, **kw: captured.update(kw))
+
+        get_tickets.main(["-a", "--sync"])
+
+        assert captured["sync_key"] == get_tickets.SYNC_DEFAULT_KEY
+
+
+class TestFieldProjection:
+    def test_default_fields_follow_normalizer(self):
+        normalize_tickets = importlib.import_module("normalize_tickets")
+        assert get_tickets.SOURCE_FIELDS.split(",") == normalize_tickets.source_fields()
+        assert "*all" not in get_tickets.SOURCE_FIELDS
+
+    def test_search_requests_projected_fields(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(get_tickets, "OUTPUT_DIR", tmp_path)
+        mock_get = MagicMock(return_value=MagicMock(
+            status_code=200, json=MagicMock(return_value={"issues": [], "total": 0})))
+        monkeypatch.setattr(get_tickets.requests, "get", mock_get)
+
+        fetch_search()
+        assert mock_get.call_args[1]["params"]["fields"] == get_tickets.SOURCE_FIELDS
+
+        fetch_search(fields=get_tickets.ALL_FIELDS, force=True)
+        assert mock_get.call_args[1]["params"]["fields"] == "*all,comment"
+
+    def test_single_ticket_requests_projected_fields(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(get_tickets, "OUTPUT_DIR", tmp_path)
+        mock_get = MagicMock(return_value=MagicMock(
+            status_code=200, json=MagicMock(return_value={"key": "DO-1"})))
+        monkeypatch.setattr(get_tickets.requests, "get", mock_get)
+
+        fetch_single_ticket("DO-1", fields="summary,comment")
+        assert mock_get.call_args[1]["params"] == {"fields": "summary,comment"}
+
+        get_tickets._fetch_ticket("DO-1", None)
+        assert mock_get.call_args[1]["params"] == {"fields": get_tickets.SOURCE_FIELDS}
+
+    def test_sync_always_requests_updated(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(get_tickets, "OUTPUT_DIR", tmp_path / "out")
+        monkeypatch.setattr(get_tickets, "SYNC_STATE_PATH", tmp_path / "state.json")
+        mock_get = MagicMock(return_value=MagicMock(
+            status_code=200, json=MagicMock(return_value={"issues": [], "total": 0})))
+        monkeypatch.setattr(get_tickets.requests, "get", mock_get)
+
+        get_tickets.sync_search(fields="summary")
+        assert mock_get.call_args[1]["params"]["fields"] == "summary,updated"
+
+        get_tickets.sync_search(fields=get_tickets.ALL_FIELDS)
+        assert mock_get.call_args[1]["params"]["fields"] == "*all,comment"
+
+    def test_fields_override_threads_through_main(self, monkeypatch):
+        captured = {}
+        monkeypatch.setattr(get_tickets, "fetch_search", lambda *a, **kw: captured.update(kw))
+
+        get_tickets.main(["-a", "--fields", "summary,labels", "-2d"])
+        assert captured["fields"] == "summary,labels"
+
+        get_tickets.main(["-a"])
+        assert captured["fields"] == get_tickets.SOURCE_FIELDS
+
+
+# --- fused fetch -> normalize ---
+
+RAW_ISSUE = {
+    "id": "1", "key": "DO-1",
+    "fields": {"summary": "GPU fault", "labels": ["Compute", "ORTANO"],
+               "description": "nvidia-smi *failed*", "customfield_99999": "unused"},
+}
+
+
+class TestNormalizedPageWriter:
+    def test_matches_normalize_tickets_output(self, tmp_path):
+        out = tmp_path / "normalized" / "2026-10-18"
+        writer = get_tickets.NormalizedPageWriter(out)
+        writer(0, {"issues": [RAW_ISSUE]})
+        writer.close()
+
+        page = tmp_path / "page_0.json"
+        page.write_text(json.dumps({"issues": [RAW_ISSUE]}))
+        normalize_tickets = importlib.import_module("normalize_tickets")
+        normalize_tickets.process_file(page, output_dir=str(tmp_path / "classic"))
+        assert (out / "DO-1.json").read_text() == (tmp_path / "classic" / "DO-1.json").read_text()
+        assert writer.tickets == 1
+
+    def test_raw_archive_is_gzip_json_lines(self, tmp_path, capsys):
+        raw = tmp_path / "raw" / "issues.jsonl.gz"
+        writer = get_tickets.NormalizedPageWriter(tmp_path / "out", raw_archive=raw)
+        writer(0, {"issues": [RAW_ISSUE, dict(RAW_ISSUE, key="DO-2")]})
+        writer.close()
+        writer.close()
+
+        with gzip.open(raw, "rt", encoding="utf-8") as fh:
+            lines = [json.loads(line) for line in fh]
+        assert [i["key"] for i in lines] == ["DO-1", "DO-2"]
+        assert lines[0]["fields"]["customfield_99999"] == "unused"
+        out = capsys.readouterr().out
+        assert "Normalized 2 ticket(s)" in out
+        assert f"Raw issues archived to {raw}" in out
+
+    def test_archives_existing_output(self, tmp_path, monkeypatch):
+        normalize_tickets = importlib.import_module("normalize_tickets")
+        monkeypatch.setattr(normalize_tickets, "SCRIPT_DIR", tmp_path)
+        out = tmp_path / "2026-10-18"
+        out.mkdir()
+        (out / "OLD-1.json").write_text("{}")
+
+        get_tickets.NormalizedPageWriter(out, force=True).close()
+
+        assert not (out / "OLD-1.json").exists()
+        assert list(tmp_path.glob("2026-10-18_*.zip"))
+
+
+class TestFetchSearchNormalize:
+    def test_pages_stream_through_writer(self, tmp_path, monkeypatch):
+        raw_dir = tmp_path / "tickets-json"
+        raw_dir.mkdir()
+        (raw_dir / "keep.json").write_text("{}")
+        monkeypatch.setattr(get_tickets, "OUTPUT_DIR", raw_dir)
+        issues = [dict(RAW_ISSUE, key=f"DO-{i}") for i in range(230)]
+
+        def fake_get(url, **kwargs):
+            params = kwargs["params"]
+            page = issues[params["startAt"]:params["startAt"] + params["maxResults"]]
+            return MagicMock(status_code=200, json=MagicMock(
+                return_value={"issues": page, "total": len(issues)}))
+
+        monkeypatch.setattr(get_tickets.requests, "get", fake_get)
+        out = tmp_path / "normalized"
+        writer = get_tickets.NormalizedPageWriter(out)
+
+        fetch_search(concurrency=2, write_page=writer)
+
+        assert writer.tickets == 230
+        assert len(list(out.glob("DO-*.json"))) == 230
+        assert sorted(p.name for p in raw_dir.iterdir()) == ["keep.json"]
+
+    def test_main_fused_mode(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(get_tickets, "OUTPUT_DIR", tmp_path / "tickets-json")
+        responses = iter([{"issues": [RAW_ISSUE], "total": 1}, {"issues": [], "total": 1}])
+        monkeypatch.setattr(get_tickets.requests, "get", lambda *a, **kw: MagicMock(
+            status_code=200, json=MagicMock(return_value=next(responses))))
+        out = tmp_path / "normalized"
+        raw = tmp_path / "raw.jsonl.gz"
+
+        get_tickets.main(["-a", "--normalize", "--normalized-dir", str(out),
+                          "--raw-archive", str(raw), "-y"])
+
+        data = json.loads((out / "DO-1.json").read_text())
+        assert data["labels"] == ["Compute"]
+        with gzip.open(raw, "rt") as fh:
+            assert json.loads(fh.readline())["key"] == "DO-1"
+        assert not (tmp_path / "tickets-json").exists()
+
+
+class TestNormalizeArgs:
+    def test_default_output_dir_is_dated(self):
+        normalize_tickets = importlib.import_module("normalize_tickets")
+        args = parse_args(["-a", "--normalize"])
+        assert Path(args.normalized_dir).parent == normalize_tickets.DEFAULT_OUTPUT_DIR
+
+    @pytest.mark.parametrize("argv, message", [
+        (["-t", "DO-1", "--normalize"], "--normalize requires -a/--all"),
+        (["-a", "--normalize", "--sync"], "cannot be combined"),
+        (["-a", "--normalize", "--number-of-tickets", "3"], "cannot be combined"),
+        (["-a", "--raw-archive", "x.gz"], "require --normalize"),
+    ])
+    def test_invalid_combinations(self, argv, message, capsys):
+        with pytest.raises(SystemExit):
+            parse_args(argv)
+        assert message in capsys.readouterr().err
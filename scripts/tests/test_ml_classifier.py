@@ -1,9 +1,16 @@
 """Tests for ml_classifier.py"""
 
 import json
+import random
 from pathlib import Path
+from unittest.mock import MagicMock
 
+import numpy as np
 import pytest
+from joblib.externals.loky import get_reusable_executor
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.model_selection import ParameterGrid, cross_val_score
+from sklearn.pipeline import Pipeline
 
 import ml_classifier as mc
 
@@ -93,7 +100,7 @@ class TestBuildFeatureText:
 class TestBuildPipeline:
     def test_returns_pipeline(self):
         pipeline = mc.build_pipeline()
-        assert isinstance(pipeline, mc.Pipeline)
+        assert isinstance(pipeline, Pipeline)
 
     def test_has_tfidf_and_classifier(self):
         pipeline = mc.build_pipeline()
@@ -142,6 +149,205 @@ class TestTrainModel:
         assert metrics["cv_accuracy"] == -1.0
 
 
+def _make_corpus(n=90, seed=0):
+    """Noisy texts over a shared vocabulary, with duplicates."""
+    rng = random.Random(seed)
+    words = [f"w{i}" for i in range(120)] + ["gpu", "network", "disk", "the", "and"]
+    classes = {"GPU": words[:40], "NET": words[40:80], "DISK": words[80:]}
+    texts, labels = [], []
+    for i in range(n):
+        label = list(classes)[i % 3]
+        vocab = classes[label] if rng.random() < 0.7 else words
+        texts.append(" ".join(rng.choices(vocab, k=rng.randint(5, 30))))
+        labels.append(label)
+    texts[5] = texts[8] = texts[2]
+    return texts, labels
+
+
+def _reference_train(texts, labels):
+    """train_model before term counts were shared across fits."""
+    pipeline = mc.build_pipeline()
+    if len(texts) < mc.SMALL_DATASET_SAMPLES:
+        pipeline.set_params(tfidf__min_df=1)
+    n_folds = min(3, min(labels.count(c) for c in set(labels)))
+    cv = float(cross_val_score(pipeline, texts, labels, cv=n_folds).mean())
+    pipeline.fit(texts, labels)
+    return pipeline, round(cv, 4)
+
+
+class TestTrainModelFromCounts:
+    @pytest.mark.parametrize("n, max_features", [(90, 40), (90, 5000), (30, 25)])
+    def test_matches_pipeline_fit(self, monkeypatch, n, max_features):
+        monkeypatch.setitem(mc.TFIDF_PARAMS, "max_features", max_features)
+        texts, labels = _make_corpus(n)
+        expected, expected_cv = _reference_train(texts, labels)
+        pipeline, metrics = mc.train_model(texts, labels)
+
+        assert metrics["cv_accuracy"] == expected_cv
+        tfidf, ref_tfidf = pipeline.named_steps["tfidf"], expected.named_steps["tfidf"]
+        assert tfidf.vocabulary_ == ref_tfidf.vocabulary_
+        assert np.allclose(tfidf.idf_, ref_tfidf.idf_)
+        probe = texts + ["gpu w3 unseen words", ""]
+        assert np.allclose(pipeline.predict_proba(probe), expected.predict_proba(probe))
+        assert list(pipeline.predict(probe)) == list(expected.predict(probe))
+
+    def test_params_match_pipeline_fit(self):
+        texts, labels = _make_corpus()
+        params = {"tfidf__ngram_range": (1, 1), "tfidf__max_features": 30,
+                  "tfidf__min_df": 3, "clf__alpha": 1e-3}
+        expected = mc.build_pipeline().set_params(**params).fit(texts, labels)
+        pipeline, metrics = mc.train_model(texts, labels, params=params)
+        assert pipeline.named_steps["tfidf"].vocabulary_ == expected.named_steps["tfidf"].vocabulary_
+        assert np.allclose(pipeline.predict_proba(texts), expected.predict_proba(texts))
+        assert metrics["params"]["tfidf__ngram_range"] == (1, 1)
+        assert metrics["params"]["clf__alpha"] == 1e-3
+        assert metrics["params"]["clf__loss"] == "modified_huber"
+
+    def test_feature_cache_skips_tokenizing(self, tmp_path, monkeypatch):
+        texts, labels = _make_corpus()
+        first, _ = mc.train_model(texts, labels, feature_cache=tmp_path)
+        assert len(list(tmp_path.glob("*.npz"))) == 1
+
+        # Same corpus, relabeled and reordered: no tokenizing at all
+        count_terms = MagicMock(side_effect=AssertionError("texts were tokenized again"))
+        monkeypatch.setattr(mc, "count_terms", count_terms)
+        order = list(range(len(texts)))[::-1]
+        relabeled = ["GPU" if i % 2 else labels[i] for i in order]
+        pipeline, _ = mc.train_model([texts[i] for i in order], relabeled,
+                                     feature_cache=tmp_path)
+        expected, _ = _reference_train([texts[i] for i in order], relabeled)
+        assert np.allclose(pipeline.predict_proba(texts), expected.predict_proba(texts))
+        count_terms.assert_not_called()
+
+    def test_feature_cache_keeps_recent_entries(self, tmp_path):
+        texts, labels = _make_corpus(30)
+        for i in range(mc.FEATURE_CACHE_ENTRIES + 2):
+            mc.cached_term_counts(texts + [f"extra text {i}"], tmp_path)
+        assert len(list(tmp_path.glob("*.npz"))) == mc.FEATURE_CACHE_ENTRIES
+
+    def test_no_terms_left(self):
+        counts, _ = mc.count_terms(["alpha beta", "gamma delta"])
+        with pytest.raises(ValueError, match="no terms remain"):
+            mc.fit_tfidf(counts, min_df=2)
+
+
+SMALL_GRID = {"tfidf__ngram_range": [(1, 1), (1, 2)], "clf__alpha": [1e-4, 1e-2]}
+
+
+class TestSearchParams:
+    def test_results_per_candidate(self):
+        texts, labels = _make_corpus()
+        results = mc.search_params(texts, labels, grid=SMALL_GRID, n_jobs=1)
+        assert [r["params"] for r in results] == list(ParameterGrid(SMALL_GRID))
+        for result in results:
+            assert 0 <= result["cv_accuracy"] <= 1
+            assert result["fit_ms"] > 0 and result["latency_ms"] > 0
+        # Same folds and fits as train_model
+        _, metrics = mc.train_model(texts, labels, params=results[0]["params"])
+        assert results[0]["cv_accuracy"] == metrics["cv_accuracy"]
+
+    def test_parallel_matches_serial(self):
+        texts, labels = _make_corpus(60)
+        serial = mc.search_params(texts, labels, grid=SMALL_GRID, n_jobs=1)
+        parallel = mc.search_params(texts, labels, grid=SMALL_GRID, n_jobs=2)
+        # Stop loky's worker threads so later tests can fork safely
+        get_reusable_executor().shutdown(wait=True)
+        assert [r["cv_accuracy"] for r in serial] == [r["cv_accuracy"] for r in parallel]
+
+    def test_latency_timed_serially_after_fits(self, monkeypatch):
+        texts, labels = _make_corpus(60)
+        timed = []
+        monkeypatch.setattr(mc, "inference_latency",
+                            lambda pipeline, sample: timed.append((pipeline, sample)) or 0.001)
+        results = mc.search_params(texts, labels, grid=SMALL_GRID, n_jobs=1)
+        assert len(timed) == len(results)
+        assert all(isinstance(pipeline, Pipeline) for pipeline, _ in timed)
+        assert all(r["latency_ms"] == 1.0 for r in results)
+
+    def test_inference_latency_takes_fastest_run(self, monkeypatch):
+        clock = iter([0.0, 4.0, 10.0, 11.0, 20.0, 23.0])
+        monkeypatch.setattr(mc.time, "perf_counter", lambda: next(clock))
+        assert mc.inference_latency(MagicMock(), ["a", "b"]) == 0.5
+
+    def test_needs_two_samples_per_class(self):
+        texts, labels = _make_corpus(30)
+        with pytest.raises(ValueError, match="every class"):
+            mc.search_params(texts, labels[:-1] + ["single"], grid=SMALL_GRID, n_jobs=1)
+
+    def test_choose_params(self):
+        results = [
+            {"params": "a", "cv_accuracy": 0.9, "fit_ms": 5.0, "latency_ms": 3.0},
+            {"params": "b", "cv_accuracy": 0.8, "fit_ms": 1.0, "latency_ms": 0.5},
+            {"params": "c", "cv_accuracy": 0.8, "fit_ms": 1.0, "latency_ms": 0.4},
+        ]
+        assert mc.choose_params(results, 5.0) == (results[0], True)
+        assert mc.choose_params(results, 1.0) == (results[2], True)
+        assert mc.choose_params(results, 0.1) == (results[2], False)
+
+    def test_rejects_unsupported_params(self):
+        with pytest.raises(ValueError, match="Unsupported parameter"):
+            mc.split_params({"tfidf__lowercase": False})
+        with pytest.raises(ValueError, match="Unsupported ngram_range"):
+            mc.ngram_columns(np.array(["a"]), (1, 3))
+
+
+# ---------------------------------------------------------------------------
+# hashing family and partial_update
+# ---------------------------------------------------------------------------
+
+class TestHashingFamily:
+    def test_hash_counts_match_hashing_vectorizer(self):
+        texts, _ = _make_corpus(30)
+        counts, terms = mc.count_terms(texts)
+        expected = HashingVectorizer(**mc.HASHING_PARAMS).transform(texts)
+        assert abs(mc.hash_counts(counts, terms) - expected).sum() == 0
+
+    def test_matches_pipeline_fit(self):
+        texts, labels = _make_corpus()
+        expected = mc.build_hashing_pipeline(mc.balanced_class_weight(labels))
+        expected.fit(texts, labels)
+        pipeline, metrics = mc.train_model(texts, labels, family="hashing")
+        probe = texts + ["gpu w3 unseen words", ""]
+        assert np.allclose(pipeline.predict_proba(probe), expected.predict_proba(probe))
+        assert metrics["cv_accuracy"] >= 0.0
+        assert metrics["params"]["hash__n_features"] == mc.HASHING_PARAMS["n_features"]
+        assert "tfidf__min_df" not in metrics["params"]
+
+    def test_balanced_class_weight(self):
+        weights = mc.balanced_class_weight(["a", "a", "a", "b"])
+        assert weights == pytest.approx({"a": 4 / 6, "b": 2.0})
+
+    @pytest.mark.parametrize("family, params, match", [
+        ("bogus", None, "Unknown model family"),
+        ("hashing", {"tfidf__min_df": 1}, "tfidf family only"),
+    ])
+    def test_rejects(self, family, params, match):
+        texts, labels = _make_corpus(30)
+        with pytest.raises(ValueError, match=match):
+            mc.train_model(texts, labels, params=params, family=family)
+
+    def test_partial_update_learns_new_rows(self):
+        texts, labels = _make_corpus()
+        pipeline, _ = mc.train_model(texts, labels, family="hashing")
+        idf = pipeline.named_steps["tfidf"].idf_.copy()
+        new_texts = ["zzfirmware zzbmc"] * 5
+        before = pipeline.predict_proba(new_texts)[:, 0]
+        for _ in range(5):
+            mc.partial_update(pipeline, new_texts, ["DISK"] * 5)
+        assert list(pipeline.predict(new_texts)) == ["DISK"] * 5
+        assert (pipeline.predict_proba(new_texts)[:, 0] > before).all()
+        assert np.array_equal(pipeline.named_steps["tfidf"].idf_, idf)
+
+    def test_partial_update_rejects(self):
+        texts, labels = _make_corpus(30)
+        tfidf_pipeline, _ = mc.train_model(texts, labels)
+        with pytest.raises(ValueError, match="Only hashing-family"):
+            mc.partial_update(tfidf_pipeline, texts[:1], labels[:1])
+        pipeline, _ = mc.train_model(texts, labels, family="hashing")
+        with pytest.raises(ValueError, match="full retrain: MEM"):
+            mc.partial_update(pipeline, ["dimm"], ["MEM"])
+
+
 # ---------------------------------------------------------------------------
 # save_model / load_model
 # ---------------------------------------------------------------------------
@@ -165,6 +371,26 @@ class TestSaveAndLoadModel:
         proba = loaded_pipeline.predict_proba(["gpu memory error"])
         assert proba.shape[1] == 3
 
+    def test_loads_compiled_arrays_by_default(self, tmp_path):
+        texts, labels = _make_training_data(n_per_class=10)
+        pipeline, _ = mc.train_model(texts, labels)
+        model_path = tmp_path / "classifier.joblib"
+        mc.save_model(pipeline, {}, model_path, tmp_path / "map.json")
+        assert (tmp_path / "classifier.joblib.arrays" / "model.json").is_file()
+
+        compiled, _ = mc.load_model(model_path, tmp_path / "map.json")
+        assert isinstance(compiled, mc.ml_inference.CompiledModel)
+        loaded, _ = mc.load_model(model_path, tmp_path / "map.json", compiled=False)
+        assert isinstance(loaded, Pipeline)
+        assert np.allclose(compiled.predict_proba(texts), loaded.predict_proba(texts))
+
+    def test_unfitted_pipeline_has_no_arrays(self, tmp_path):
+        model_path = tmp_path / "classifier.joblib"
+        mc.save_model(mc.build_pipeline(), {}, model_path, tmp_path / "map.json")
+        assert not (tmp_path / "classifier.joblib.arrays").exists()
+        loaded, _ = mc.load_model(model_path, tmp_path / "map.json")
+        assert isinstance(loaded, Pipeline)
+
     def test_load_missing_model_raises(self, tmp_path):
         map_path = tmp_path / "category_map.json"
         map_path.write_text("{}")
@@ -195,6 +421,45 @@ class TestSaveAndLoadModel:
         assert model_path.is_file()
         assert map_path.is_file()
 
+    def test_term_index_side_file(self, tmp_path):
+        texts, labels = _make_corpus()
+        pipeline, metrics = mc.train_model(texts, labels, family="hashing")
+        model_path = tmp_path / "classifier.joblib"
+        mc.save_model(pipeline, {}, model_path, tmp_path / "map.json",
+                      term_index=metrics["term_index"])
+        index = mc.load_term_index(model_path)
+        assert np.array_equal(index.buckets, metrics["term_index"].buckets)
+        assert index.terms == metrics["term_index"].terms
+        assert "gpu" in index.column_terms(mc.hash_buckets(["gpu"])[0])
+
+        # Retrained as another family: the stale index goes
+        mc.save_model(mc.build_pipeline(), {}, model_path, tmp_path / "map.json")
+        assert mc.load_term_index(model_path) is None
+
+    def test_empty_term_index(self, tmp_path):
+        mc.save_term_index(tmp_path / "m.joblib.terms.npz", mc.build_term_index([]))
+        index = mc.load_term_index(tmp_path / "m.joblib")
+        assert len(index.buckets) == 0 and index.terms == []
+
+    def test_extend_term_index(self):
+        index = mc.extend_term_index(None, ["gpu fault"])
+        assert sorted(index.terms) == ["fault", "gpu", "gpu fault"]
+        index = mc.extend_term_index(index, ["gpu fell", "the"])
+        assert sorted(index.terms) == ["fault", "fell", "gpu", "gpu fault", "gpu fell"]
+        assert list(index.buckets) == sorted(index.buckets)
+
+    def test_hashing_model_size_independent_of_vocabulary(self, tmp_path):
+        sizes = []
+        for n_words in (200, 5000):
+            rng = random.Random(0)
+            words = [f"w{i}" for i in range(n_words)]
+            texts = [" ".join(rng.choices(words, k=50)) for _ in range(60)]
+            pipeline, _ = mc.train_model(texts, ["A", "B", "C"] * 20, family="hashing")
+            path = tmp_path / f"{n_words}.joblib"
+            mc.save_model(pipeline, {}, path, tmp_path / "map.json")
+            sizes.append(path.stat().st_size)
+        assert sizes[0] == sizes[1]
+
 
 # ---------------------------------------------------------------------------
 # predict
@@ -250,6 +515,43 @@ class TestPredict:
         assert category == "GPU"
 
 
+# ---------------------------------------------------------------------------
+# predict_batch
+# ---------------------------------------------------------------------------
+
+class TestPredictBatch:
+    @pytest.fixture()
+    def trained_model(self):
+        texts, labels = _make_training_data(n_per_class=10)
+        pipeline, _ = mc.train_model(texts, labels)
+        category_map = {"GPU Failure": "GPU", "Network Issue": "NET"}
+        return pipeline, category_map
+
+    def test_matches_per_ticket_predict(self, trained_model):
+        pipeline, category_map = trained_model
+        tickets = [
+            _make_ticket(summary="gpu hardware fault memory error"),
+            _make_ticket(summary="", description=""),
+            _make_ticket(summary="network switch link down"),
+            _make_ticket(summary="raid disk mount failure"),
+            _make_ticket(summary="something unrelated entirely"),
+        ]
+        expected = [mc.predict(pipeline, category_map, t) for t in tickets]
+        assert mc.predict_batch(pipeline, category_map, tickets,
+                                batch_size=2) == expected
+
+    def test_empty_text_not_sent_to_model(self, trained_model):
+        pipeline, category_map = trained_model
+        tickets = [_make_ticket(summary="", description="")]
+        assert mc.predict_batch(pipeline, category_map, tickets) == [
+            ("uncategorized", "unknown", 0.0),
+        ]
+
+    def test_empty_input(self, trained_model):
+        pipeline, category_map = trained_model
+        assert mc.predict_batch(pipeline, category_map, []) == []
+
+
 # ---------------------------------------------------------------------------
 # extract_top_terms
 # ---------------------------------------------------------------------------
@@ -272,6 +574,61 @@ class TestExtractTopTerms:
             trained_pipeline, "zzzxxyy qqqwww vvvnnn", n=5)
         assert terms == []
 
+    def test_hashing_family(self):
+        texts, labels = _make_training_data(n_per_class=10)
+        pipeline, metrics = mc.train_model(texts, labels, family="hashing")
+        index = metrics["term_index"]
+        assert mc.extract_top_terms(pipeline, "gpu hardware fault") == []
+        terms = mc.extract_top_terms(pipeline, "gpu hardware zzzxxyy fault", n=3,
+                                     term_index=index)
+        assert 1 <= len(terms) <= 3
+        assert "zzzxxyy" not in {term for term, _score in terms}
+        assert all(score > 0 for _term, score in terms)
+        assert mc.extract_top_terms(pipeline, "zzzxxyy qqqwww", n=5, term_index=index) == []
+        assert mc.extract_top_terms(pipeline, "the and", n=5, term_index=index) == []
+
+    def test_hashing_names_colliding_column_by_text(self):
+        texts, labels = _make_training_data(n_per_class=10)
+        pipeline, _ = mc.train_model(texts, labels, family="hashing")
+        column = mc.hash_buckets(["gpu"])[0]
+        # Another training term in the same column: the one in the text is named
+        index = mc.TermIndex(np.array([column, column], dtype=np.int32), ["zzcollide", "gpu"])
+        terms = mc.extract_top_terms(pipeline, "gpu hardware", term_index=index)
+        assert [term for term, _score in terms] == ["gpu"]
+
+    @pytest.mark.parametrize("family", mc.MODEL_FAMILIES)
+    def test_compiled_model_matches_pipeline(self, family, tmp_path):
+        texts, labels = _make_training_data(n_per_class=10)
+        pipeline, metrics = mc.train_model(texts, labels, family=family)
+        model_path = tmp_path / "classifier.joblib"
+        mc.save_model(pipeline, {}, model_path, tmp_path / "map.json")
+        compiled, _ = mc.load_model(model_path, tmp_path / "map.json")
+        index = metrics.get("term_index")
+        text = "gpu hardware fault memory error network"
+        got = mc.extract_top_terms(compiled, text, n=4, term_index=index)
+        expected = mc.extract_top_terms(pipeline, text, n=4, term_index=index)
+        assert got and [t for t, _s in got] == [t for t, _s in expected]
+        assert [s for _t, s in got] == pytest.approx([s for _t, s in expected])
+
+    def test_tfidf_names_built_once(self, trained_pipeline, monkeypatch):
+        tfidf = trained_pipeline.named_steps["tfidf"]
+        calls = MagicMock(wraps=tfidf.get_feature_names_out)
+        monkeypatch.setattr(tfidf, "get_feature_names_out", calls)
+        for _ in range(3):
+            mc.extract_top_terms(trained_pipeline, "gpu hardware fault")
+        assert calls.call_count <= 1
+
+    def test_matches_dense_ranking(self, trained_pipeline):
+        text = "gpu hardware fault memory error network"
+        tfidf = trained_pipeline.named_steps["tfidf"]
+        scores = tfidf.transform([text]).toarray()[0]
+        names = tfidf.get_feature_names_out()
+        expected = sorted(((names[i], scores[i]) for i in np.flatnonzero(scores)),
+                          key=lambda item: -item[1])
+        got = mc.extract_top_terms(trained_pipeline, text, n=len(expected))
+        assert [score for _t, score in got] == pytest.approx([s for _t, s in expected])
+        assert {t for t, _s in got} == {t for t, _s in expected}
+
 
 # ---------------------------------------------------------------------------
 # Constants
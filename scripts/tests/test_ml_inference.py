@@ -0,0 +1,174 @@
+"""Tests for ml_inference.py."""
+
+import importlib
+import json
+import os
+import pickle
+import random
+import subprocess
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import SGDClassifier
+from sklearn.pipeline import Pipeline
+from sklearn.utils import murmurhash3_32
+
+mi = importlib.import_module("ml_inference")
+mc = importlib.import_module("ml_classifier")
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+
+TEXTS = [
+    "", "the and of", "GPU hardware fault", "gpu gpu gpu memory error",
+    "network switch port flapping", "raid disk failure on node-12 ÄÖ ünïcödé",
+]
+
+
+def _training_data(classes=3, per_class=10):
+    rng = random.Random(0)
+    words = {
+        "gpu": "gpu hardware fault graphics card memory error",
+        "net": "network connectivity switch router cable link",
+        "disk": "storage disk drive raid filesystem mount failure",
+    }
+    texts, labels = [], []
+    for label, base in list(words.items())[:classes]:
+        for i in range(per_class):
+            extra = " ".join(rng.choices(base.split(), k=4))
+            texts.append(f"{base} {extra} ticket {i}")
+            labels.append(label)
+    return texts, labels
+
+
+def _saved(tmp_path, family="tfidf", classes=3):
+    texts, labels = _training_data(classes)
+    pipeline, _ = mc.train_model(texts, labels, family=family)
+    model_path = tmp_path / "classifier.joblib"
+    mc.save_model(pipeline, {}, model_path, tmp_path / "map.json")
+    return pipeline, model_path
+
+
+class TestMurmurhash:
+    def test_matches_sklearn(self):
+        rng = random.Random(1)
+        alphabet = "abcxyz0123 -_é€😀"
+        terms = ["", "a", "gpu fault"] + [
+            "".join(rng.choices(alphabet, k=rng.randint(0, 15))) for _ in range(500)]
+        expected = [murmurhash3_32(term.encode("utf-8"), positive=False) for term in terms]
+        assert mi.murmurhash3_32(terms).tolist() == expected
+
+    def test_empty(self):
+        assert len(mi.murmurhash3_32([])) == 0
+
+
+class TestCompiledModel:
+    @pytest.mark.parametrize("family", mc.MODEL_FAMILIES)
+    @pytest.mark.parametrize("classes", [2, 3])
+    def test_matches_pipeline(self, tmp_path, family, classes):
+        pipeline, model_path = _saved(tmp_path, family, classes)
+        compiled = mi.load_compiled(model_path)
+        assert compiled.family == family
+        assert list(compiled.classes_) == list(pipeline.classes_)
+        texts = TEXTS + _training_data(classes)[0]
+        assert np.allclose(compiled.predict_proba(texts), pipeline.predict_proba(texts),
+                           rtol=0, atol=1e-12)
+
+    def test_arrays_are_memory_mapped(self, tmp_path):
+        _pipeline, model_path = _saved(tmp_path)
+        compiled = mi.load_compiled(model_path)
+        assert isinstance(compiled.coef, np.memmap)
+
+    def test_pickles_by_path(self, tmp_path):
+        pipeline, model_path = _saved(tmp_path, "hashing")
+        payload = pickle.dumps(mi.load_compiled(model_path))
+        assert len(payload) < 1000
+        restored = pickle.loads(payload)
+        assert np.allclose(restored.predict_proba(TEXTS), pipeline.predict_proba(TEXTS))
+
+    def test_bucket_cache_is_bounded(self, tmp_path, monkeypatch):
+        pipeline, model_path = _saved(tmp_path, "hashing")
+        compiled = mi.load_compiled(model_path)
+        monkeypatch.setattr(mi, "BUCKET_CACHE_SIZE", 5)
+        compiled.predict_proba(["gpu fault"])
+        assert len(compiled._buckets) == 3
+        proba = compiled.predict_proba(["network switch port flapping"])
+        assert len(compiled._buckets) <= 7
+        assert np.allclose(proba, pipeline.predict_proba(["network switch port flapping"]))
+
+
+class TestSaveArrays:
+    def test_unsupported_pipelines(self, tmp_path):
+        texts, labels = _training_data()
+        hinge = Pipeline([("tfidf", TfidfVectorizer()), ("clf", SGDClassifier())])
+        char = Pipeline([("tfidf", TfidfVectorizer(analyzer="char")),
+                         ("clf", SGDClassifier(loss="modified_huber"))])
+        for pipeline in (mc.build_pipeline(), hinge.fit(texts, labels),
+                         char.fit(texts, labels)):
+            assert mi.compile_pipeline(pipeline) is None
+
+        hashing = mc.build_hashing_pipeline().fit(texts, labels)
+        hashing.named_steps["hash"].set_params(alternate_sign=True)
+        assert mi.compile_pipeline(hashing) is None
+
+    def test_stale_arrays_removed(self, tmp_path):
+        _pipeline, model_path = _saved(tmp_path)
+        assert mi.arrays_path(model_path).is_dir()
+        assert mi.save_arrays(mc.build_pipeline(), model_path) is False
+        assert not mi.arrays_path(model_path).exists()
+        assert mi.load_compiled(model_path) is None
+
+    def test_replaced_model_file_ignored(self, tmp_path, capsys):
+        _pipeline, model_path = _saved(tmp_path)
+        model_path.write_bytes(model_path.read_bytes() + b"\0")
+        assert mi.load_compiled(model_path) is None
+        assert "not exported from" in capsys.readouterr().err
+
+    def test_unchanged_model_file_not_rehashed(self, tmp_path, monkeypatch):
+        _pipeline, model_path = _saved(tmp_path)
+        monkeypatch.setattr(mi, "file_sha256", lambda _path: pytest.fail("rehashed"))
+        assert mi.load_compiled(model_path) is not None
+
+    def test_copied_model_file_matched_by_content(self, tmp_path):
+        _pipeline, model_path = _saved(tmp_path)
+        stat = model_path.stat()
+        os.utime(model_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        assert mi.load_compiled(model_path) is not None
+
+        # Same size and a new mtime, different bytes
+        data = bytearray(model_path.read_bytes())
+        data[-1] ^= 0xFF
+        model_path.write_bytes(bytes(data))
+        assert mi.load_compiled(model_path) is None
+
+    def test_format_version_checked(self, tmp_path):
+        _pipeline, model_path = _saved(tmp_path)
+        meta_path = mi.arrays_path(model_path) / "model.json"
+        meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        meta_path.write_text(json.dumps(dict(meta, format=0)), encoding="utf-8")
+        assert mi.load_compiled(model_path) is None
+
+
+class TestMain:
+    def test_reports_load(self, tmp_path, capsys):
+        _pipeline, model_path = _saved(tmp_path, "hashing")
+        mi.main([str(model_path)])
+        assert "Loaded hashing model (3 classes)" in capsys.readouterr().out
+
+    def test_missing_arrays(self, tmp_path):
+        with pytest.raises(SystemExit, match="No compiled arrays"):
+            mi.main([str(tmp_path / "classifier.joblib")])
+
+    def test_scoring_does_not_import_sklearn(self, tmp_path):
+        _pipeline, model_path = _saved(tmp_path)
+        code = (
+            "import sys, ml_classifier as mc\n"
+            f"model, _ = mc.load_model({str(model_path)!r}, {str(tmp_path / 'map.json')!r})\n"
+            "model.predict_proba(['gpu fault'])\n"
+            "print(any(m.split('.')[0] in ('sklearn', 'scipy', 'joblib') for m in sys.modules))\n"
+        )
+        result = subprocess.run([sys.executable, "-c", code], cwd=SCRIPTS_DIR,
+                                capture_output=True, text=True, check=True)
+        assert result.stdout.strip() == "False"
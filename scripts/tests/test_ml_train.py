@@ -7,6 +7,7 @@ from unittest.mock import patch
 
 import pytest
 
+import ml_classifier
 import ml_train
 
 
@@ -380,6 +381,69 @@ class TestMain:
         assert "Training model on" in output
         assert "Model saved to" in output
 
+    def test_feature_cache_next_to_model(self, tmp_path):
+        argv, model_path, _, _ = _setup_training_env(tmp_path, n_per_class=10)
+        ml_train.main(argv)
+        assert len(list((model_path.parent / "feature-cache").glob("*.npz"))) == 1
+
+        custom = tmp_path / "custom-cache"
+        ml_train.main(argv + ["--feature-cache", str(custom)])
+        assert len(list(custom.glob("*.npz"))) == 1
+
+        with patch("ml_classifier.cached_term_counts",
+                   wraps=ml_classifier.cached_term_counts) as counts:
+            ml_train.main(argv + ["--no-feature-cache"])
+        assert counts.call_args.args[1] is None
+
+    def test_search_records_choice_in_report(self, tmp_path, capsys, monkeypatch):
+        monkeypatch.setattr(ml_classifier, "SEARCH_GRID",
+                            {"tfidf__min_df": [1, 2], "clf__alpha": [1e-4, 1e-2]})
+        argv, _, _, report_path = _setup_training_env(tmp_path, n_per_class=10)
+        ml_train.main(argv + ["--search", "--search-jobs", "1"])
+        out = capsys.readouterr().out
+        assert "4 candidate(s); chose" in out
+        report = report_path.read_text(encoding="utf-8")
+        assert "Parameter search (latency budget 5.0 ms/ticket)" in report
+        assert sum(line.startswith("*") for line in report.splitlines()) == 1
+        chosen = out.split("chose ")[1].splitlines()[0]
+        configuration = report.split("Configuration: ")[1].splitlines()[0]
+        for pair in chosen.split(", "):
+            assert pair in configuration
+
+        ml_train.main(argv + ["--search", "--search-jobs", "1",
+                              "--latency-budget-ms", "0"])
+        assert "no candidate within 0.0 ms/ticket" in capsys.readouterr().out
+        assert "none within budget" in report_path.read_text(encoding="utf-8")
+
+    def test_hashing_family(self, tmp_path):
+        argv, model_path, _, report_path = _setup_training_env(tmp_path, n_per_class=10)
+        ml_train.main(argv + ["--model-family", "hashing"])
+        assert "Model family: hashing" in report_path.read_text(encoding="utf-8")
+        index = ml_classifier.load_term_index(model_path)
+        assert "gpu" in index.terms
+
+        ml_train.main(argv)
+        assert "Model family: tfidf" in report_path.read_text(encoding="utf-8")
+        assert ml_classifier.load_term_index(model_path) is None
+
+    @pytest.mark.parametrize("flags, message", [
+        (["--incremental", "--model-family", "tfidf"], "--incremental needs"),
+        (["--search", "--model-family", "hashing"], "--search applies to"),
+    ])
+    def test_family_conflicts(self, tmp_path, flags, message):
+        argv, _, _, _ = _setup_training_env(tmp_path, n_per_class=10)
+        with pytest.raises(SystemExit, match=message):
+            ml_train.main(argv + flags)
+
+    def test_search_without_cv_exits(self, tmp_path):
+        argv, _, _, _ = _setup_training_env(tmp_path, n_per_class=10)
+        training_csv = Path(argv[1])
+        rows = list(csv.DictReader(training_csv.open(encoding="utf-8")))
+        rows[-1]["Category of Issue"] = "Singleton"
+        _write_training_csv(training_csv, rows)
+        with pytest.raises(SystemExit, match="Parameter search failed"):
+            ml_train.main(argv + ["--search"])
+
     def test_insufficient_data_exits(self, tmp_path):
         training_csv = tmp_path / "training.csv"
         _write_training_csv(training_csv, [
@@ -488,3 +552,124 @@ class TestMain:
         ml_train.main(argv)
         output = capsys.readouterr().out
         assert "WARNING: class 'Rare Issue' has only 1 sample" in output
+
+
+# ---------------------------------------------------------------------------
+# --incremental
+# ---------------------------------------------------------------------------
+
+def _row(ticket, label):
+    return {"Ticket": ticket, "Category of Issue": label, "Category": ""}
+
+
+class TestPlanOnlineUpdate:
+    STATE = {"updates": 0, "labels": {"DO-1": "GPU", "DO-2": "NET"}}
+
+    def test_no_state(self):
+        rows = [_row("DO-1", "GPU")]
+        assert ml_train.plan_online_update(None, rows, 20) == (
+            rows, "no incremental model yet")
+
+    def test_new_rows_of_known_classes(self):
+        rows = [_row("DO-1", "GPU"), _row("DO-2", "NET"), _row("DO-3", "NET")]
+        assert ml_train.plan_online_update(self.STATE, rows, 20) == ([rows[2]], None)
+
+    def test_up_to_date(self):
+        rows = [_row("DO-1", "GPU"), _row("DO-2", "NET")]
+        assert ml_train.plan_online_update(self.STATE, rows, 20) == ([], None)
+
+    @pytest.mark.parametrize("rows, reason", [
+        ([_row("DO-1", "GPU"), _row("DO-2", "GPU")], "1 ticket(s) relabeled"),
+        ([_row("DO-1", "GPU")], "1 ticket(s) relabeled or unlabeled"),
+        ([_row("DO-1", "GPU"), _row("DO-2", "NET"), _row("DO-3", "DISK")],
+         "new class(es): DISK"),
+    ])
+    def test_full_retrain(self, rows, reason):
+        new_rows, got = ml_train.plan_online_update(self.STATE, rows, 20)
+        assert new_rows == rows
+        assert got.startswith(reason)
+
+    def test_full_retrain_every(self):
+        state = dict(self.STATE, updates=3)
+        rows = [_row("DO-1", "GPU"), _row("DO-2", "NET"), _row("DO-3", "NET")]
+        assert ml_train.plan_online_update(state, rows, 3)[1] == (
+            "3 incremental updates since the last")
+        # Nothing to fold in: no retrain either
+        assert ml_train.plan_online_update(state, rows[:2], 3) == ([], None)
+
+
+class TestIncrementalMain:
+    def _harvested(self, tmp_path, tickets):
+        """Audited rule matches for *tickets*: ``{key: (label, summary)}``."""
+        rows = []
+        for key, (label, summary) in tickets.items():
+            _write_ticket_json(tmp_path / "tickets", key, summary=summary)
+            rows.append({"Ticket": key, "Category of Issue": label,
+                         "Category": "", "Categorization Source": "rule",
+                         "Human Audit for Accuracy": "correct"})
+        _write_categorized_csv(tmp_path / "categorized.csv", rows)
+
+    def test_full_retrain_then_updates(self, tmp_path, capsys):
+        argv, model_path, map_path, report_path = _setup_training_env(
+            tmp_path, n_per_class=10, categorized_rows=[])
+        argv += ["--incremental", "--full-retrain-every", "2"]
+        state_path = ml_train.online_state_path(model_path)
+
+        ml_train.main(argv)
+        out = capsys.readouterr().out
+        assert "Full retrain: no incremental model yet" in out
+        model, _ = ml_classifier.load_model(model_path, map_path)
+        assert model.family == "hashing"
+        state = json.loads(state_path.read_text(encoding="utf-8"))
+        assert state["updates"] == 0
+        assert len(state["labels"]) == 30
+        assert "hash__n_features" in state["params"]
+
+        ml_train.main(argv)
+        assert "Model up to date" in capsys.readouterr().out
+
+        self._harvested(tmp_path, {"DO-N0000001": ("Network Issue", "switch port down")})
+        with patch("ml_train.load_ticket_texts",
+                   wraps=ml_train.load_ticket_texts) as load:
+            ml_train.main(argv)
+        assert load.call_args.args[1] == {"DO-N0000001"}
+        out = capsys.readouterr().out
+        assert "Incremental update: 1 newly labeled ticket(s)" in out
+        assert "update 1 of 2" in out
+        report = report_path.read_text(encoding="utf-8")
+        assert "CV Accuracy: n/a (incremental update)" in report
+        assert "Training samples: 31" in report
+        state = json.loads(state_path.read_text(encoding="utf-8"))
+        assert state["updates"] == 1
+        assert state["labels"]["DO-N0000001"] == "Network Issue"
+        assert "switch port" in ml_classifier.load_term_index(model_path).terms
+        # The exported arrays follow the updated joblib file
+        model, _ = ml_classifier.load_model(model_path, map_path)
+        assert model.family == "hashing"
+
+        self._harvested(tmp_path, {"DO-N0000001": ("Network Issue", "switch port down"),
+                                   "DO-N0000002": ("GPU Failure", "gpu fell off")})
+        ml_train.main(argv)
+        assert "update 2 of 2" in capsys.readouterr().out
+
+        self._harvested(tmp_path, {"DO-N0000001": ("Network Issue", "switch port down"),
+                                   "DO-N0000002": ("GPU Failure", "gpu fell off"),
+                                   "DO-N0000003": ("GPU Failure", "xid 79")})
+        ml_train.main(argv)
+        out = capsys.readouterr().out
+        assert "Full retrain: 2 incremental updates since the last" in out
+        assert json.loads(state_path.read_text(encoding="utf-8"))["updates"] == 0
+        assert "Cross-validation accuracy" in out
+
+    def test_missing_model_or_state_retrains(self, tmp_path, capsys):
+        argv, model_path, _, _ = _setup_training_env(tmp_path, n_per_class=10)
+        ml_train.main(argv)
+        ml_train.main(argv + ["--incremental"])
+        model_path.unlink()
+        ml_train.main(argv + ["--incremental"])
+        assert capsys.readouterr().out.count("no incremental model yet") == 2
+
+    def test_search_rejected(self, tmp_path):
+        argv, _, _, _ = _setup_training_env(tmp_path, n_per_class=10)
+        with pytest.raises(SystemExit, match="--search cannot be combined"):
+            ml_train.main(argv + ["--incremental", "--search"])
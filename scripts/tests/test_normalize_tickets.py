@@ -2,6 +2,8 @@
 
 import importlib
 import json
+import random
+import re
 from pathlib import Path
 
 import pytest
@@ -29,6 +31,12 @@ load_tickets_file = normalize_tickets.load_tickets_file
 collect_ticket_keys = normalize_tickets.collect_ticket_keys
 
 
+@pytest.fixture(autouse=True)
+def _archives_to_tmp(tmp_path, monkeypatch):
+    """Keep the zips ``archive_existing`` writes out of scripts/."""
+    monkeypatch.setattr(normalize_tickets, "SCRIPT_DIR", tmp_path)
+
+
 # --- trim_date ---
 
 class TestTrimDate:
@@ -140,6 +148,60 @@ class TestCleanJiraText:
         assert clean_jira_text(text) == "a\n\nb"
 
 
+def _reference_clean_jira_text(text):
+    """The original sequential cleaner, kept as the golden reference."""
+    if not text:
+        return None
+    text = text.replace("\r\n", "\n")
+    text = text.replace("\u00a0", " ")
+    text = text.replace("\ufffd", "")
+    text = text.replace("\u2013", "-")
+    text = text.replace("\u2026", "...")
+    text = re.sub(r"[\u2580-\u259f]+", "", text)
+    text = re.sub(r"\{color(?::[^}]*)?\}", "", text)
+    text = re.sub(r"\{code(?::[^}]*)?\}", "\n", text)
+    text = re.sub(r"\{noformat\}", "\n", text)
+    text = re.sub(r"\{panel(?::[^}]*)?\}", "\n", text)
+    text = re.sub(r"\{\*\}", "", text)
+    text = re.sub(r"\[([^|\]]+)\|[^\]]+\]", r"\1", text)
+    text = re.sub(r"![^!\s]+!", "", text)
+    text = re.sub(r"^h[1-6]\.\s*", "", text, flags=re.MULTILINE)
+    text = re.sub(r"^-{4,}\s*$", "", text, flags=re.MULTILINE)
+    text = text.replace("\\\\", "\n")
+    text = re.sub(r"\|\*([^*|]+)\*\|([^|\n]*)\|", r"\1: \2", text)
+    text = re.sub(r"\|\|", " | ", text)
+    text = re.sub(r"\*\|", " ", text)
+    text = re.sub(r"\n{3,}", "\n\n", text)
+    text = "\n".join(line.rstrip() for line in text.split("\n"))
+    text = text.strip()
+    return text if text else None
+
+
+# Fragments that exercise every substitution and their interactions
+# (e.g. "{co" + "{color}" + "de}" only forms "{code}" after the first step)
+MARKUP_FRAGMENTS = [
+    "{color}", "{color:#f00}", "{co", "lor}", "de}", "{code}", "{code:java}",
+    "{noformat}", "{panel:title=x|borderColor=red}", "{panel}", "{*}", "{", "}",
+    "*", "[", "]", "|", "||", "|*", "*|", "[a|b]", "!img.png!", "!", "h1.", "h3. ",
+    "h7.", "h", "\n", "\r\n", "\r", "----", "-", " ", "\t", "\u00a0", "\ufffd",
+    "\u2013", "\u2026", "\u2588", "\u2580", "\u259f", "\\\\", "\\", "x", "Key",
+    ":", ".", "\x0b", "\u3000", "\n\n\n",
+]
+
+
+class TestCleanJiraTextGolden:
+    def test_fuzzed_markup_matches_reference(self):
+        rng = random.Random(1234)
+        for _ in range(20000):
+            text = "".join(rng.choice(MARKUP_FRAGMENTS) for _ in range(rng.randint(0, 30)))
+            assert clean_jira_text(text) == _reference_clean_jira_text(text), repr(text)
+
+    def test_real_size_bodies_match_reference(self):
+        bench = importlib.import_module("bench_normalize")
+        for name, text in bench.generate_bodies(seed=7).items():
+            assert clean_jira_text(text) == _reference_clean_jira_text(text), name
+
+
 # --- extract_option_value ---
 
 class TestExtractOptionValue:
@@ -607,6 +669,32 @@ class TestNormalizeIssue:
         assert result["labels"] == []
 
 
+class TestSourceFields:
+    def test_lists_every_field_the_extractors_read(self):
+        fields = normalize_tickets.source_fields()
+        assert len(fields) == len(set(fields))
+        for name in ("summary", "description", "comment", "labels", "issuelinks",
+                     "status", "updated", "customfield_14606", "customfield_10003"):
+            assert name in fields
+
+    def test_projected_issue_normalizes_identically(self):
+        fields = {
+            "summary": "Disk failed",
+            "description": "Replace *disk*",
+            "labels": ["Compute", "RackSerial:2551ZA8062"],
+            "customfield_14606": [{"value": "AGA"}],
+            "customfield_10003": {"ongoingCycle": {"elapsedTime": {"friendly": "5m"}}},
+            "comment": {"comments": [{"id": "1", "body": "done", "author": {"name": "a"}}]},
+            "customfield_99999": {"huge": "x" * 1000},
+            "attachment": [{"id": "9"}],
+        }
+        keep = set(normalize_tickets.source_fields())
+        projected = {k: v for k, v in fields.items() if k in keep}
+        assert "customfield_99999" not in projected
+        assert (normalize_issue({"key": "DO-1", "fields": projected})
+                == normalize_issue({"key": "DO-1", "fields": fields}))
+
+
 # --- normalize_json ---
 
 class TestNormalizeJson:
@@ -1329,3 +1417,191 @@ class TestCollectTicketKeys:
 
         keys = collect_ticket_keys([str(single), str(paginated)])
         assert keys == {"DO-1", "DO-2", "DO-3"}
+
+
+# --- --workers ---
+
+def _issue_with(key, summary):
+    issue = json.loads(json.dumps(MINIMAL_ISSUE))
+    issue["key"] = key
+    issue["fields"]["summary"] = summary
+    issue["fields"]["description"] = "h2. Log\n{code}dmesg *error*{code}\n" * 3
+    return issue
+
+
+def _write_pages(src):
+    src.mkdir()
+    for page in range(4):
+        issues = [_issue_with(f"DO-{page * 10 + i}", f"page {page}") for i in range(5)]
+        (src / f"page_{page}.json").write_text(json.dumps({"issues": issues}))
+    # DO-31 shifted between pages; the last file must win as in a serial run
+    (src / "page_4.json").write_text(json.dumps({"issues": [_issue_with("DO-31", "latest")]}))
+    (src / "page_5.json").write_text(json.dumps({"issues": [_issue_with("DO-2", "late copy")]}))
+
+
+class TestWorkers:
+    def test_pool_output_matches_serial(self, tmp_path, capsys):
+        _write_pages(tmp_path / "src")
+        outputs = {}
+        for workers in ("1", "3"):
+            dst = tmp_path / f"dst{workers}"
+            normalize_tickets.main(["--input-dir", str(tmp_path / "src"), "-o", str(dst),
+                                    "--date", "2026-01-15", "--workers", workers, "-y"])
+            out = capsys.readouterr().out
+            outputs[workers] = (
+                {p.name: p.read_text() for p in (dst / "2026-01-15").iterdir()},
+                [line.replace(str(dst), "DST") for line in out.splitlines()
+                 if "->" in line and "Took" not in line],
+            )
+
+        assert outputs["1"] == outputs["3"]
+        files = outputs["3"][0]
+        assert json.loads(files["DO-31.json"])["ticket"]["summary"] == "latest"
+        assert json.loads(files["DO-2.json"])["ticket"]["summary"] == "late copy"
+
+    def test_serial_iteration_is_lazy_and_ordered(self, tmp_path):
+        _write_pages(tmp_path / "src")
+        files = sorted(str(p) for p in (tmp_path / "src").glob("*.json"))
+        processed = normalize_tickets.iter_processed_files(
+            files, output_dir=str(tmp_path / "dst"))
+        assert [f for f, _ in processed] == files
+
+    def test_rejects_non_positive_workers(self, capsys):
+        with pytest.raises(SystemExit):
+            normalize_tickets.main(["--workers", "0"])
+        assert "--workers must be a positive integer" in capsys.readouterr().err
+
+
+# --- --incremental ---
+
+class TestIncremental:
+    def _run(self, src, dst, date, *extra):
+        normalize_tickets.main(["--input-dir", str(src), "-o", str(dst),
+                                "--date", date, "--incremental", *extra])
+
+    def test_unchanged_tickets_are_carried_forward(self, tmp_path, capsys, monkeypatch):
+        src, dst = tmp_path / "src", tmp_path / "dst"
+        _write_pages(src)
+        self._run(src, dst, "2026-01-15")
+        assert "0 unchanged ticket(s) carried forward, 20 to normalize" in capsys.readouterr().out
+        manifest = json.loads((dst / normalize_tickets.MANIFEST_NAME).read_text())["tickets"]
+        assert manifest["DO-31"]["path"] == "2026-01-15/DO-31.json"
+
+        # Only DO-0 changes; page_0 is the only file renormalized
+        issues = json.loads((src / "page_0.json").read_text())["issues"]
+        issues[0]["fields"]["summary"] = "edited"
+        (src / "page_0.json").write_text(json.dumps({"issues": issues}))
+        processed = []
+        real = normalize_tickets.iter_processed_files
+        monkeypatch.setattr(normalize_tickets, "iter_processed_files",
+                            lambda files, **kw: processed.extend(files) or real(files, **kw))
+        self._run(src, dst, "2026-01-16")
+        out = capsys.readouterr().out
+        assert "19 unchanged ticket(s) carried forward, 1 to normalize" in out
+        assert processed == [str(src / "page_0.json")]
+
+        new_dir = dst / "2026-01-16"
+        assert len(list(new_dir.glob("*.json"))) == 20
+        assert json.loads((new_dir / "DO-0.json").read_text())["ticket"]["summary"] == "edited"
+        assert ((new_dir / "DO-31.json").read_text()
+                == (dst / "2026-01-15" / "DO-31.json").read_text())
+        manifest = json.loads((dst / normalize_tickets.MANIFEST_NAME).read_text())["tickets"]
+        assert manifest["DO-31"]["path"] == "2026-01-16/DO-31.json"
+
+    def test_same_day_rerun_and_missing_output(self, tmp_path, capsys):
+        src, dst = tmp_path / "src", tmp_path / "dst"
+        src.mkdir()
+        (src / "DO-1.json").write_text(json.dumps(_issue_with("DO-1", "one")))
+        (src / "DO-2.json").write_text(json.dumps(_issue_with("DO-2", "two")))
+        (src / "other.json").write_text(json.dumps({"foo": "bar"}))
+        self._run(src, dst, "2026-01-15")
+        capsys.readouterr()
+
+        # No archive prompt; DO-1 stays in place, the deleted DO-2 is rebuilt
+        (dst / "2026-01-15" / "DO-2.json").unlink()
+        self._run(src, dst, "2026-01-15")
+        out = capsys.readouterr().out
+        assert "1 unchanged ticket(s) carried forward, 1 to normalize" in out
+        assert "DO-2.json" in out and "other.json" in out
+        assert (dst / "2026-01-15" / "DO-2.json").exists()
+
+    def test_tickets_dropped_from_input_are_removed(self, tmp_path, capsys):
+        src, dst = tmp_path / "src", tmp_path / "dst"
+        src.mkdir()
+        (src / "DO-1.json").write_text(json.dumps(_issue_with("DO-1", "one")))
+        (src / "DO-2.json").write_text(json.dumps(_issue_with("DO-2", "two")))
+        self._run(src, dst, "2026-01-14")
+        self._run(src, dst, "2026-01-15")
+        capsys.readouterr()
+
+        (src / "DO-2.json").unlink()
+        self._run(src, dst, "2026-01-15")
+        out = capsys.readouterr().out
+        assert "removed 1 ticket(s) no longer in the input" in out
+        assert [p.name for p in (dst / "2026-01-15").glob("*.json")] == ["DO-1.json"]
+        # Other dated directories are left alone
+        assert (dst / "2026-01-14" / "DO-2.json").exists()
+        manifest = json.loads((dst / normalize_tickets.MANIFEST_NAME).read_text())["tickets"]
+        assert manifest == {"DO-1": {"hash": manifest["DO-1"]["hash"],
+                                     "path": "2026-01-15/DO-1.json"}}
+
+    def test_normalizer_change_renormalizes_everything(self, tmp_path, capsys, monkeypatch):
+        src, dst = tmp_path / "src", tmp_path / "dst"
+        _write_pages(src)
+        self._run(src, dst, "2026-01-15")
+        manifest = json.loads((dst / normalize_tickets.MANIFEST_NAME).read_text())
+        assert manifest["normalizer"] == normalize_tickets.normalizer_digest()
+        capsys.readouterr()
+
+        monkeypatch.setattr(normalize_tickets, "normalizer_digest", lambda: "new-code")
+        self._run(src, dst, "2026-01-16")
+        out = capsys.readouterr().out
+        assert "the normalizer changed" in out
+        assert "0 unchanged ticket(s) carried forward, 20 to normalize" in out
+
+        self._run(src, dst, "2026-01-17")
+        assert "20 unchanged ticket(s) carried forward" in capsys.readouterr().out
+
+    def test_digest_ignores_key_order(self):
+        a = {"key": "DO-1", "fields": {"summary": "x", "labels": ["a"]}}
+        b = {"fields": {"labels": ["a"], "summary": "x"}, "key": "DO-1"}
+        assert normalize_tickets.issue_digest(a) == normalize_tickets.issue_digest(b)
+        b["fields"]["summary"] = "y"
+        assert normalize_tickets.issue_digest(a) != normalize_tickets.issue_digest(b)
+
+    def test_plan_respects_allowed_keys(self, tmp_path):
+        src = tmp_path / "src"
+        _write_pages(src)
+        files = sorted(str(p) for p in src.glob("*.json"))
+        to_process, changed, carried, entries = normalize_tickets.plan_incremental(
+            files, {}, tmp_path, tmp_path / "2026-01-15", allowed_ticket_keys={"DO-2"})
+        assert changed == {"DO-2"} and set(entries) == {"DO-2"}
+        assert to_process == [str(src / "page_5.json")]
+        assert carried == []
+
+    def test_rejects_in_place(self, capsys):
+        with pytest.raises(SystemExit):
+            normalize_tickets.main(["--incremental", "--in-place"])
+        assert "--incremental cannot be combined with --in-place" in capsys.readouterr().err
+
+
+# --- --corpus ---
+
+class TestCorpus:
+    def test_writes_corpus_and_rerun_without_flag_removes_it(self, tmp_path, capsys):
+        src, dst = tmp_path / "src", tmp_path / "dst"
+        _write_pages(src)
+        argv = ["--input-dir", str(src), "-o", str(dst), "--date", "2026-01-15", "-y"]
+        normalize_tickets.main(argv + ["--corpus"])
+        assert "Corpus: packed 20 ticket(s)" in capsys.readouterr().out
+        out_dir = dst / "2026-01-15"
+        tickets = dict(normalize_tickets.ticket_corpus.iter_tickets(out_dir))
+        assert tickets["DO-31"] == json.loads((out_dir / "DO-31.json").read_text())
+
+        normalize_tickets.main(argv + ["--incremental"])
+        assert normalize_tickets.ticket_corpus.load_corpus(out_dir) is None
+
+    def test_rejects_in_place(self, capsys):
+        with pytest.raises(SystemExit):
+            normalize_tickets.main(["--corpus", "--in-place"])
+        assert "--corpus cannot be combined with --in-place" in capsys.readouterr().err
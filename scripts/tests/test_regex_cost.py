@@ -0,0 +1,117 @@
+"""Tests for regex_cost.py."""
+
+import importlib
+import multiprocessing
+
+import pytest
+
+rc = importlib.import_module("regex_cost")
+
+RULES_CSV = (
+    "Project Key,RuleID,Rule Pattern,Match Field,Failure Category,Category,"
+    "Priority,Confidence,Created By,Hit Count\n"
+    "DO,R001,(a+)+b,summary,Slow,X,100,0.9,llm,0\n"
+    "DO,R002,link down,summary,Link,NET,90,0.9,human,0\n"
+    "DO,R003,[bad,summary,Bad,BAD,10,0.5,human,0\n"
+)
+
+
+class TestStaticIssues:
+    @pytest.mark.parametrize("pattern", [
+        "(a+)+b", "(a*)*", "(?:x|(y+))*z", "((ab)+c)+", "(?=(a+)+)b",
+    ])
+    def test_nested_quantifier(self, pattern):
+        assert [code for code, _ in rc.static_issues(pattern)] == [rc.NESTED_QUANTIFIER]
+
+    @pytest.mark.parametrize("pattern", [
+        "CDFP fault", "a.*b", "(a+)b", "(a{1,3})+", "(?>a+)+b", "a++b",
+        r"Problem\s*Type:\s*TRS_\w+", "(a)?(?(1)b+|c+)",
+    ])
+    def test_clean(self, pattern):
+        assert rc.static_issues(pattern) == []
+
+    def test_wildcard_chain_per_alternative(self):
+        issues = rc.static_issues("a.*b.*c.*d|x.*y")
+        assert issues == [(rc.WILDCARD_CHAIN, "3 unbounded wildcards in one alternative")]
+        assert rc.static_issues("a.*b|c.*d|e.*f") == []
+
+    def test_invalid_pattern_raises(self):
+        with pytest.raises(rc.re.error):
+            rc.static_issues("[bad")
+
+
+class TestProbeTexts:
+    def test_chain_probe_omits_last_literal(self):
+        chain, repeat = rc.probe_texts("x.*y|a.*b.*c.*d")
+        lines = chain.split("\n")
+        assert len(lines) == rc.CHAIN_PROBE_LINES
+        assert len(lines[0]) == rc.CHAIN_PROBE_LINE_CHARS
+        assert lines[0].startswith("a b c a b c")
+        assert "d" not in chain
+        assert repeat == "x" * rc.REPEAT_PROBE_LEN + "\x00"
+
+    def test_nested_group_literal(self):
+        assert rc.probe_texts("(a+)+") == ["a" * rc.REPEAT_PROBE_LEN + "\x00"]
+
+    def test_no_literals(self):
+        assert rc.probe_texts(r"\d+") == []
+
+
+class TestTiming:
+    def test_worst_search_time(self):
+        assert rc.worst_search_time("a", ["a", "b"]) >= 0
+        assert rc.worst_search_time("a", []) == 0.0
+
+    def test_probe_sends_result(self):
+        receiver, sender = multiprocessing.Pipe(duplex=False)
+        rc._probe(sender, "a", ["a"])
+        assert receiver.recv() >= 0
+
+    def test_time_pattern_completes(self):
+        assert rc.time_pattern("a", ["a" * 10], timeout=30) is not None
+
+    def test_time_pattern_kills_catastrophic_search(self):
+        assert rc.time_pattern("(a+)+b", ["a" * 40], timeout=0.2) is None
+
+    def test_time_pattern_child_failure(self):
+        assert rc.time_pattern("[bad", ["a"], timeout=30) is None
+
+    def test_screen_pattern(self):
+        assert rc.screen_pattern("link down", ["link up"], 1.0)[1] is False
+        assert rc.screen_pattern("(a+)+b", [], 0.05) == (None, True)
+
+
+class TestMain:
+    def _write(self, tmp_path):
+        path = tmp_path / "rules.csv"
+        path.write_text(RULES_CSV, encoding="utf-8")
+        return path
+
+    def test_reports_over_budget_rules(self, tmp_path, capsys):
+        tickets = tmp_path / "tickets"
+        tickets.mkdir()
+        (tickets / "DO-1.json").write_text(
+            '{"ticket": {"summary": "link down"}}', encoding="utf-8")
+        code = rc.main(["--rule-engine", str(self._write(tmp_path)),
+                        "--tickets-dir", str(tickets), "--budget-ms", "50"])
+        out = capsys.readouterr().out
+        assert code == 1
+        assert "R001     OVER BUDGET worst timed out" in out
+        assert "unbounded quantifier nested inside another" in out
+        assert "R002" not in out
+        assert "1 rule(s) over the 50 ms budget" in out
+
+    def test_all_times_every_rule(self, tmp_path, capsys):
+        code = rc.main(["--rule-engine", str(self._write(tmp_path)), "--all",
+                        "--budget-ms", "50"])
+        out = capsys.readouterr().out
+        assert code == 1
+        assert "R002     ok" in out
+
+    def test_missing_rule_engine(self, tmp_path):
+        with pytest.raises(SystemExit, match="Rule engine not found"):
+            rc.main(["--rule-engine", str(tmp_path / "missing.csv")])
+
+    def test_default_rule_engine(self, capsys):
+        assert rc.main([]) == 0
+        assert "0 rule(s) over" in capsys.readouterr().out
@@ -3,6 +3,7 @@
 import csv
 import importlib
 import json
+import os
 import re
 import sys
 from datetime import datetime, timezone
@@ -13,14 +14,31 @@ import pytest
 
 # Import module
 rec = importlib.import_module("rule_engine_categorize")
+ticket_corpus = importlib.import_module("ticket_corpus")
 parse_args = rec.parse_args
 find_latest_tickets_dir = rec.find_latest_tickets_dir
 load_rules = rec.load_rules
+RuleSet = rec.RuleSet
+required_literals = rec.required_literals
+fold_text = rec.fold_text
 get_ticket_field_text = rec.get_ticket_field_text
+parse_match_field = rec.parse_match_field
+TicketView = rec.TicketView
 get_ticket_project = rec.get_ticket_project
 evaluate_ticket = rec.evaluate_ticket
 compute_age = rec.compute_age
 categorize_ticket = rec.categorize_ticket
+categorize_files = rec.categorize_files
+apply_ml_prediction = rec.apply_ml_prediction
+trim_partial_row = rec.trim_partial_row
+load_done_tickets = rec.load_done_tickets
+file_digest = rec.file_digest
+ticket_fingerprint = rec.ticket_fingerprint
+ticket_digest = rec.ticket_digest
+read_state = rec.read_state
+CategorizedOutput = rec.CategorizedOutput
+MatchCache = rec.MatchCache
+iter_categorized_rows = rec.iter_categorized_rows
 main = rec.main
 META_RULE_FAILURE = rec.META_RULE_FAILURE
 OUTPUT_FIELDS = rec.OUTPUT_FIELDS
@@ -155,6 +173,17 @@ class TestParseArgs:
         assert args.ml_model is None
         assert args.ml_category_map is None
 
+    def test_workers_default_and_custom(self, monkeypatch):
+        monkeypatch.setattr("sys.argv", ["rule_engine_categorize.py"])
+        assert parse_args().workers == 1
+        monkeypatch.setattr("sys.argv", ["rule_engine_categorize.py", "--workers", "4"])
+        assert parse_args().workers == 4
+
+    def test_workers_must_be_positive(self, monkeypatch):
+        monkeypatch.setattr("sys.argv", ["rule_engine_categorize.py", "--workers", "0"])
+        with pytest.raises(SystemExit):
+            parse_args()
+
 
 # ---------------------------------------------------------------------------
 # find_latest_tickets_dir
@@ -242,6 +271,114 @@ class TestLoadRules:
         assert "R999" in captured.err
 
 
+    def test_returns_rule_set(self, tmp_path):
+        csv_path = tmp_path / "rules.csv"
+        _write_rule_csv(csv_path, [
+            {"Project Key": "DO", "RuleID": "R001", "Rule Pattern": "foo",
+             "Match Field": "summary", "Failure Category": "Fail",
+             "Category": "CAT", "Priority": "100", "Confidence": "0.9",
+             "Created By": "human", "Hit Count": "0"},
+        ])
+        rules = load_rules(csv_path)
+        assert isinstance(rules, RuleSet)
+        assert rules[0]["_fields"] == ("summary",)
+        assert ("summary",) in rules.field_groups
+
+
+# ---------------------------------------------------------------------------
+# required_literals / fold_text
+# ---------------------------------------------------------------------------
+
+class TestRequiredLiterals:
+    def test_single_literal(self):
+        assert required_literals("SPGXTAIL-8000-KW") == ("spgxtail-8000-kw",)
+
+    def test_longest_run_per_branch(self):
+        assert required_literals(r"GBB.*powergood|SPGXTAIL-8000-\w+") == (
+            "powergood", "spgxtail-8000-",
+        )
+
+    def test_optional_char_breaks_run(self):
+        assert required_literals("colou?r sensor") == ("r sensor",)
+
+    def test_short_branch_disables_prefilter(self):
+        assert required_literals("ab|longer literal") is None
+
+    def test_non_ascii_breaks_run(self):
+        assert required_literals("caf\u00e9 crash") == (" crash",)
+
+
+class TestFoldText:
+    def test_lowercases(self):
+        assert fold_text("GPU Fault") == "gpu fault"
+
+    def test_ignorecase_specials(self):
+        # re.IGNORECASE matches these against ASCII i/s; the prefilter must too
+        assert fold_text("\u0130LOM \u017fmartnic") == "ilom smartnic"
+
+
+# ---------------------------------------------------------------------------
+# RuleSet
+# ---------------------------------------------------------------------------
+
+class TestRuleSet:
+    def test_groups_by_match_field(self):
+        rules = RuleSet([
+            _make_rule(rule_id="R1", pattern="alpha", match_field="summary"),
+            _make_rule(rule_id="R2", pattern="beta", match_field="comments"),
+            _make_rule(rule_id="R3", pattern="g.", match_field="summary"),
+        ])
+        assert set(rules.field_groups) == {("summary",), ("comments",)}
+        by_literal, unfiltered = rules.field_groups[("summary",)]
+        assert by_literal == {"alpha": [0]}
+        assert unfiltered == [2]
+
+    def test_equivalent_specs_share_a_group(self):
+        rules = RuleSet([
+            _make_rule(pattern="alpha", match_field="summary+description"),
+            _make_rule(pattern="beta", match_field="summary + description"),
+        ])
+        assert list(rules.field_groups) == [("summary", "description")]
+
+    def test_match_accepts_ticket_view(self):
+        rules = RuleSet([_make_rule(pattern="foo")])
+        assert len(rules.match(TicketView(_make_ticket(summary="foo")))) == 1
+
+    def test_skips_rules_with_bad_regex(self):
+        rule = _make_rule(pattern="foo")
+        rule["_re"] = None
+        assert RuleSet([rule]).field_groups == {}
+
+    def test_prefilter_skips_regex_without_literal(self):
+        rule = _make_rule(pattern="foo.*bar")
+        rule["_re"] = MagicMock(pattern="foo.*bar")
+        rules = RuleSet([rule])
+        assert rules.match(_make_ticket(summary="nothing relevant")) == []
+        rule["_re"].search.assert_not_called()
+
+    def test_unfilterable_rule_always_evaluated(self):
+        rules = RuleSet([_make_rule(pattern=r"\d{3}")])
+        assert len(rules.match(_make_ticket(summary="code 123"))) == 1
+
+    def test_match_preserves_priority_order_across_fields(self):
+        rules = RuleSet([
+            _make_rule(rule_id="R1", pattern="gpu", match_field="comments"),
+            _make_rule(rule_id="R2", pattern="xid", match_field="summary"),
+            _make_rule(rule_id="R3", pattern="gpu", match_field="summary"),
+        ])
+        ticket = _make_ticket(summary="GPU XID", comments=[{"body": "gpu"}])
+        assert [r["RuleID"] for r in rules.match(ticket)] == ["R1", "R2", "R3"]
+
+    def test_match_is_case_insensitive_through_prefilter(self):
+        rules = RuleSet([_make_rule(pattern="smartnic")])
+        assert rules.match(_make_ticket(summary="\u017fMARTNIC down"))
+
+    def test_match_filters_project(self):
+        rules = RuleSet([_make_rule(pattern="foo", project_key="HPC")])
+        assert rules.match(_make_ticket(summary="foo"), project_key="DO") == []
+        assert len(rules.match(_make_ticket(summary="foo"), project_key="HPC")) == 1
+
+
 # ---------------------------------------------------------------------------
 # get_ticket_field_text
 # ---------------------------------------------------------------------------
@@ -282,6 +419,229 @@ class TestGetTicketFieldText:
         # Unknown field produces no content, but doesn't crash
         assert text == ""
 
+    def test_accepts_parsed_tuple(self):
+        ticket = _make_ticket(summary="SUM", comments=[{"body": "C1"}, {"body": "C2"}])
+        assert get_ticket_field_text(ticket, ("summary", "comments")) == "SUM\nC1\nC2"
+
+
+# ---------------------------------------------------------------------------
+# parse_match_field / TicketView
+# ---------------------------------------------------------------------------
+
+class TestMatchCache:
+    def test_lookup_store_flush(self, tmp_path):
+        cache = MatchCache(tmp_path / "cache.sqlite")
+        bits = cache.lookup("t1")
+        assert bits == {}
+        bits.add("r1", 1)
+        bits.hits += 1
+        cache.store("t1", bits)
+        assert (cache.hits, cache.misses) == (1, 1)
+        cache.close()
+
+        reopened = MatchCache(tmp_path / "cache.sqlite")
+        assert reopened.lookup("t1") == {"r1": 1}
+        assert reopened.lookup("t2") == {}
+
+    def test_take_and_merge(self, tmp_path):
+        cache = MatchCache(tmp_path / "cache.sqlite")
+        cache.merge([("t1", "r1", 0)], 3, 1)
+        assert cache.take() == ([("t1", "r1", 0)], 3, 1)
+        assert cache.take() == ([], 0, 0)
+
+    def test_evict(self, tmp_path):
+        cache = MatchCache(tmp_path / "cache.sqlite")
+        cache.merge([("t1", "r1", 1), ("t1", "r2", 0), ("t2", "r1", 0)], 0, 3)
+        cache.flush()
+        assert cache.evict(tickets={"t1"}) == 1
+        assert cache.evict(rules={"r2"}) == 1
+        assert cache.lookup("t1") == {"r2": 0}
+
+    def test_rule_set_match_uses_cached_bits(self):
+        rules = RuleSet([_make_rule("R1", pattern="foo"), _make_rule("R2", pattern="bar")])
+        key1, key2 = rules.keys[0], rules.keys[1]
+        # A cached "no match" wins over the regex; R2 is evaluated afresh
+        bits = rec.MatchBits({key1: 0})
+        hits = rules.match(_make_ticket(summary="foo bar"), cached=bits)
+        assert [r["RuleID"] for r in hits] == ["R2"]
+        assert bits.hits == 1
+        assert bits.new == [(key2, 1)]
+
+    def test_rule_match_key_ignores_category(self):
+        assert rules_key(_make_rule(category="A")) == rules_key(_make_rule(category="B"))
+        assert rules_key(_make_rule(pattern="x")) != rules_key(_make_rule(pattern="y"))
+
+
+def rules_key(rule):
+    return RuleSet([rule]).keys[0]
+
+
+class TestRuleProfile:
+    def test_search_records_time(self):
+        rules = RuleSet([_make_rule("R1", pattern="foo"), _make_rule("R2", pattern="bar")])
+        rules.profile = profile = rec.RuleProfile()
+        rules.match(_make_ticket(summary="foo"))
+        rules.match(_make_ticket(summary="foo bar"))
+        # R2's literal prefilter skips it on the first ticket
+        assert profile.evaluations == {"R1": 2, "R2": 1}
+        assert profile.seconds["R1"] >= profile.max_seconds["R1"] > 0
+
+    def test_count_matches_wins_skip_meta(self):
+        meta = _make_rule("M1", failure_category=META_RULE_FAILURE)
+        rules_by_id = {"M1": meta, "R1": _make_rule("R1"), "R2": _make_rule("R2")}
+        profile = rec.RuleProfile()
+        profile.count_matches(("M1", "R1", "R2"), rules_by_id)
+        profile.count_matches(("R9", "R2"), rules_by_id)
+        assert profile.matches == {"M1": 1, "R1": 1, "R2": 2, "R9": 1}
+        assert profile.wins == {"R1": 1, "R2": 1}
+
+    def test_take_and_merge(self):
+        profile = rec.RuleProfile()
+        profile.record("R1", 0.5)
+        taken = profile.take()
+        assert profile.evaluations == {}
+        other = rec.RuleProfile()
+        other.max_seconds["R1"] = 99.0
+        other.merge(*taken)
+        other.merge(*taken)
+        assert other.evaluations["R1"] == 2
+        assert other.max_seconds["R1"] == 99.0
+
+    def test_report_sorted_by_total_time(self):
+        profile = rec.RuleProfile()
+        profile.evaluations.update({"R1": 2, "R2": 1})
+        profile.seconds.update({"R1": 0.001, "R2": 0.004})
+        profile.max_seconds.update({"R1": 0.0006, "R2": 0.004})
+        profile.matches["R1"] = 1
+        report = profile.report([_make_rule("R1"), _make_rule("R2"), _make_rule("R3")])
+        assert [r["RuleID"] for r in report] == ["R2", "R1", "R3"]
+        assert report[1]["Mean us"] == 500.0
+        assert report[1]["Matches"] == 1
+        assert report[2]["Mean us"] == 0
+
+
+class TestRuleBudget:
+    def test_slow_rule_quarantined_after_first_search(self):
+        rules = RuleSet([_make_rule("R1", pattern="foo"), _make_rule("R2", pattern="foo")])
+        rules.budget = 0.0
+        first = rules.match(_make_ticket(key="DO-1", summary="foo"))
+        assert [r["RuleID"] for r in first] == ["R1", "R2"]
+        assert rules.quarantined["R1"].endswith("on DO-1")
+        assert rules.match(_make_ticket(summary="foo")) == []
+
+    def test_within_budget(self):
+        rules = RuleSet([_make_rule("R1", pattern="foo")])
+        rules.budget = 60.0
+        rules.match(_make_ticket(summary="foo"))
+        assert rules.quarantined == {}
+
+
+class TestScreenRules:
+    def _rules(self, pattern):
+        rule = _make_rule("R1", pattern=pattern)
+        rule["_fields"] = ("summary",)
+        return RuleSet([rule, _make_rule("R2", pattern="plain"),
+                        {**_make_rule("R3"), "_re": None}])
+
+    def test_catastrophic_pattern_quarantined(self, tmp_path, capsys):
+        _write_ticket_json(tmp_path, "DO-1", _make_ticket(summary="aaaa"))
+        rules = self._rules("(a+)+b")
+        rec.screen_rules(rules, [tmp_path / "DO-1.json"], 0.05)
+        assert rules.quarantined == {"R1": "timed out on reference texts"}
+        assert "R1 pattern risk: unbounded quantifier" in capsys.readouterr().err
+
+    def test_screen_result_decides_quarantine(self):
+        rules = self._rules("a.*b.*c.*d")
+        with patch.object(rec, "screen_pattern", return_value=(0.7, True)):
+            rec.screen_rules(rules, [], 0.5)
+        assert rules.quarantined == {"R1": "700 ms per search on reference texts"}
+        rules.quarantined.clear()
+        with patch.object(rec, "screen_pattern", return_value=(0.01, False)):
+            rec.screen_rules(rules, [], 0.5)
+        assert rules.quarantined == {}
+
+    def test_no_budget_only_warns(self, tmp_path, capsys):
+        rules = self._rules("(a+)+b")
+        with patch.object(rec, "screen_pattern") as screen:
+            rec.screen_rules(rules, [], None)
+        screen.assert_not_called()
+        assert "R1 pattern risk" in capsys.readouterr().err
+
+    def test_sample_ticket_files(self):
+        assert rec.sample_ticket_files([1, 2, 3], 5) == [1, 2, 3]
+        assert rec.sample_ticket_files(list(range(10)), 4) == [0, 2, 5, 7]
+
+    def test_reference_texts(self, tmp_path):
+        _write_ticket_json(tmp_path, "DO-1", _make_ticket(summary="s", description="d"))
+        assert rec.reference_texts([tmp_path / "DO-1.json"], ("summary", "description")) == ["s\nd"]
+
+
+class TestWriteHitCounts:
+    def test_updates_only_counted_rules(self, tmp_path):
+        src = tmp_path / "rules.csv"
+        _write_rule_csv(src, [
+            {"Project Key": "DO", "RuleID": rid, "Rule Pattern": "x",
+             "Match Field": "summary", "Failure Category": "F", "Category": "C",
+             "Priority": "1", "Confidence": "1", "Created By": "human",
+             "Hit Count": "7"}
+            for rid in ("R1", "R2")
+        ])
+        dst = tmp_path / "hits.csv"
+        rec.write_hit_counts(src, dst, {"R1": 3}, {"R1"})
+        with open(dst, newline="", encoding="utf-8") as f:
+            rows = list(csv.DictReader(f))
+        assert [(r["RuleID"], r["Hit Count"]) for r in rows] == [("R1", "3"), ("R2", "7")]
+
+    def test_loaded_rules_without_matches_get_zero(self, tmp_path):
+        src = tmp_path / "rules.csv"
+        _write_rule_csv(src, [
+            {"Project Key": "DO", "RuleID": "R1", "Rule Pattern": "x",
+             "Match Field": "summary", "Failure Category": "F", "Category": "C",
+             "Priority": "1", "Confidence": "1", "Created By": "human",
+             "Hit Count": "42"}
+        ])
+        dst = tmp_path / "hits.csv"
+        rec.write_hit_counts(src, dst, {}, {"R1"})
+        with open(dst, newline="", encoding="utf-8") as f:
+            assert [r["Hit Count"] for r in csv.DictReader(f)] == ["0"]
+
+
+class TestParseMatchField:
+    def test_single(self):
+        assert parse_match_field("summary") == ("summary",)
+
+    def test_combined_strips_whitespace(self):
+        assert parse_match_field("labels + description+comments") == (
+            "labels", "description", "comments",
+        )
+
+
+class TestTicketView:
+    def test_text_matches_get_ticket_field_text(self):
+        ticket = _make_ticket(summary="S", description="D", labels=["L1", "L2"],
+                              comments=[{"body": "c1"}, {"body": "c2"}])
+        view = TicketView(ticket)
+        for spec in ("summary", "labels+description+comments", "summary+comments"):
+            assert view.text(parse_match_field(spec)) == get_ticket_field_text(ticket, spec)
+
+    def test_text_is_cached(self):
+        view = TicketView(_make_ticket(comments=[{"body": "c1"}]))
+        fields = ("description", "comments")
+        assert view.text(fields) is view.text(fields)
+        assert view.folded(fields) is view.folded(fields)
+
+    def test_parts_built_once_per_field(self):
+        ticket = _make_ticket(comments=[{"body": "c1"}])
+        view = TicketView(ticket)
+        view.text(("description", "comments"))
+        ticket["comments"].append({"body": "late"})
+        # comments were already materialized for the first combination
+        assert view.text(("comments",)) == "c1"
+
+    def test_folded(self):
+        view = TicketView(_make_ticket(summary="GPU Down"))
+        assert view.folded(("summary",)) == "gpu down"
+
 
 # ---------------------------------------------------------------------------
 # get_ticket_project
@@ -525,6 +885,342 @@ class TestCategorizeTicket:
         assert row["Age"] == ""
 
 
+# ---------------------------------------------------------------------------
+# categorize_file / worker pool
+# ---------------------------------------------------------------------------
+
+class TestApplyMlPrediction:
+    def _unmatched_row(self):
+        return categorize_ticket(_make_ticket(summary="nothing"), [])
+
+    def test_confident_prediction(self):
+        row = self._unmatched_row()
+        apply_ml_prediction(row, ("GPU Failure", "GPU", 0.85), 0.4)
+        assert row["Categorization Source"] == "ml"
+        assert row["Category of Issue"] == "GPU Failure"
+        assert row["Category"] == "GPU"
+        assert row["LLM Confidence"] == 0.85
+        assert row["Human Audit for Accuracy"] == "pending-review"
+
+    def test_medium_confidence_needs_review(self):
+        row = self._unmatched_row()
+        apply_ml_prediction(row, ("GPU Failure", "GPU", 0.45), 0.4)
+        assert row["Categorization Source"] == "ml"
+        assert row["Human Audit for Accuracy"] == "needs-review"
+
+    def test_below_threshold_stays_uncategorized(self):
+        row = self._unmatched_row()
+        apply_ml_prediction(row, ("GPU Failure", "GPU", 0.2), 0.4)
+        assert row["Categorization Source"] == "none"
+        assert row["Category of Issue"] == "uncategorized"
+        assert row["LLM Confidence"] == 0.2
+
+
+class TestCategorizeFiles:
+    def test_auto_detects_project(self, tmp_path):
+        _write_ticket_json(tmp_path, "DO-1", _make_ticket(key="DO-1", summary="foo",
+                                                          project_key="DO"))
+        rules = [_make_rule(pattern="foo", project_key="HPC")]
+        [row] = categorize_files([tmp_path / "DO-1.json"], rules)
+        assert row["Categorization Source"] == "none"
+
+    def test_project_filter_skips_per_ticket_filtering(self, tmp_path):
+        _write_ticket_json(tmp_path, "DO-1", _make_ticket(key="DO-1", summary="foo",
+                                                          project_key="DO"))
+        rules = [_make_rule(pattern="foo", project_key="HPC")]
+        [row] = categorize_files([tmp_path / "DO-1.json"], rules, project_filter="HPC")
+        assert row["Categorization Source"] == "rule"
+
+    def test_batches_ml_for_unmatched_only(self, tmp_path):
+        paths = []
+        for key, summary in [("DO-1", "foo"), ("DO-2", "gpu"), ("DO-3", "vague")]:
+            _write_ticket_json(tmp_path, key, _make_ticket(key=key, summary=summary))
+            paths.append(tmp_path / f"{key}.json")
+        rules = [_make_rule(pattern="foo")]
+        with patch("ml_classifier.predict_batch", return_value=[
+            ("GPU Failure", "GPU", 0.9), ("GPU Failure", "GPU", 0.1),
+        ]) as mock_batch, patch("ml_classifier.predict") as mock_predict:
+            rows = categorize_files(paths, rules, ml_model="mock",
+                                    ml_category_map="mock")
+        mock_predict.assert_not_called()
+        mock_batch.assert_called_once()
+        batch_tickets = mock_batch.call_args.args[2]
+        assert [t["ticket"]["key"] for t in batch_tickets] == ["DO-2", "DO-3"]
+        assert [r["Categorization Source"] for r in rows] == ["rule", "ml", "none"]
+        assert rows[2]["LLM Confidence"] == 0.1
+
+    def test_no_ml_call_when_everything_matches(self, tmp_path):
+        _write_ticket_json(tmp_path, "DO-1", _make_ticket(key="DO-1", summary="foo"))
+        with patch("ml_classifier.predict_batch") as mock_batch:
+            categorize_files([tmp_path / "DO-1.json"], [_make_rule(pattern="foo")],
+                             ml_model="mock", ml_category_map="mock")
+        mock_batch.assert_not_called()
+
+
+class TestWorkerPool:
+    def test_chunk_uses_worker_state(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(rec, "_worker_state", {})
+        for key in ("DO-1", "DO-2"):
+            _write_ticket_json(tmp_path, key, _make_ticket(key=key, summary=f"foo {key}"))
+        rec._init_worker(RuleSet([_make_rule(pattern="foo")]), None, None, None)
+        rows, results = rec._categorize_chunk(
+            [tmp_path / "DO-1.json", tmp_path / "DO-2.json"])
+        assert [r["Ticket"] for r in rows] == ["DO-1", "DO-2"]
+        assert all(r["Categorization Source"] == "rule" for r in rows)
+        assert results == {"match_cache": None, "profile": None, "quarantined": {}}
+
+    def test_chunk_returns_match_cache_results(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(rec, "_worker_state", {})
+        _write_ticket_json(tmp_path, "DO-1", _make_ticket(key="DO-1", summary="foo"))
+        rec._init_worker(RuleSet([_make_rule(pattern="foo")]), None, None, None,
+                         tmp_path / "cache.sqlite")
+        _, results = rec._categorize_chunk([tmp_path / "DO-1.json"])
+        pending, hits, misses = results["match_cache"]
+        assert (len(pending), hits, misses) == (1, 0, 1)
+        assert rec._worker_state["match_cache"].pending == []
+
+    def test_pool_merges_rule_profile(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(rec, "CATEGORIZE_CHUNK_SIZE", 1)
+        paths = []
+        for key in ("DO-1", "DO-2", "DO-3"):
+            _write_ticket_json(tmp_path, key, _make_ticket(key=key, summary="foo"))
+            paths.append(tmp_path / f"{key}.json")
+        rules = RuleSet([_make_rule(pattern="foo")])
+        rules.profile = rec.RuleProfile()
+        list(iter_categorized_rows(paths, rules, workers=2))
+        assert rules.profile.evaluations["R001"] == 3
+        assert rules.profile.max_seconds["R001"] > 0
+
+    def test_pool_merges_quarantined_rules(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(rec, "CATEGORIZE_CHUNK_SIZE", 1)
+        paths = []
+        for key in ("DO-1", "DO-2"):
+            _write_ticket_json(tmp_path, key, _make_ticket(key=key, summary="foo"))
+            paths.append(tmp_path / f"{key}.json")
+        rules = RuleSet([_make_rule(pattern="foo")])
+        rules.budget = 0.0
+        rows = list(iter_categorized_rows(paths, rules, workers=2))
+        assert set(rules.quarantined) == {"R001"}
+        # Each worker still used the result of the search that blew the budget
+        assert rows[0]["Categorization Source"] == "rule"
+
+    def test_pool_fills_match_cache(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(rec, "CATEGORIZE_CHUNK_SIZE", 1)
+        paths = []
+        for key in ("DO-1", "DO-2"):
+            _write_ticket_json(tmp_path, key, _make_ticket(key=key, summary="foo"))
+            paths.append(tmp_path / f"{key}.json")
+        cache = MatchCache(tmp_path / "cache.sqlite")
+        rows = list(iter_categorized_rows(paths, RuleSet([_make_rule(pattern="foo")]),
+                                          workers=2, match_cache=cache))
+        assert len(rows) == 2
+        assert (cache.hits, cache.misses, cache.pending) == (0, 2, [])
+        assert cache.lookup(ticket_digest(json.loads(paths[0].read_bytes()))) == {
+            rec.rule_match_key("foo", ("summary",)): 1}
+
+    def test_pool_preserves_order(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(rec, "CATEGORIZE_CHUNK_SIZE", 2)
+        paths = []
+        for i in range(7):
+            key = f"DO-{i}"
+            summary = "foo" if i % 2 else "bar"
+            _write_ticket_json(tmp_path, key, _make_ticket(key=key, summary=summary))
+            paths.append(tmp_path / f"{key}.json")
+        rules = RuleSet([_make_rule(pattern="foo")])
+        serial = list(iter_categorized_rows(paths, rules))
+        pooled = list(iter_categorized_rows(paths, rules, workers=2))
+        assert pooled == serial
+        assert [r["Ticket"] for r in pooled] == [f"DO-{i}" for i in range(7)]
+
+
+# ---------------------------------------------------------------------------
+# streaming output helpers
+# ---------------------------------------------------------------------------
+
+class TestTrimPartialRow:
+    def test_complete_file_untouched(self, tmp_path):
+        path = tmp_path / "out.csv"
+        path.write_bytes(b"Ticket\r\nDO-1\r\n")
+        trim_partial_row(path)
+        assert path.read_bytes() == b"Ticket\r\nDO-1\r\n"
+
+    def test_truncated_row_dropped(self, tmp_path):
+        path = tmp_path / "out.csv"
+        path.write_bytes(b"Ticket\r\nDO-1\r\nDO-2,par")
+        trim_partial_row(path)
+        assert path.read_bytes() == b"Ticket\r\nDO-1\r\n"
+
+    def test_no_terminator_empties_file(self, tmp_path):
+        path = tmp_path / "out.csv"
+        path.write_bytes(b"Tick")
+        trim_partial_row(path)
+        assert path.read_bytes() == b""
+
+    def test_terminator_beyond_first_block(self, tmp_path):
+        path = tmp_path / "out.csv"
+        path.write_bytes(b"Ticket\r" + b"\n" + b"x" * 70000)
+        trim_partial_row(path)
+        assert path.read_bytes() == b"Ticket\r\n"
+
+
+class TestLoadDoneTickets:
+    def test_reads_ticket_column(self, tmp_path):
+        path = tmp_path / "out.csv"
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=OUTPUT_FIELDS)
+            writer.writeheader()
+            writer.writerow({k: "" for k in OUTPUT_FIELDS} | {"Ticket": "DO-1"})
+        assert load_done_tickets(path) == {"DO-1"}
+
+
+class TestFileDigest:
+    def test_depends_on_content_and_extra(self, tmp_path):
+        a = tmp_path / "a"
+        a.write_text("rules")
+        assert file_digest(a) == file_digest(a)
+        assert file_digest(a) != file_digest(a, extra="DO")
+        b = tmp_path / "b"
+        b.write_text("rules!")
+        assert file_digest(a) != file_digest(b)
+        assert len(file_digest(a)) == 16
+
+
+class TestTicketFingerprint:
+    def test_reuses_digest_when_stat_unchanged(self, tmp_path):
+        path = tmp_path / "DO-1.json"
+        path.write_text("{}")
+        fp = ticket_fingerprint(path)
+        stale = (fp[0], fp[1], "cached", "r", "m")
+        assert ticket_fingerprint(path, stale) == (fp[0], fp[1], "cached")
+
+    def test_rehashes_when_stat_changed(self, tmp_path):
+        path = tmp_path / "DO-1.json"
+        path.write_text("{}")
+        fp = ticket_fingerprint(path)
+        assert ticket_fingerprint(path, (fp[0] - 1, fp[1], "cached")) == fp
+
+    def test_same_digest_from_file_and_corpus(self, tmp_path):
+        _write_ticket_json(tmp_path, "DO-1", _make_ticket(key="DO-1", summary="Ünïcode"))
+        ticket_corpus.write_corpus(tmp_path)
+        from_file = ticket_fingerprint(tmp_path / "DO-1.json")
+        from_corpus = ticket_fingerprint(ticket_corpus.ticket_ref(tmp_path, "DO-1"))
+        assert from_file[1] != from_corpus[1]
+        assert from_file[2] == from_corpus[2]
+
+
+class TestReadState:
+    def test_only_checkpointed_entries(self, tmp_path):
+        path = tmp_path / "state"
+        path.write_text(
+            "DO-1\t1\t2\tabc\tr\tm\n@100\n"
+            "DO-2\t3\t4\tdef\tr\tm\n"
+            "DO-3\t5\t6\tgh",
+            encoding="utf-8",
+        )
+        entries, offset = read_state(path)
+        assert entries == {"DO-1": (1, 2, "abc", "r", "m", None)}
+        assert offset == 100
+
+    def test_matched_rule_ids(self, tmp_path):
+        path = tmp_path / "state"
+        path.write_text("DO-1\t1\t2\tabc\tr\tm\tR1,R2\nDO-2\t1\t2\tabc\tr\tm\t\n@9\n",
+                        encoding="utf-8")
+        entries, _ = read_state(path)
+        assert entries["DO-1"][5] == ("R1", "R2")
+        assert entries["DO-2"][5] == ()
+
+    def test_no_checkpoint(self, tmp_path):
+        path = tmp_path / "state"
+        path.write_text("DO-1\t1\t2\tabc\tr\tm\n", encoding="utf-8")
+        assert read_state(path) == ({}, None)
+
+
+class TestDiffRules:
+    def test_changed_added_and_removed(self):
+        old = [_make_rule("R1"), _make_rule("R2"), _make_rule("R3")]
+        new = [_make_rule("R1"), _make_rule("R2", category="OTHER"),
+               _make_rule("R4")]
+        assert rec.diff_rules(old, new) == ({"R2", "R4"}, {"R3"})
+
+    def test_non_output_columns_ignored(self):
+        old = [_make_rule("R1", hit_count=1)]
+        new = [_make_rule("R1", hit_count=7, created_by="llm")]
+        assert rec.diff_rules(old, new) == (set(), set())
+
+
+class TestCategorizedOutput:
+    def _row(self, key):
+        return {k: "" for k in OUTPUT_FIELDS} | {"Ticket": key}
+
+    def _write_run(self, tmp_path, keys, commit=True):
+        output = CategorizedOutput(tmp_path / "out.csv")
+        output.open()
+        for key in keys:
+            output.write(key, self._row(key), (1, 2, "d", "r", "m", ("R1",)))
+        if commit:
+            rules_csv = tmp_path / "rules.csv"
+            rules_csv.write_text("RuleID\n", encoding="utf-8")
+            output.commit(rules_csv)
+        else:
+            output.checkpoint()
+            output.close()
+        return output
+
+    def test_commit_publishes_csv_and_state(self, tmp_path):
+        output = self._write_run(tmp_path, ["DO-1", "DO-2"])
+        assert not output.partial_csv.exists()
+        assert not output.partial_state.exists()
+        assert load_done_tickets(output.output_csv) == {"DO-1", "DO-2"}
+        entries, offset = read_state(output.state_path)
+        assert entries["DO-1"] == (1, 2, "d", "r", "m", ("R1",))
+        assert set(entries) == {"DO-1", "DO-2"}
+        assert offset == output.output_csv.stat().st_size
+        assert output.rules_snapshot.read_text(encoding="utf-8") == "RuleID\n"
+
+    def test_prepare_resume_nothing_to_resume(self, tmp_path):
+        assert CategorizedOutput(tmp_path / "out.csv").prepare_resume() == ({}, set())
+
+    def test_prepare_resume_between_renames(self, tmp_path):
+        output = self._write_run(tmp_path, ["DO-1"])
+        # Crash after the state rename but before the CSV rename
+        os.replace(output.output_csv, output.partial_csv)
+        entries, legacy = CategorizedOutput(tmp_path / "out.csv").prepare_resume()
+        assert set(entries) == {"DO-1"}
+        assert legacy == set()
+        assert output.partial_state.is_file()
+
+    def test_prepare_resume_mismatched_state_falls_back_to_csv(self, tmp_path):
+        output = self._write_run(tmp_path, ["DO-1"])
+        with open(output.output_csv, "a", encoding="utf-8") as f:
+            f.write(",DO-9" + "," * (len(OUTPUT_FIELDS) - 2) + "\r\n")
+        entries, legacy = CategorizedOutput(tmp_path / "out.csv").prepare_resume()
+        assert entries == {}
+        assert legacy == {"DO-1", "DO-9"}
+        assert not output.partial_state.exists()
+
+    def test_prepare_resume_truncates_to_checkpoint(self, tmp_path):
+        output = self._write_run(tmp_path, ["DO-1"], commit=False)
+        with open(output.partial_csv, "a", encoding="utf-8") as f:
+            f.write(",DO-2,unsynced row\r\n")
+        entries, legacy = CategorizedOutput(tmp_path / "out.csv").prepare_resume()
+        assert set(entries) == {"DO-1"}
+        assert load_done_tickets(output.partial_csv) == {"DO-1"}
+
+    def test_rewrite(self, tmp_path):
+        self._write_run(tmp_path, ["DO-1", "DO-2", "DO-3"])
+        resumed = CategorizedOutput(tmp_path / "out.csv")
+        entries, _ = resumed.prepare_resume()
+        patched = self._row("DO-3") | {"Category": "HW", "_matched": ("R9",)}
+        resumed.rewrite(entries, drop={"DO-2"}, replacements={"DO-3": patched})
+        assert load_done_tickets(resumed.partial_csv) == {"DO-1", "DO-3"}
+        with open(resumed.partial_csv, newline="", encoding="utf-8") as f:
+            rows = {r["Ticket"]: r for r in csv.DictReader(f)}
+        assert rows["DO-3"]["Category"] == "HW"
+        entries, offset = read_state(resumed.partial_state)
+        assert set(entries) == {"DO-1", "DO-3"}
+        assert offset == resumed.partial_csv.stat().st_size
+
+
 # ---------------------------------------------------------------------------
 # main (integration)
 # ---------------------------------------------------------------------------
@@ -596,6 +1292,22 @@ class TestMain:
         assert "rule" in sources
         assert "none" in sources
 
+    def test_packed_corpus_matches_files(self, tmp_path, capsys):
+        argv, output_dir = self._setup_env(tmp_path)
+        with patch("sys.argv", ["rule_engine_categorize.py"] + argv):
+            main()
+        ticket_corpus.write_corpus(Path(argv[1]))
+        for path in Path(argv[1]).glob("*.json"):
+            path.unlink()
+        capsys.readouterr()
+        corpus_output = tmp_path / "corpus-output"
+        argv[argv.index("--output-dir") + 1] = str(corpus_output)
+        with patch("sys.argv", ["rule_engine_categorize.py"] + argv + ["--workers", "2"]):
+            main()
+        assert "Found 3 tickets in tickets.jsonl" in capsys.readouterr().out
+        assert ((corpus_output / "tickets-categorized.csv").read_text(encoding="utf-8")
+                == (output_dir / "tickets-categorized.csv").read_text(encoding="utf-8"))
+
     def test_project_filter(self, tmp_path):
         argv, output_dir = self._setup_env(tmp_path, project_filter="DO")
         with patch("sys.argv", ["rule_engine_categorize.py"] + argv):
@@ -670,6 +1382,438 @@ class TestMain:
             resumed = list(csv.DictReader(f))
         assert len(resumed) == 3
 
+    def test_interrupted_run_keeps_partial_and_resumes(self, tmp_path, capsys,
+                                                       monkeypatch):
+        monkeypatch.setattr(rec, "FLUSH_EVERY_ROWS", 1)
+        argv, output_dir = self._setup_env(tmp_path)
+        csv_path = output_dir / "tickets-categorized.csv"
+        partial_path = output_dir / "tickets-categorized.csv.partial"
+        real_iter = rec.iter_categorized_rows
+
+        def crashing_iter(*args, **kwargs):
+            rows = real_iter(*args, **kwargs)
+            yield next(rows)
+            raise KeyboardInterrupt
+
+        with patch("sys.argv", ["rule_engine_categorize.py"] + argv), \
+             patch.object(rec, "iter_categorized_rows", crashing_iter):
+            with pytest.raises(KeyboardInterrupt):
+                main()
+        assert not csv_path.exists()
+        with open(partial_path, encoding="utf-8") as f:
+            assert len(list(csv.DictReader(f))) == 1
+
+        # Simulate a torn write of the next row before the crash
+        with open(partial_path, "a", encoding="utf-8") as f:
+            f.write("DO,DO-2222222,half a ro")
+
+        with patch("sys.argv", ["rule_engine_categorize.py"] + argv + ["--resume"]):
+            main()
+        output = capsys.readouterr().out
+        assert "Found interrupted run" in output
+        assert "Resuming — 1 tickets already processed" in output
+        assert not partial_path.exists()
+        with open(csv_path, encoding="utf-8") as f:
+            rows = list(csv.DictReader(f))
+        assert sorted(r["Ticket"] for r in rows) == [
+            "DO-1111111", "DO-2222222", "DO-3333333",
+        ]
+
+    def test_fresh_run_discards_stale_partial(self, tmp_path):
+        argv, output_dir = self._setup_env(tmp_path)
+        output_dir.mkdir(parents=True)
+        partial_path = output_dir / "tickets-categorized.csv.partial"
+        partial_path.write_text("stale\r\n", encoding="utf-8")
+        with patch("sys.argv", ["rule_engine_categorize.py"] + argv):
+            main()
+        assert not partial_path.exists()
+        with open(output_dir / "tickets-categorized.csv", encoding="utf-8") as f:
+            assert len(list(csv.DictReader(f))) == 3
+
+    def test_periodic_fsync(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(rec, "FLUSH_EVERY_ROWS", 1)
+        argv, output_dir = self._setup_env(tmp_path)
+        with patch("sys.argv", ["rule_engine_categorize.py"] + argv), \
+             patch.object(rec.os, "fsync") as mock_fsync:
+            main()
+        # CSV + sidecar at the header, after each row, and before the rename
+        assert mock_fsync.call_count == 10
+
+    def _run(self, argv):
+        with patch("sys.argv", ["rule_engine_categorize.py"] + argv):
+            main()
+
+    def _rows(self, output_dir):
+        with open(output_dir / "tickets-categorized.csv", encoding="utf-8") as f:
+            return list(csv.DictReader(f))
+
+    def test_resume_uses_sidecar_not_csv(self, tmp_path, capsys):
+        argv, output_dir = self._setup_env(tmp_path)
+        self._run(argv)
+        assert (output_dir / "tickets-categorized.csv.state").is_file()
+        capsys.readouterr()
+        with patch.object(rec, "load_done_tickets") as mock_load:
+            self._run(argv + ["--resume"])
+        mock_load.assert_not_called()
+        output = capsys.readouterr().out
+        assert "Resuming — 3 tickets already processed" in output
+        assert "Skipped      : 3" in output
+        assert len(self._rows(output_dir)) == 3
+
+    def test_new_tickets_read_once(self, tmp_path):
+        argv, output_dir = self._setup_env(tmp_path)
+        with patch.object(rec, "ticket_fingerprint", side_effect=AssertionError("re-read")):
+            self._run(argv)
+        entries, _ = read_state(output_dir / "tickets-categorized.csv.state")
+        for key, entry in entries.items():
+            assert entry[:3] == ticket_fingerprint(Path(argv[1]) / f"{key}.json")
+
+    def test_resume_after_packing_corpus(self, tmp_path, capsys):
+        argv, output_dir = self._setup_env(tmp_path)
+        self._run(argv)
+        ticket_corpus.write_corpus(Path(argv[1]))
+        for path in Path(argv[1]).glob("*.json"):
+            path.unlink()
+        capsys.readouterr()
+        self._run(argv + ["--resume"])
+        output = capsys.readouterr().out
+        assert "Skipped      : 3" in output
+        assert "Re-categorizing" not in output
+
+    def test_resume_recategorizes_changed_ticket(self, tmp_path, capsys):
+        argv, output_dir = self._setup_env(tmp_path)
+        self._run(argv)
+        tickets_dir = Path(argv[1])
+        _write_ticket_json(tickets_dir, "DO-2222222", _make_ticket(
+            key="DO-2222222", summary="CDFP fault after all"))
+        capsys.readouterr()
+        self._run(argv + ["--resume"])
+        output = capsys.readouterr().out
+        assert "Re-categorizing 1 ticket(s)" in output
+        assert "Changed      : 1" in output
+        assert "Skipped      : 2" in output
+        rows = self._rows(output_dir)
+        assert sorted(r["Ticket"] for r in rows) == [
+            "DO-1111111", "DO-2222222", "DO-3333333",
+        ]
+        changed = [r for r in rows if r["Ticket"] == "DO-2222222"][0]
+        assert changed["Categorization Source"] == "rule"
+
+    def test_resume_skips_touched_but_identical_ticket(self, tmp_path, capsys):
+        argv, output_dir = self._setup_env(tmp_path)
+        self._run(argv)
+        ticket_path = Path(argv[1]) / "DO-1111111.json"
+        st = ticket_path.stat()
+        os.utime(ticket_path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+        capsys.readouterr()
+        self._run(argv + ["--resume"])
+        assert "Skipped      : 3" in capsys.readouterr().out
+        entries, _ = read_state(output_dir / "tickets-categorized.csv.state")
+        assert entries["DO-1111111"][0] == st.st_mtime_ns + 10**9
+
+    def test_resume_recategorizes_all_after_rule_change(self, tmp_path, capsys):
+        argv, output_dir = self._setup_env(tmp_path)
+        self._run(argv)
+        with open(argv[3], "a", encoding="utf-8") as f:
+            f.write("DO,R099,unrelated,summary,Other,OTHER,10,0.9,human,0\n")
+        capsys.readouterr()
+        self._run(argv + ["--resume"])
+        output = capsys.readouterr().out
+        assert "Changed      : 3" in output
+        assert "Skipped" not in output
+        assert len(self._rows(output_dir)) == 3
+
+    def test_resume_legacy_csv_without_sidecar(self, tmp_path, capsys):
+        argv, output_dir = self._setup_env(tmp_path)
+        self._run(argv)
+        (output_dir / "tickets-categorized.csv.state").unlink()
+        capsys.readouterr()
+        self._run(argv + ["--resume"])
+        output = capsys.readouterr().out
+        assert "Resuming — 3 tickets already processed" in output
+        assert len(self._rows(output_dir)) == 3
+        entries, _ = read_state(output_dir / "tickets-categorized.csv.state")
+        assert set(entries) == {"DO-1111111", "DO-2222222", "DO-3333333"}
+
+    def _rewrite_rules(self, argv, transform):
+        with open(argv[3], newline="", encoding="utf-8") as f:
+            rules = list(csv.DictReader(f))
+        _write_rule_csv(Path(argv[3]), transform(rules))
+
+    def test_incremental_added_rule_patches_matching_rows(self, tmp_path, capsys):
+        argv, output_dir = self._setup_env(tmp_path)
+        self._run(argv)
+        before = {r["Ticket"]: r for r in self._rows(output_dir)}
+        self._rewrite_rules(argv, lambda rules: rules + [{
+            **rules[0], "RuleID": "R050", "Rule Pattern": "no match",
+            "Category": "NEW", "Failure Category": "New Failure",
+        }])
+        capsys.readouterr()
+        self._run(argv + ["--incremental"])
+        output = capsys.readouterr().out
+        assert "Incremental : 1 added/changed, 0 removed rule(s)" in output
+        assert "Incremental : 3 ticket(s) re-evaluated, 1 row(s) patched" in output
+        assert "Skipped      : 3" in output
+        after = {r["Ticket"]: r for r in self._rows(output_dir)}
+        assert after["DO-2222222"]["Category"] == "NEW"
+        assert after["DO-2222222"]["Rules Used"] == "R050"
+        assert after["DO-1111111"] == before["DO-1111111"]
+        assert after["DO-3333333"] == before["DO-3333333"]
+        entries, _ = read_state(output_dir / "tickets-categorized.csv.state")
+        assert entries["DO-2222222"][5] == ("R050",)
+        assert entries["DO-2222222"][3] == file_digest(Path(argv[3]))
+
+    def test_incremental_skips_quarantined_changed_rule(self, tmp_path, capsys):
+        argv, output_dir = self._setup_env(tmp_path)
+        self._run(argv)
+        self._rewrite_rules(argv, lambda rules: rules + [{
+            **rules[0], "RuleID": "R050", "Rule Pattern": "no match",
+            "Category": "NEW", "Failure Category": "New Failure",
+        }])
+
+        def screen(rules, _files, _budget):
+            rules.quarantined["R050"] = "timed out on reference texts"
+
+        with patch.object(rec, "screen_rules", side_effect=screen):
+            self._run(argv + ["--incremental"])
+        output = capsys.readouterr().out
+        assert "0 row(s) patched" in output
+        assert "Incomplete" not in output
+        assert all("R050" not in r["Rules Used"] for r in self._rows(output_dir))
+
+    def test_incremental_rule_quarantined_during_diff(self, tmp_path, capsys):
+        argv, output_dir = self._setup_env(tmp_path)
+        argv += ["--no-match-cache"]
+        self._run(argv)
+        self._rewrite_rules(argv, lambda rules: rules + [{
+            **rules[0], "RuleID": "R050", "Rule Pattern": "o",
+            "Category": "NEW", "Failure Category": "New Failure",
+        }])
+        capsys.readouterr()
+        self._run(argv + ["--incremental", "--rule-budget-ms", "0.000001"])
+        output = capsys.readouterr().out
+        # The diff quarantined R050 on the first ticket; the other two kept
+        # their old entries and went through the full pass, which reports them
+        assert "Re-categorizing 2 ticket(s) whose inputs changed" in output
+        assert "Incomplete   : 2 ticket(s)" in output
+
+    def test_incremental_removed_rule_skips_ticket_loads(self, tmp_path, capsys):
+        argv, output_dir = self._setup_env(tmp_path)
+        self._run(argv)
+        self._rewrite_rules(argv, lambda rules: rules[1:])
+        capsys.readouterr()
+        with patch.object(rec.json, "loads", wraps=json.loads) as mock_load:
+            self._run(argv + ["--incremental"])
+        # Only the patched row is rebuilt from its ticket JSON
+        assert mock_load.call_count == 1
+        rows = {r["Ticket"]: r for r in self._rows(output_dir)}
+        assert rows["DO-1111111"]["Categorization Source"] == "none"
+        assert "1 row(s) patched" in capsys.readouterr().out
+
+    def test_incremental_changed_rule_category(self, tmp_path, capsys):
+        argv, output_dir = self._setup_env(tmp_path)
+        self._run(argv)
+        self._rewrite_rules(argv, lambda rules: [
+            {**rules[0], "Category": "CDFP-2"}, rules[1]])
+        self._run(argv + ["--incremental"])
+        rows = {r["Ticket"]: r for r in self._rows(output_dir)}
+        assert rows["DO-1111111"]["Category"] == "CDFP-2"
+
+    def test_incremental_then_changed_ticket(self, tmp_path, capsys):
+        argv, output_dir = self._setup_env(tmp_path)
+        self._run(argv)
+        self._rewrite_rules(argv, lambda rules: rules[1:])
+        _write_ticket_json(Path(argv[1]), "DO-3333333", _make_ticket(
+            key="DO-3333333", summary="edited"))
+        (Path(argv[1]) / "DO-2222222.json").unlink()
+        capsys.readouterr()
+        self._run(argv + ["--incremental"])
+        output = capsys.readouterr().out
+        assert "Re-categorizing 1 ticket(s)" in output
+        rows = {r["Ticket"]: r for r in self._rows(output_dir)}
+        assert rows["DO-3333333"]["Categorization Source"] == "none"
+
+    def test_incremental_without_snapshot_runs_full_resume(self, tmp_path, capsys):
+        argv, output_dir = self._setup_env(tmp_path)
+        self._run(argv)
+        (output_dir / "tickets-categorized.csv.rules.csv").unlink()
+        capsys.readouterr()
+        self._run(argv + ["--incremental"])
+        output = capsys.readouterr().out
+        assert "no cached match sets" in output
+        assert "Skipped      : 3" in output
+
+    def test_incremental_legacy_entries_fall_back_to_full_pass(self, tmp_path, capsys):
+        argv, output_dir = self._setup_env(tmp_path)
+        self._run(argv)
+        (output_dir / "tickets-categorized.csv.state").unlink()
+        self._run(argv + ["--resume"])
+        self._rewrite_rules(argv, lambda rules: rules[1:])
+        capsys.readouterr()
+        self._run(argv + ["--incremental"])
+        output = capsys.readouterr().out
+        assert "0 ticket(s) re-evaluated, 0 row(s) patched" in output
+        assert "Changed      : 3" in output
+
+    def test_incremental_ml_fallback_for_unmatched_rows(self, tmp_path, capsys):
+        argv, output_dir = self._setup_env(tmp_path)
+        model_path = tmp_path / "model.joblib"
+        map_path = tmp_path / "map.json"
+        model_path.write_text("dummy")
+        map_path.write_text("{}")
+        argv.extend(["--ml-model", str(model_path),
+                     "--ml-category-map", str(map_path)])
+
+        def fake_predict_batch(pipeline, cat_map, tickets):
+            return [("ML Category", "MLCAT", 0.75)] * len(tickets)
+
+        with patch("ml_classifier.load_model", return_value=(MagicMock(), {})), \
+             patch("ml_classifier.predict_batch", side_effect=fake_predict_batch):
+            self._run(argv)
+            self._rewrite_rules(argv, lambda rules: rules[1:])
+            self._run(argv + ["--incremental"])
+        rows = {r["Ticket"]: r for r in self._rows(output_dir)}
+        assert rows["DO-1111111"]["Categorization Source"] == "ml"
+
+    def test_match_cache_hits_on_rerun(self, tmp_path, capsys):
+        argv, output_dir = self._setup_env(tmp_path)
+        self._run(argv)
+        assert (output_dir / rec.MATCH_CACHE_NAME).is_file()
+        first = capsys.readouterr().out
+        assert "Match cache  : 0 hits, " in first
+        self._run(argv + ["--yes"])
+        second = capsys.readouterr().out
+        assert ", 0 misses, 0 evicted" in second
+        assert "Match cache  : 0 hits" not in second
+
+    def test_match_cache_evicts_retired_tickets(self, tmp_path, capsys):
+        argv, output_dir = self._setup_env(tmp_path)
+        cache_path = tmp_path / "cache.sqlite"
+        self._run(argv + ["--match-cache", str(cache_path)])
+        (Path(argv[1]) / "DO-1111111.json").unlink()
+        capsys.readouterr()
+        self._run(argv + ["--yes", "--match-cache", str(cache_path)])
+        out = capsys.readouterr().out
+        assert "0 misses" in out
+        assert "evicted" in out and ", 0 evicted" not in out
+
+    def test_no_match_cache(self, tmp_path, capsys):
+        argv, output_dir = self._setup_env(tmp_path)
+        self._run(argv + ["--no-match-cache"])
+        assert not (output_dir / rec.MATCH_CACHE_NAME).exists()
+        assert "Match cache" not in capsys.readouterr().out
+
+    def test_profile_rules_report_and_hit_counts(self, tmp_path, capsys):
+        rules = [
+            {"Project Key": "DO", "RuleID": "R001", "Rule Pattern": "CDFP fault",
+             "Match Field": "summary", "Failure Category": "CDFP Fault", "Category": "CDFP",
+             "Priority": "100", "Confidence": "0.95", "Created By": "human", "Hit Count": "0"},
+            {"Project Key": "DO", "RuleID": "R002", "Rule Pattern": "never seen",
+             "Match Field": "summary", "Failure Category": "F", "Category": "C",
+             "Priority": "90", "Confidence": "1", "Created By": "human", "Hit Count": "42"},
+            {"Project Key": "DO", "RuleID": "R011", "Rule Pattern": "TRS prescription",
+             "Match Field": "comments", "Failure Category": META_RULE_FAILURE,
+             "Category": "HW- General", "Priority": "50", "Confidence": "1",
+             "Created By": "human", "Hit Count": "0"},
+            {"Project Key": "HPC", "RuleID": "R100", "Rule Pattern": "dimm",
+             "Match Field": "summary", "Failure Category": "F", "Category": "C",
+             "Priority": "10", "Confidence": "1", "Created By": "human", "Hit Count": "5"},
+        ]
+        argv, output_dir = self._setup_env(tmp_path, rules_data=rules, project_filter="DO")
+        hits_csv = tmp_path / "hits.csv"
+        self._run(argv + ["--write-hit-counts", str(hits_csv)])
+        out = capsys.readouterr().out
+        assert "Rule profile →" in out
+        assert "Match cache" not in out
+        assert "Never matched: R002" in out
+        with open(output_dir / rec.RULE_PROFILE_NAME, newline="", encoding="utf-8") as f:
+            report = {r["RuleID"]: r for r in csv.DictReader(f)}
+        assert report["R001"]["Regex Runs"] == "1"
+        # The prefilter rules R002 out on every ticket without running it
+        assert report["R002"]["Regex Runs"] == "0"
+        assert (report["R001"]["Matches"], report["R001"]["Wins"]) == ("1", "1")
+        assert (report["R011"]["Matches"], report["R011"]["Wins"]) == ("1", "0")
+        with open(hits_csv, newline="", encoding="utf-8") as f:
+            assert {r["RuleID"]: r["Hit Count"] for r in csv.DictReader(f)} == {
+                "R001": "1", "R002": "0", "R011": "1", "R100": "5"}
+
+    def test_profile_rules_counts_resumed_tickets(self, tmp_path, capsys):
+        rules = [
+            {"Project Key": "DO", "RuleID": rid, "Rule Pattern": pattern,
+             "Match Field": "summary", "Failure Category": "F", "Category": "C",
+             "Priority": "1", "Confidence": "1", "Created By": "human",
+             "Hit Count": "0"}
+            for rid, pattern in (("R001", "CDFP fault"), ("R002", "never seen"))
+        ]
+        argv, output_dir = self._setup_env(tmp_path, rules_data=rules)
+        self._run(argv)
+        capsys.readouterr()
+        self._run(argv + ["--resume", "--profile-rules"])
+        out = capsys.readouterr().out
+        assert "Never matched: R002" in out
+        with open(output_dir / rec.RULE_PROFILE_NAME, newline="", encoding="utf-8") as f:
+            report = {r["RuleID"]: r for r in csv.DictReader(f)}
+        assert report["R001"]["Regex Runs"] == "0"
+        assert report["R001"]["Matches"] == "1"
+
+    def test_write_hit_counts_refuses_rule_engine(self, tmp_path):
+        argv, _ = self._setup_env(tmp_path)
+        with pytest.raises(SystemExit):
+            self._run(argv + ["--write-hit-counts", argv[3]])
+
+    def test_quarantined_rules_listed_in_summary(self, tmp_path, capsys):
+        argv, output_dir = self._setup_env(tmp_path)
+        self._run(argv + ["--rule-budget-ms", "0.000001", "--no-match-cache"])
+        out = capsys.readouterr().out
+        assert "Quarantined  : R001 (search took" in out
+
+    def test_rows_missing_quarantined_rule_not_up_to_date(self, tmp_path, capsys):
+        tickets = [
+            (key, _make_ticket(key=key, summary="CDFP fault detected",
+                               created="2026-01-01T00:00:00Z"))
+            for key in ("DO-1111111", "DO-2222222", "DO-3333333")
+        ]
+        argv, output_dir = self._setup_env(tmp_path, tickets=tickets)
+        argv += ["--no-match-cache"]
+        self._run(argv + ["--rule-budget-ms", "0.000001"])
+        out = capsys.readouterr().out
+        # R001 ran on the first ticket, then was skipped for the others
+        assert ("Incomplete   : 2 ticket(s) evaluated without a rule quarantined "
+                "mid-run, re-evaluated on the next --resume: DO-2222222, DO-3333333") in out
+        entries, _ = read_state(output_dir / "tickets-categorized.csv.state")
+        assert entries["DO-1111111"][5] == ("R001",)
+        assert entries["DO-2222222"][3] != entries["DO-1111111"][3]
+
+        self._run(argv + ["--resume", "--rule-budget-ms", "0"])
+        out = capsys.readouterr().out
+        assert "Re-categorizing 2 ticket(s) whose inputs changed" in out
+        assert "Incomplete" not in out
+        assert {r["Rules Used"] for r in self._rows(output_dir)} == {"R001"}
+
+    def test_rules_quarantined_before_run_keep_rows_current(self, tmp_path, capsys):
+        argv, output_dir = self._setup_env(tmp_path)
+
+        def screen(rules, _files, _budget):
+            rules.quarantined["R011"] = "timed out on reference texts"
+
+        with patch.object(rec, "screen_rules", side_effect=screen):
+            self._run(argv)
+            capsys.readouterr()
+            self._run(argv + ["--resume"])
+        out = capsys.readouterr().out
+        assert "Skipped      : 3" in out
+        assert "Incomplete" not in out
+        # Once the rule is no longer quarantined, its tickets are evaluated again
+        self._run(argv + ["--resume"])
+        assert "Re-categorizing 3 ticket(s)" in capsys.readouterr().out
+
+    def test_rule_budget_disabled(self, tmp_path, capsys):
+        argv, output_dir = self._setup_env(tmp_path)
+        with patch.object(rec, "screen_rules") as screen:
+            self._run(argv + ["--rule-budget-ms", "0"])
+        assert screen.call_args.args[2] is None
+        assert "Quarantined" not in capsys.readouterr().out
+
     def test_setup_env_resume_flag(self, tmp_path):
         """_setup_env with resume=True includes --resume in argv."""
         argv, output_dir = self._setup_env(tmp_path, resume=True)
@@ -814,8 +1958,8 @@ class TestMain:
         mock_pipeline = MagicMock()
         mock_map = {"ML Category": "MLCAT"}
 
-        def fake_predict(pipeline, cat_map, ticket_data):
-            return "ML Category", "MLCAT", 0.75
+        def fake_predict_batch(pipeline, cat_map, tickets):
+            return [("ML Category", "MLCAT", 0.75)] * len(tickets)
 
         # We need real joblib/json files for the file-existence checks
         model_path = tmp_path / "model.joblib"
@@ -829,7 +1973,7 @@ class TestMain:
         with patch("sys.argv", ["rule_engine_categorize.py"] + argv), \
              patch("ml_classifier.load_model",
                    return_value=(mock_pipeline, mock_map)), \
-             patch("ml_classifier.predict", side_effect=fake_predict):
+             patch("ml_classifier.predict_batch", side_effect=fake_predict_batch):
             main()
 
         csv_path = output_dir / "tickets-categorized.csv"
@@ -844,6 +1988,23 @@ class TestMain:
         assert "ML fallback : enabled" in output
         assert "ML matched" in output
 
+    def test_workers_output_matches_serial(self, tmp_path, capsys):
+        argv, output_dir = self._setup_env(tmp_path)
+        argv.append("--no-match-cache")
+        csv_path = output_dir / "tickets-categorized.csv"
+        with patch("sys.argv", ["rule_engine_categorize.py"] + argv):
+            main()
+        serial_csv = csv_path.read_text(encoding="utf-8")
+        serial_out = capsys.readouterr().out
+
+        with patch("sys.argv", ["rule_engine_categorize.py"] + argv
+                   + ["--yes", "--workers", "2"]):
+            main()
+        pooled_out = capsys.readouterr().out
+        assert csv_path.read_text(encoding="utf-8") == serial_csv
+        assert "Workers     : 2" in pooled_out
+        assert serial_out.split("Done.")[1] == pooled_out.split("Done.")[1]
+
     def test_ml_stats_not_printed_when_zero(self, tmp_path, capsys):
         """When no ML model is used, ML matched line should not appear."""
         argv, output_dir = self._setup_env(tmp_path)
@@ -15,6 +15,17 @@ import pytest
 run_training = importlib.import_module("run_training")
 parse_args = run_training.parse_args
 main = run_training.main
+default_log_file_path = run_training.resolve_log_file_path
+
+
+@pytest.fixture(autouse=True)
+def _logs_to_tmp(tmp_path, monkeypatch):
+    """Keep run logs of ``main`` calls out of scripts/logs/."""
+    monkeypatch.setattr(
+        run_training, "resolve_log_file_path",
+        lambda log_file, started_at: log_file or tmp_path / "logs" / default_log_file_path(
+            None, started_at).name,
+    )
 
 
 RULE_HEADER = (
@@ -102,14 +113,14 @@ def test_parse_args_accepts_legacy_max_incorrect_rows_alias():
 
 def test_resolve_log_file_path_defaults_to_timestamped_logs_dir():
     started_at = run_training.datetime(2026, 2, 15, 6, 0, 0, tzinfo=run_training.timezone.utc)
-    path = run_training.resolve_log_file_path(None, started_at)
+    path = default_log_file_path(None, started_at)
     assert str(path).endswith("scripts/logs/run_training_20260215T060000Z.log")
 
 
 def test_resolve_log_file_path_respects_explicit_override(tmp_path):
     explicit = tmp_path / "custom.log"
     started_at = run_training.datetime(2026, 2, 15, 6, 0, 0, tzinfo=run_training.timezone.utc)
-    path = run_training.resolve_log_file_path(explicit, started_at)
+    path = default_log_file_path(explicit, started_at)
     assert path == explicit
 
 
@@ -426,6 +437,21 @@ def test_normalize_proposal_handles_empty_pattern_and_type_fallbacks():
     assert rule["Hit Count"] == 0
 
 
+def test_normalize_proposal_rejects_nested_quantifier(capsys):
+    assert run_training.normalize_proposal(
+        {"Rule Pattern": "(fan.+)+failed"}, "DO", "R003",
+    ) is None
+    assert "catastrophic-backtracking risk" in capsys.readouterr().err
+
+
+def test_normalize_proposal_warns_on_wildcard_chain(capsys):
+    rule = run_training.normalize_proposal(
+        {"Rule Pattern": "gpu.*xid.*node.*down"}, "DO", "R004",
+    )
+    assert rule is not None
+    assert "WARNING: costly regex proposal" in capsys.readouterr().err
+
+
 def test_build_failure_to_category_map_skips_unknown_and_keeps_first():
     mapping = run_training.build_failure_to_category_map(
         [
@@ -1186,7 +1212,7 @@ def test_generate_ml_proposals_returns_empty_without_ticket_jsons(monkeypatch, t
 
 
 def test_generate_ml_proposals_covers_skip_and_success_paths(monkeypatch, tmp_path):
-    def fake_extract_top_terms(_pipeline, text, n=5):
+    def fake_extract_top_terms(_pipeline, text, n=5, term_index=None):
         if text == "no_terms":
             return []
         if text == "pattern_empty":
@@ -1278,7 +1304,8 @@ def test_main_ml_engine_auto_rules_no_tickets_dir(monkeypatch, tmp_path):
     map_path.write_text("{}", encoding="utf-8")
 
     fake_ml_module = SimpleNamespace(
-        load_model=lambda _m, _c: (object(), {"X": "Y"})
+        load_model=lambda _m, _c: (object(), {"X": "Y"}),
+        load_term_index=lambda _m: None,
     )
     monkeypatch.setitem(sys.modules, "ml_classifier", fake_ml_module)
     monkeypatch.setattr(run_training, "find_latest_tickets_dir", lambda: None)
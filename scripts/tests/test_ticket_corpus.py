@@ -0,0 +1,140 @@
+"""Tests for ticket_corpus.py."""
+
+import importlib
+import json
+import os
+
+import pytest
+
+tc = importlib.import_module("ticket_corpus")
+
+
+def _write_tickets(tickets_dir, count=3):
+    tickets_dir.mkdir(parents=True, exist_ok=True)
+    tickets = {}
+    for i in range(count):
+        key = f"DO-{i}"
+        tickets[key] = {"ticket": {"key": key, "summary": f"ticket {i} – x"},
+                        "comments": [{"body": "line\nbreak"}]}
+        (tickets_dir / f"{key}.json").write_text(json.dumps(tickets[key], indent=2))
+    return tickets
+
+
+class TestWriteCorpus:
+    def test_round_trip_with_random_access(self, tmp_path):
+        tickets = _write_tickets(tmp_path)
+        assert tc.write_corpus(tmp_path) == 3
+        lines = (tmp_path / tc.CORPUS_NAME).read_bytes().splitlines()
+        assert len(lines) == 3
+
+        refs = tc.load_corpus(tmp_path)
+        assert list(refs) == ["DO-0", "DO-1", "DO-2"]
+        ref = refs["DO-1"]
+        assert (ref.stem, ref.name) == ("DO-1", "DO-1.json")
+        assert json.loads(ref.read_bytes()) == tickets["DO-1"]
+        assert ref.stat().st_size == len(lines[1])
+        assert ref.stat().st_mtime_ns == (tmp_path / tc.CORPUS_NAME).stat().st_mtime_ns
+        assert dict(tc.iter_tickets(tmp_path)) == tickets
+        assert dict(tc.iter_tickets(tmp_path, {"DO-2"})) == {"DO-2": tickets["DO-2"]}
+
+    def test_repack_is_seen_by_new_refs(self, tmp_path):
+        _write_tickets(tmp_path)
+        tc.write_corpus(tmp_path)
+        old = tc.ticket_ref(tmp_path, "DO-0")
+        old.read_bytes()
+        (tmp_path / "DO-0.json").write_text(json.dumps({"ticket": {"key": "DO-0"}}))
+        tc.write_corpus(tmp_path)
+        assert json.loads(tc.ticket_ref(tmp_path, "DO-0").read_bytes()) == {
+            "ticket": {"key": "DO-0"}}
+
+    def test_index_parsed_once_until_repacked(self, tmp_path, monkeypatch):
+        _write_tickets(tmp_path)
+        tc.write_corpus(tmp_path)
+        parsed = []
+        real_load = json.load
+        monkeypatch.setattr(tc.json, "load", lambda f: parsed.append(f) or real_load(f))
+        for key in ("DO-0", "DO-1", "DO-9"):
+            tc.ticket_ref(tmp_path, key)
+        assert len(parsed) == 1
+
+        tc.write_corpus(tmp_path)
+        assert tc.ticket_ref(tmp_path, "DO-0") is not None
+        assert len(parsed) == 2
+
+    def test_mismatched_index_is_ignored(self, tmp_path, capsys):
+        _write_tickets(tmp_path)
+        tc.write_corpus(tmp_path)
+        with open(tmp_path / tc.CORPUS_NAME, "ab") as f:
+            f.write(b"{}\n")
+        assert tc.load_corpus(tmp_path) is None
+        assert "index does not match" in capsys.readouterr().err
+        # Readers fall back to the per-ticket files
+        assert [p.name for p in tc.ticket_refs(tmp_path)] == ["DO-0.json", "DO-1.json", "DO-2.json"]
+
+    def test_touched_corpus_is_ignored(self, tmp_path, capsys):
+        _write_tickets(tmp_path)
+        tc.write_corpus(tmp_path)
+        corpus = tmp_path / tc.CORPUS_NAME
+        st = corpus.stat()
+        os.utime(corpus, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+        assert tc.load_corpus(tmp_path) is None
+        assert "index does not match" in capsys.readouterr().err
+
+    def test_remove(self, tmp_path):
+        _write_tickets(tmp_path)
+        tc.write_corpus(tmp_path)
+        tc.remove_corpus(tmp_path)
+        tc.remove_corpus(tmp_path)
+        assert tc.load_corpus(tmp_path) is None
+        assert not any(p.suffix != ".json" for p in tmp_path.iterdir())
+
+
+class TestTicketRefs:
+    def test_files_without_corpus(self, tmp_path):
+        _write_tickets(tmp_path)
+        refs = tc.ticket_refs(tmp_path)
+        assert refs == sorted(tmp_path.glob("*.json"))
+        assert tc.ticket_ref(tmp_path, "DO-1") == tmp_path / "DO-1.json"
+        assert tc.ticket_ref(tmp_path, "DO-9") is None
+
+    def test_corpus_preferred(self, tmp_path):
+        _write_tickets(tmp_path)
+        tc.write_corpus(tmp_path)
+        refs = tc.ticket_refs(tmp_path)
+        assert all(isinstance(r, tc.CorpusTicket) for r in refs)
+        assert [r.name for r in refs] == ["DO-0.json", "DO-1.json", "DO-2.json"]
+        assert tc.ticket_ref(tmp_path, "DO-9") is None
+
+    def test_reads_share_one_descriptor(self, tmp_path, monkeypatch):
+        _write_tickets(tmp_path)
+        tc.write_corpus(tmp_path)
+        opened = []
+        real_open = os.open
+        monkeypatch.setattr(tc.os, "open", lambda *a: opened.append(a) or real_open(*a))
+        monkeypatch.setattr(tc, "_descriptors", {})
+        for ref in tc.ticket_refs(tmp_path):
+            ref.read_bytes()
+        assert len(opened) == 1
+
+    def test_close_descriptors(self, tmp_path, monkeypatch):
+        _write_tickets(tmp_path)
+        tc.write_corpus(tmp_path)
+        monkeypatch.setattr(tc, "_descriptors", {})
+        tc.ticket_ref(tmp_path, "DO-0").read_bytes()
+        (fd,) = tc._descriptors.values()
+        tc.close_descriptors()
+        assert tc._descriptors == {}
+        with pytest.raises(OSError):
+            os.fstat(fd)
+
+
+class TestMain:
+    def test_packs_directory(self, tmp_path, capsys):
+        _write_tickets(tmp_path, count=2)
+        tc.main([str(tmp_path)])
+        assert "Packed 2 ticket(s)" in capsys.readouterr().out
+        assert len(tc.load_corpus(tmp_path)) == 2
+
+    def test_missing_directory(self, tmp_path):
+        with pytest.raises(SystemExit, match="Tickets directory not found"):
+            tc.main([str(tmp_path / "missing")])
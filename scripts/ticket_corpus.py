@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Single-file corpus of normalized tickets with random access by key.
+
+A dated normalized-tickets directory holds one pretty-printed JSON file
+per ticket, and every reader used to open and parse each of them.  A
+corpus packs the directory into ``tickets.jsonl`` (one compact JSON
+ticket per line, in file-name order) next to ``tickets.jsonl.idx``, a
+JSON index of ``[key, offset, length]`` per line.  Readers get the
+tickets through ``ticket_refs``/``ticket_ref``, which prefer the corpus
+and fall back to the per-ticket files.  A corpus ref supports the subset
+of ``pathlib.Path`` the readers use (``stem``, ``name``, ``read_bytes``
+and ``stat``), so code written against ticket files takes either.
+
+Reads use ``os.pread`` on one descriptor per corpus and process instead
+of an ``open`` per ticket; the descriptors are closed at exit.
+
+Usage:
+    python3 scripts/ticket_corpus.py scripts/normalized-tickets/2026-02-08
+"""
+import argparse
+import atexit
+import json
+import os
+import sys
+from pathlib import Path
+from typing import NamedTuple
+
+CORPUS_NAME = "tickets.jsonl"
+INDEX_NAME = CORPUS_NAME + ".idx"
+
+# (corpus path, inode) -> open descriptor, per process
+_descriptors = {}
+# corpus path -> (corpus and index stat, {key: CorpusTicket}), per process
+_loaded = {}
+
+
+def close_descriptors():
+    """Close the descriptors opened by ``CorpusTicket.read_bytes``."""
+    while _descriptors:
+        os.close(_descriptors.popitem()[1])
+
+
+atexit.register(close_descriptors)
+
+
+class _EntryStat(NamedTuple):
+    st_mtime_ns: int
+    st_size: int
+
+
+class CorpusTicket(NamedTuple):
+    """Reference to one ticket line in a corpus file."""
+
+    corpus: str
+    key: str
+    offset: int
+    length: int
+    mtime_ns: int
+    inode: int
+
+    @property
+    def stem(self):
+        return self.key
+
+    @property
+    def name(self):
+        return f"{self.key}.json"
+
+    def read_bytes(self):
+        fd = _descriptors.get((self.corpus, self.inode))
+        if fd is None:
+            fd = _descriptors[(self.corpus, self.inode)] = os.open(self.corpus, os.O_RDONLY)
+        return os.pread(fd, self.length, self.offset)
+
+    def stat(self):
+        """Corpus mtime and the ticket's own length, as ``st_*`` fields."""
+        return _EntryStat(self.mtime_ns, self.length)
+
+
+def corpus_paths(tickets_dir):
+    tickets_dir = Path(tickets_dir)
+    return tickets_dir / CORPUS_NAME, tickets_dir / INDEX_NAME
+
+
+def load_corpus(tickets_dir):
+    """Return ``{key: CorpusTicket}`` in corpus order, or ``None``.
+
+    ``None`` means *tickets_dir* has no usable corpus: none was written,
+    or the index does not describe the corpus file next to it (its size
+    or mtime differ, e.g. after an interrupted repack), in which case a
+    warning is printed.
+
+    The refs are kept per process until either file changes, so repeated
+    lookups do not parse the index again; do not modify the returned dict.
+    """
+    corpus, index = corpus_paths(tickets_dir)
+    if not index.is_file() or not corpus.is_file():
+        return None
+    st = corpus.stat()
+    index_st = index.stat()
+    signature = (st.st_ino, st.st_size, st.st_mtime_ns,
+                 index_st.st_ino, index_st.st_size, index_st.st_mtime_ns)
+    cached = _loaded.get(str(corpus))
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+    with open(index, encoding="utf-8") as f:
+        meta = json.load(f)
+    if (meta.get("size"), meta.get("mtime_ns")) != (st.st_size, st.st_mtime_ns):
+        print(f"Warning: ignoring {corpus}: index does not match "
+              "(re-run ticket_corpus.py to repack)", file=sys.stderr)
+        return None
+    refs = {
+        key: CorpusTicket(str(corpus), key, offset, length, st.st_mtime_ns, st.st_ino)
+        for key, offset, length in meta["tickets"]
+    }
+    _loaded[str(corpus)] = (signature, refs)
+    return refs
+
+
+def ticket_refs(tickets_dir):
+    """Return every ticket in *tickets_dir*, sorted by file name.
+
+    Corpus refs when the directory has a corpus, else the ``*.json``
+    paths.
+    """
+    refs = load_corpus(tickets_dir)
+    if refs is not None:
+        return list(refs.values())
+    return sorted(Path(tickets_dir).glob("*.json"))
+
+
+def ticket_ref(tickets_dir, key):
+    """Return the ref of ticket *key* in *tickets_dir*, or ``None``."""
+    refs = load_corpus(tickets_dir)
+    if refs is not None:
+        return refs.get(key)
+    path = Path(tickets_dir) / f"{key}.json"
+    return path if path.is_file() else None
+
+
+def iter_tickets(tickets_dir, keys=None):
+    """Yield ``(key, ticket_data)`` for tickets in *tickets_dir*.
+
+    With *keys*, only those tickets are read and parsed.
+    """
+    for ref in ticket_refs(tickets_dir):
+        if keys is None or ref.stem in keys:
+            yield ref.stem, json.loads(ref.read_bytes())
+
+
+def compact_json(ticket_data):
+    """Return the corpus line of *ticket_data* (without the newline)."""
+    return json.dumps(ticket_data, separators=(",", ":")).encode("utf-8")
+
+
+def write_corpus(tickets_dir):
+    """Pack the ``*.json`` tickets of *tickets_dir* into a corpus.
+
+    Both files are written to temporaries and renamed into place, the
+    index last, so readers see either the old corpus or the new one.
+    Returns the number of tickets packed.
+    """
+    corpus, index = corpus_paths(tickets_dir)
+    tmp_corpus = corpus.with_name(corpus.name + ".tmp")
+    entries = []
+    offset = 0
+    with open(tmp_corpus, "wb") as out:
+        for path in sorted(Path(tickets_dir).glob("*.json")):
+            line = compact_json(json.loads(path.read_bytes()))
+            out.write(line + b"\n")
+            entries.append([path.stem, offset, len(line)])
+            offset += len(line) + 1
+    tmp_index = index.with_name(index.name + ".tmp")
+    # The rename keeps the mtime, so the index can record it up front
+    meta = {"size": offset, "mtime_ns": tmp_corpus.stat().st_mtime_ns, "tickets": entries}
+    tmp_index.write_text(json.dumps(meta), encoding="utf-8")
+    tmp_corpus.replace(corpus)
+    tmp_index.replace(index)
+    return len(entries)
+
+
+def remove_corpus(tickets_dir):
+    """Delete the corpus of *tickets_dir*, e.g. before its files change."""
+    for path in corpus_paths(tickets_dir):
+        path.unlink(missing_ok=True)
+
+
+def parse_args(argv=None):
+    p = argparse.ArgumentParser(description="Pack normalized tickets into a corpus file")
+    p.add_argument("tickets_dir", type=Path,
+                   help="Dated normalized-tickets directory to pack")
+    return p.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if not args.tickets_dir.is_dir():
+        sys.exit(f"Tickets directory not found: {args.tickets_dir}")
+    count = write_corpus(args.tickets_dir)
+    print(f"Packed {count} ticket(s) into {args.tickets_dir / CORPUS_NAME}")
+
+
+if __name__ == "__main__":
+    main()